@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import argparse
+from typing import Any
+
+from constellation_engine.bench.generators import GENERATORS
+from constellation_engine.bench.suite import compare, read_results, run_suite, write_results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m constellation_engine.bench",
+        description="Time the analysis pipeline on generated topologies.",
+    )
+    parser.add_argument(
+        "--shapes",
+        default=",".join(GENERATORS),
+        help=f"Comma-separated topology shapes (default: {','.join(GENERATORS)})",
+    )
+    parser.add_argument(
+        "--sizes",
+        default="1000,10000",
+        help="Comma-separated node counts, e.g. 1000,100000,1000000 (default: 1000,10000)",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Generator seed (default: 0)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per phase; best is kept")
+    parser.add_argument(
+        "--max-criticality-nodes",
+        type=int,
+        default=100_000,
+        help="Skip compute_criticality above this many nodes (default: 100000)",
+    )
+    parser.add_argument("--out", default="bench.json", help="Results file (default: bench.json)")
+    parser.add_argument("--baseline", default=None, help="Results file to compare against")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed slowdown vs baseline before failing, as a fraction (default: 0.25)",
+    )
+    args = parser.parse_args(argv)
+
+    shapes = [s for s in args.shapes.split(",") if s]
+    unknown = sorted(set(shapes) - set(GENERATORS))
+    if unknown:
+        parser.error(f"unknown shapes: {', '.join(unknown)}")
+
+    def progress(row: dict[str, Any]) -> None:
+        peak = row.get("peak_bytes")
+        mem = "" if peak is None else f" {peak / 2**20:9.1f} MiB peak"
+        error = row.get("max_relative_error")
+        if error is not None:
+            mem += f" {error:7.2%} max error"
+        print(
+            f"{row['shape']:>12} {row['nodes']:>9} {row['phase']:>23} {row['seconds']:.4f}s{mem}"
+        )
+
+    doc = run_suite(
+        shapes=shapes,
+        sizes=[int(s) for s in args.sizes.split(",") if s],
+        seed=args.seed,
+        repeat=args.repeat,
+        max_criticality_nodes=args.max_criticality_nodes,
+        progress=progress,
+    )
+    write_results(doc, args.out)
+    print(f"wrote {args.out}")
+
+    if args.baseline is not None:
+        regressions = compare(doc, read_results(args.baseline), tolerance=args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+        print("no regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,570 @@
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Any, Callable, Iterable, Mapping, Sequence
+
+from constellation_engine.bench.generators import GENERATORS, write_manifest
+from constellation_engine.core.graph import build_graph
+from constellation_engine.core.types import (
+    CallType,
+    Dependency,
+    DependencyType,
+    ManifestDelta,
+    Service,
+    ServiceId,
+)
+from constellation_engine.core.validate import ValidatedModel, validate_or_raise
+from constellation_engine.sim.compiled import (
+    compile_graph,
+    compile_model,
+    pack_into,
+    packed_size,
+    propagate_compiled,
+    unpack,
+)
+from constellation_engine.sim.criticality import compute_criticality, top_critical
+from constellation_engine.sim.models import FailureType
+from constellation_engine.sim.propagate import propagate_failure
+
+# A propagation engine is prepared once per model and then queried per start and
+# failure; a scenario engine likewise, but with several starts failing together. A
+# criticality engine returns the ``top_critical`` ranking of its scores, cut to the
+# first ``k`` entries unless ``k`` is None.
+Propagator = Callable[[ServiceId, FailureType], Mapping[ServiceId, FailureType]]
+PropagationEngine = Callable[[ValidatedModel], Propagator]
+MultiPropagator = Callable[[Sequence[ServiceId], FailureType], Mapping[ServiceId, FailureType]]
+ScenarioEngine = Callable[[ValidatedModel], MultiPropagator]
+Ranking = list[tuple[ServiceId, int]]
+CriticalityEngine = Callable[[ValidatedModel, FailureType, "int | None"], Ranking]
+
+PROPAGATION_ENGINES: dict[str, PropagationEngine] = {}
+SCENARIO_ENGINES: dict[str, ScenarioEngine] = {}
+CRITICALITY_ENGINES: dict[str, CriticalityEngine] = {}
+
+
+def register_propagation(
+    name: str,
+) -> Callable[[PropagationEngine], PropagationEngine]:
+    """Decorator adding a propagation engine to the ones checked against ``propagate_failure``."""
+
+    def add(engine: PropagationEngine) -> PropagationEngine:
+        PROPAGATION_ENGINES[name] = engine
+        return engine
+
+    return add
+
+
+def register_scenarios(
+    name: str,
+) -> Callable[[ScenarioEngine], ScenarioEngine]:
+    """Decorator adding a multi-source engine, checked against unions of single-source results."""
+
+    def add(engine: ScenarioEngine) -> ScenarioEngine:
+        SCENARIO_ENGINES[name] = engine
+        return engine
+
+    return add
+
+
+def register_criticality(
+    name: str,
+) -> Callable[[CriticalityEngine], CriticalityEngine]:
+    """Decorator adding a criticality engine to the ones checked against the reference."""
+
+    def add(engine: CriticalityEngine) -> CriticalityEngine:
+        CRITICALITY_ENGINES[name] = engine
+        return engine
+
+    return add
+
+
+@dataclass(frozen=True, slots=True)
+class Case:
+    """A generated model. Self-dependencies are only present if ``self_dependencies``."""
+
+    seed: int
+    services: tuple[Service, ...]
+    dependencies: tuple[Dependency, ...]
+    self_dependencies: bool = False
+
+    def model(self) -> ValidatedModel:
+        return validate_or_raise(
+            self.services,
+            self.dependencies,
+            allow_self_dependencies=self.self_dependencies,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class Mismatch:
+    """An engine result that differs from the reference (``actual`` is the error raised)."""
+
+    engine: str
+    failure: FailureType
+    start: ServiceId | None  # propagation engines
+    k: int | None  # criticality engines
+    expected: object
+    actual: object
+    starts: tuple[ServiceId, ...] | None = None  # scenario engines
+
+
+@dataclass(frozen=True, slots=True)
+class Failure:
+    """The first mismatch found for an engine, and the smallest case still showing it."""
+
+    case: Case
+    mismatch: Mismatch
+    shrunk: Case
+    shrunk_mismatch: Mismatch
+
+
+@dataclass(slots=True)
+class Report:
+    cases: int = 0
+    seconds: float = 0.0
+    failures: list[Failure] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.failures
+
+
+def generate_case(seed: int, *, max_services: int = 24, self_dependencies: bool = False) -> Case:
+    """
+    A seeded random model of 1 to ``max_services`` services.
+
+    The topology is a random mesh or a small instance of one of the benchmark shapes,
+    which between them give DAGs, long chains and cycles of every size. Every
+    dependency then gets a uniformly random ``dep_type`` and ``call_type``, so each
+    failure type spreads over a different subgraph. With ``self_dependencies`` some
+    services also depend on themselves.
+    """
+    rng = random.Random(seed)
+    n = rng.randint(1, max_services)
+    shape = rng.choice(["mesh", *sorted(GENERATORS)])
+    if shape == "mesh":
+        services = [Service(ServiceId(f"svc-{i}")) for i in range(n)]
+        edges = [
+            (services[a].id, services[b].id)
+            for _ in range(rng.randint(0, 3 * n))
+            for a, b in [(rng.randrange(n), rng.randrange(n))]
+            if a != b
+        ]
+    else:
+        params: dict[str, dict[str, Any]] = {
+            "layered": {"layers": rng.randint(1, 4), "fanout": rng.randint(1, 3)},
+            "scale_free": {"m": rng.randint(1, 3)},
+            "deep_chains": {"chains": rng.randint(1, 4)},
+            "large_cycles": {"cycle_len": rng.randint(2, max(n, 2)), "chords": 0.3},
+        }
+        generated, deps = GENERATORS[shape](n, seed=seed, **params[shape])
+        services, edges = generated, [(d.src, d.dst) for d in deps]
+    if self_dependencies:
+        edges += [(s.id, s.id) for s in services if rng.random() < 0.2]
+
+    dependencies = {
+        edge: Dependency(*edge, rng.choice(list(DependencyType)), rng.choice(list(CallType)))
+        for edge in edges
+    }
+    return Case(seed, tuple(services), tuple(dependencies.values()), self_dependencies)
+
+
+def check_case(case: Case, engines: Iterable[str] | None = None) -> list[Mismatch]:
+    """
+    Every difference between the registered engines (or only ``engines``) and the reference.
+
+    The reference blast radius is ``propagate_failure`` on the networkx graph and the
+    reference criticality of a service is the size of that blast radius, so no
+    optimized code path is trusted. Every service is tried as a start for every
+    ``FailureType``; scenario engines get a few seeded sets of starts and must match
+    the union of their single-start radii. Rankings are compared in full and cut to a
+    third of the services.
+    """
+    model = case.model()
+    g = build_graph(model)
+    names = _all_engines() if engines is None else set(engines)
+    mismatches: list[Mismatch] = []
+
+    propagators: dict[str, Callable[..., Mapping[ServiceId, FailureType]]] = {}
+    for name in sorted(names & (set(PROPAGATION_ENGINES) | set(SCENARIO_ENGINES))):
+        prepare = PROPAGATION_ENGINES.get(name) or SCENARIO_ENGINES[name]
+        try:
+            propagators[name] = prepare(model)
+        except Exception as exc:
+            mismatches.append(Mismatch(name, FailureType.DOWN, None, None, None, repr(exc)))
+
+    start_sets = _start_sets(case)
+    ks = (None, max(1, len(case.services) // 3))
+    for failure in FailureType:
+        expected = {s.id: propagate_failure(g, start=s.id, failure=failure) for s in model.services}
+        for name, propagate in propagators.items():
+            if name in SCENARIO_ENGINES:
+                for starts in start_sets:
+                    union = {sid: failure for s in starts for sid in expected[s]}
+                    actual = _attempt(lambda: dict(propagate(starts, failure)))
+                    if actual != union:
+                        mismatches.append(
+                            Mismatch(name, failure, None, None, union, actual, starts)
+                        )
+                        break
+                continue
+            for start, radius in expected.items():
+                actual = _attempt(lambda: dict(propagate(start, failure)))
+                if actual != radius:
+                    mismatches.append(Mismatch(name, failure, start, None, radius, actual))
+                    break
+
+        ranking = top_critical((s, len(r)) for s, r in expected.items())
+        for name in sorted(names & set(CRITICALITY_ENGINES)):
+            for k in ks:
+                actual = _attempt(lambda: CRITICALITY_ENGINES[name](model, failure, k))
+                if actual != ranking[:k]:
+                    mismatches.append(Mismatch(name, failure, None, k, ranking[:k], actual))
+                    break
+    return mismatches
+
+
+def shrink(case: Case, mismatch: Mismatch) -> tuple[Case, Mismatch]:
+    """
+    A smallest case on which ``mismatch.engine`` still disagrees for ``mismatch.failure``.
+
+    Greedy delta debugging: drop halves, then quarters and so on down to single
+    elements, first of the dependencies and then of the services (with their
+    dependencies), then reset dependency types to hard/sync, until no step keeps the
+    mismatch. Each step re-checks only the failing engine.
+    """
+
+    def failing(candidate: Case) -> Mismatch | None:
+        for m in check_case(candidate, [mismatch.engine]):
+            if m.failure == mismatch.failure:
+                return m
+        return None
+
+    current = mismatch
+    progress = True
+    while progress:
+        progress = False
+        for step in (_drop_dependencies, _drop_services, _plain_types):
+            for candidate in step(case):
+                found = failing(candidate)
+                if found is not None:
+                    case, current, progress = candidate, found, True
+                    break
+    return case, current
+
+
+def run_differential(
+    *,
+    seed: int = 0,
+    cases: int = 200,
+    max_services: int = 24,
+    seconds: float | None = None,
+    engines: Iterable[str] | None = None,
+) -> Report:
+    """
+    Check ``cases`` generated models, seeded ``seed``, ``seed + 1``, ... against the reference.
+
+    Every other case allows self-dependencies. Stops early once ``seconds`` have
+    passed. The first mismatch of each engine is shrunk and reported; later cases
+    keep checking the engines that have not failed yet.
+    """
+    names = _all_engines() if engines is None else set(engines)
+    unknown = sorted(names - _all_engines())
+    if unknown:
+        raise ValueError(f"Unknown engines: {', '.join(unknown)}")
+
+    report = Report()
+    began = time.perf_counter()
+    for i in range(cases):
+        if not names or (seconds is not None and time.perf_counter() - began >= seconds):
+            break
+        case = generate_case(seed + i, max_services=max_services, self_dependencies=i % 2 == 1)
+        report.cases += 1
+        for m in check_case(case, names):
+            if m.engine in names:
+                names.discard(m.engine)
+                shrunk, last = shrink(case, m)
+                report.failures.append(Failure(case, m, shrunk, last))
+    report.seconds = time.perf_counter() - began
+    return report
+
+
+def _all_engines() -> set[str]:
+    return {*PROPAGATION_ENGINES, *SCENARIO_ENGINES, *CRITICALITY_ENGINES}
+
+
+def _start_sets(case: Case) -> list[tuple[ServiceId, ...]]:
+    """Seeded sets of services failing together: two, three, and every service."""
+    ids = [s.id for s in case.services]
+    rng = random.Random(case.seed)
+    sets = [tuple(rng.sample(ids, min(size, len(ids)))) for size in (2, 3)]
+    sets.append(tuple(ids))
+    return list(dict.fromkeys(sets))
+
+
+def _attempt(fn: Callable[[], object]) -> object:
+    try:
+        return fn()
+    except Exception as exc:  # a crash is reported like any other wrong answer
+        return repr(exc)
+
+
+def _halvings(items: Sequence[object]) -> Iterable[tuple[int, int]]:
+    """(start, stop) slices of ``items``: halves, then quarters, down to single items."""
+    size = len(items)
+    while size >= 1:
+        for lo in range(0, len(items), size):
+            yield lo, min(lo + size, len(items))
+        if size == 1:
+            break
+        size = (size + 1) // 2
+
+
+def _drop_dependencies(case: Case) -> Iterable[Case]:
+    deps = case.dependencies
+    for lo, hi in _halvings(deps):
+        yield replace(case, dependencies=deps[:lo] + deps[hi:])
+
+
+def _drop_services(case: Case) -> Iterable[Case]:
+    services = case.services
+    for lo, hi in _halvings(services):
+        if hi - lo == len(services):
+            continue  # an empty model has nothing to compare
+        gone = {s.id for s in services[lo:hi]}
+        yield replace(
+            case,
+            services=services[:lo] + services[hi:],
+            dependencies=tuple(
+                d for d in case.dependencies if d.src not in gone and d.dst not in gone
+            ),
+        )
+
+
+def _plain_types(case: Case) -> Iterable[Case]:
+    for i, d in enumerate(case.dependencies):
+        if (d.dep_type, d.call_type) != (DependencyType.HARD, CallType.SYNC):
+            deps = list(case.dependencies)
+            deps[i] = Dependency(d.src, d.dst, metadata=d.metadata)
+            yield replace(case, dependencies=tuple(deps))
+
+
+# Registered engines. Each one goes through a different optimized code path.
+
+
+@register_propagation("compiled_graph")
+def _compiled_graph(model: ValidatedModel) -> Propagator:
+    compiled = compile_graph(build_graph(model))
+    return lambda start, failure: propagate_compiled(compiled, start=start, failure=failure)
+
+
+@register_propagation("compiled_model")
+def _compiled_model(model: ValidatedModel) -> Propagator:
+    compiled = compile_model(model)
+    return lambda start, failure: propagate_compiled(compiled, start=start, failure=failure)
+
+
+@register_propagation("shared_memory")
+def _shared_memory(model: ValidatedModel) -> Propagator:
+    compiled = compile_model(model)
+    buf = bytearray(packed_size(compiled))
+    pack_into(compiled, memoryview(buf))
+    unpacked = unpack(memoryview(buf))
+    return lambda start, failure: propagate_compiled(unpacked, start=start, failure=failure)
+
+
+@register_propagation("memo")
+def _memo(model: ValidatedModel) -> Propagator:
+    from constellation_engine.sim.memo import BlastRadiusCache
+
+    compiled = compile_model(model)
+    cache = BlastRadiusCache()  # DOWN is checked first, so later failures are derived
+    return lambda start, failure: cache.blast_radius(compiled, start, failure)
+
+
+@register_propagation("explain")
+def _explain(model: ValidatedModel) -> Propagator:
+    from constellation_engine.sim.explain import explain_propagation
+
+    compiled = compile_model(model)
+    return lambda start, failure: explain_propagation(
+        compiled, starts=[start], failure=failure
+    ).impacted
+
+
+@register_propagation("timed")
+def _timed(model: ValidatedModel) -> Propagator:
+    from constellation_engine.sim.timed import timed_propagation
+
+    compiled = compile_model(model)
+    return lambda start, failure: dict.fromkeys(
+        timed_propagation(compiled, starts=[start], failure=failure), failure
+    )
+
+
+@register_scenarios("scenarios")
+def _scenarios(model: ValidatedModel) -> MultiPropagator:
+    from constellation_engine.sim.models import Scenario
+    from constellation_engine.sim.scenarios import evaluate_scenarios
+
+    compiled = compile_model(model)
+
+    def propagate(
+        starts: Sequence[ServiceId], failure: FailureType
+    ) -> dict[ServiceId, FailureType]:
+        scenario = Scenario("check", tuple(starts), failure)
+        ((_, impacted),) = evaluate_scenarios(compiled, [scenario])
+        return impacted
+
+    return propagate
+
+
+@register_criticality("reachability")
+def _reachability(model: ValidatedModel, failure: FailureType, k: int | None) -> Ranking:
+    return top_critical(compute_criticality(model, failure=failure).items(), k)
+
+
+@register_criticality("top_k")
+def _top_k(model: ValidatedModel, failure: FailureType, k: int | None) -> Ranking:
+    scores = compute_criticality(model, failure=failure, top_k=k or len(model.services))
+    return top_critical(scores.items(), k)
+
+
+@register_criticality("scoped")
+def _scoped(model: ValidatedModel, failure: FailureType, k: int | None) -> Ranking:
+    compiled = compile_model(model)
+    scores = [
+        pair
+        for sid in compiled.ids
+        for pair in compute_criticality(compiled, failure=failure, services=[sid]).items()
+    ]
+    return top_critical(scores, k)
+
+
+# The last (model, failure, scores) of ``_parallel``: ``check_case`` asks for every k
+# of a failure in turn, and a process pool per call would dominate the run.
+_parallel_last: list[tuple[ValidatedModel, FailureType, dict[ServiceId, int]]] = []
+
+
+@register_criticality("parallel")
+def _parallel(model: ValidatedModel, failure: FailureType, k: int | None) -> Ranking:
+    if not (_parallel_last and _parallel_last[0][0] is model and _parallel_last[0][1] is failure):
+        scores = compute_criticality(model, failure=failure, workers=2)
+        _parallel_last[:] = [(model, failure, scores)]
+    return top_critical(_parallel_last[0][2].items(), k)
+
+
+@register_criticality("nk_sweep")
+def _nk_sweep(model: ValidatedModel, failure: FailureType, k: int | None) -> Ranking:
+    from constellation_engine.sim.sweep import nk_sweep
+
+    top = k or len(model.services)
+    return [(members[0], n) for members, n in nk_sweep(model, 1, failure=failure, top=top)]
+
+
+@register_criticality("incremental")
+def _incremental(model: ValidatedModel, failure: FailureType, k: int | None) -> Ranking:
+    from constellation_engine.sim.incremental import update_criticality
+
+    # Score the model without its last dependency between two services, then add it
+    # back as a delta.
+    plain = [i for i, d in enumerate(model.dependencies) if d.src != d.dst]
+    if not plain:
+        return top_critical(compute_criticality(model, failure=failure).items(), k)
+    last = model.dependencies[plain[-1]]
+    g = build_graph(
+        validate_or_raise(
+            model.services,
+            [d for d in model.dependencies if d is not last],
+            allow_self_dependencies=True,
+        )
+    )
+    scores = update_criticality(
+        g,
+        compute_criticality(g, failure=failure),
+        ManifestDelta(add_dependencies=(last,)),
+        failure=failure,
+    )
+    return top_critical(scores.items(), k)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m constellation_engine.bench.differential",
+        description="Check every registered engine against the reference on random models.",
+    )
+    parser.add_argument("--cases", type=int, default=200, help="Models to check (default: 200)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the first model (default: 0)")
+    parser.add_argument(
+        "--max-services",
+        type=int,
+        default=24,
+        help="Largest generated model, in services (default: 24)",
+    )
+    parser.add_argument(
+        "--seconds",
+        type=float,
+        default=60.0,
+        help="Stop after this many seconds even if cases remain (default: 60)",
+    )
+    parser.add_argument(
+        "--engines",
+        default=None,
+        help="Comma-separated engines to check (default: all of "
+        f"{','.join(sorted(_all_engines()))})",
+    )
+    parser.add_argument(
+        "--out-dir",
+        default=None,
+        help="Write each shrunk failing model here as a JSON manifest",
+    )
+    args = parser.parse_args(argv)
+    if args.cases < 1 or args.max_services < 1:
+        parser.error("--cases and --max-services must be at least 1")
+
+    engines = None if args.engines is None else [e for e in args.engines.split(",") if e]
+    try:
+        report = run_differential(
+            seed=args.seed,
+            cases=args.cases,
+            max_services=args.max_services,
+            seconds=args.seconds,
+            engines=engines,
+        )
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    for failure in report.failures:
+        m, shrunk = failure.shrunk_mismatch, failure.shrunk
+        if m.starts is not None:
+            where = f"starts={','.join(m.starts)}"
+        else:
+            where = f"start={m.start}" if m.start is not None else f"k={m.k}"
+        print(
+            f"MISMATCH {m.engine} failure={m.failure.value} {where} "
+            f"(seed {failure.case.seed}, shrunk to {len(shrunk.services)} services and "
+            f"{len(shrunk.dependencies)} dependencies)"
+        )
+        print(f"  expected: {m.expected}")
+        print(f"  actual:   {m.actual}")
+        for d in shrunk.dependencies:
+            print(f"  {d.src} -> {d.dst} ({d.dep_type.value}/{d.call_type.value})")
+        if args.out_dir is not None:
+            out = Path(args.out_dir)
+            out.mkdir(parents=True, exist_ok=True)
+            path = out / f"{m.engine}-{m.failure.value}-seed{failure.case.seed}.json"
+            write_manifest((list(shrunk.services), list(shrunk.dependencies)), path)
+            print(f"  wrote {path}")
+
+    status = "no mismatches" if report.ok else f"{len(report.failures)} engines disagree"
+    print(f"checked {report.cases} models in {report.seconds:.1f}s: {status}")
+    return 0 if report.ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
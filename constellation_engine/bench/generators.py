@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import json
+import random
+from pathlib import Path
+from typing import Callable
+
+from constellation_engine.core.types import (
+    CallType,
+    Dependency,
+    DependencyType,
+    Service,
+    ServiceId,
+)
+
+Model = tuple[list[Service], list[Dependency]]
+
+# Relative frequencies of edge kinds in generated topologies; most calls in a
+# microservice mesh are hard and synchronous.
+_DEP_TYPES = (DependencyType.HARD, DependencyType.SOFT, DependencyType.OPTIONAL)
+_DEP_CUM_WEIGHTS = (6, 9, 10)
+_CALL_TYPES = (CallType.SYNC, CallType.ASYNC)
+_CALL_CUM_WEIGHTS = (7, 10)
+
+
+def layered(n: int, *, seed: int = 0, layers: int = 6, fanout: int = 3) -> Model:
+    """Microservice tiers: each service depends on ``fanout`` services in deeper tiers."""
+    rng = random.Random(seed)
+    services = _services(n)
+    bounds = [round(i * n / layers) for i in range(layers + 1)]
+    deps: list[Dependency] = []
+    for layer in range(layers - 1):
+        deeper = range(bounds[layer + 1], n)
+        if not deeper:
+            break  # fewer services than tiers: the deeper tiers are empty
+        for src in range(bounds[layer], bounds[layer + 1]):
+            targets = {rng.choice(deeper) for _ in range(fanout)}
+            deps.extend(_dep(rng, src, dst) for dst in sorted(targets))
+    return services, deps
+
+
+def scale_free(n: int, *, seed: int = 0, m: int = 2) -> Model:
+    """Preferential attachment: new services favour already popular dependencies."""
+    rng = random.Random(seed)
+    services = _services(n)
+    deps: list[Dependency] = []
+    # Each node appears once per incoming edge plus once for itself.
+    pool: list[int] = [0]
+    for src in range(1, n):
+        targets = {rng.choice(pool) for _ in range(min(m, src))}
+        for dst in sorted(targets):
+            deps.append(_dep(rng, src, dst))
+            pool.append(dst)
+        pool.append(src)
+    return services, deps
+
+
+def deep_chains(n: int, *, seed: int = 0, chains: int = 8) -> Model:
+    """Long HARD/SYNC call chains with occasional cross-links between chains."""
+    rng = random.Random(seed)
+    services = _services(n)
+    deps: list[Dependency] = []
+    for src in range(n - chains):
+        deps.append(Dependency(_sid(src), _sid(src + chains)))
+        if rng.random() < 0.05:
+            dst = rng.randrange(src + 1, n)
+            if dst != src + chains:
+                deps.append(_dep(rng, src, dst))
+    return services, deps
+
+
+def large_cycles(n: int, *, seed: int = 0, cycle_len: int = 1000, chords: float = 0.1) -> Model:
+    """Rings of ``cycle_len`` services plus random chords, giving big SCCs."""
+    rng = random.Random(seed)
+    services = _services(n)
+    deps: list[Dependency] = []
+    for start in range(0, n, cycle_len):
+        ring = range(start, min(start + cycle_len, n))
+        if len(ring) < 2:
+            continue
+        for k, src in enumerate(ring):
+            deps.append(_dep(rng, src, ring[(k + 1) % len(ring)]))
+        for _ in range(int(len(ring) * chords)):
+            src, dst = rng.sample(range(n), 2)
+            deps.append(_dep(rng, src, dst))
+    return services, _dedupe(deps)
+
+
+GENERATORS: dict[str, Callable[..., Model]] = {
+    "layered": layered,
+    "scale_free": scale_free,
+    "deep_chains": deep_chains,
+    "large_cycles": large_cycles,
+}
+
+
+def write_manifest(model: Model, path: str | Path) -> None:
+    """Write a generated model as a JSON manifest readable by the loaders."""
+    services, deps = model
+    doc = {
+        "services": [{"id": s.id} for s in services],
+        "dependencies": [
+            {
+                "src": d.src,
+                "dst": d.dst,
+                "dep_type": d.dep_type.value,
+                "call_type": d.call_type.value,
+            }
+            for d in deps
+        ],
+    }
+    with Path(path).open("w", encoding="utf-8") as fh:
+        json.dump(doc, fh)
+
+
+def _sid(i: int) -> ServiceId:
+    return ServiceId(f"svc-{i}")
+
+
+def _services(n: int) -> list[Service]:
+    return [Service(_sid(i)) for i in range(n)]
+
+
+def _dep(rng: random.Random, src: int, dst: int) -> Dependency:
+    dep_type = rng.choices(_DEP_TYPES, cum_weights=_DEP_CUM_WEIGHTS)[0]
+    call_type = rng.choices(_CALL_TYPES, cum_weights=_CALL_CUM_WEIGHTS)[0]
+    return Dependency(_sid(src), _sid(dst), dep_type, call_type)
+
+
+def _dedupe(deps: list[Dependency]) -> list[Dependency]:
+    seen: set[tuple[str, str]] = set()
+    out: list[Dependency] = []
+    for d in deps:
+        if (d.src, d.dst) not in seen:
+            seen.add((d.src, d.dst))
+            out.append(d)
+    return out
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Sequence
+
+from constellation_engine.bench.generators import GENERATORS, write_manifest
+
+# Modules that must stay out of the CLI's import graph unless a command needs them.
+HEAVY_MODULES = ("networkx", "yaml")
+
+_PROBE = """\
+import sys
+from constellation_engine.cli.main import main
+code = main(sys.argv[1:])
+print(",".join(m for m in {heavy!r} if m in sys.modules), file=sys.stderr)
+raise SystemExit(code)
+"""
+
+
+def measure_startup(argv: Sequence[str], *, repeat: int = 5) -> dict[str, Any]:
+    """
+    Time ``constellation-engine <argv>`` in fresh interpreters.
+
+    Returns the best wall time of ``repeat`` runs, the best time of a bare
+    ``python -c pass`` for reference, their difference (the CLI's own overhead), and
+    which of ``HEAVY_MODULES`` the command ended up importing.
+    """
+    baseline = _best([sys.executable, "-c", "pass"], repeat)
+    probe = [sys.executable, "-c", _PROBE.format(heavy=HEAVY_MODULES), *argv]
+    seconds = _best(probe, repeat)
+    proc = subprocess.run(probe, capture_output=True, text=True)
+    loaded = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else ""
+    return {
+        "argv": list(argv),
+        "seconds": seconds,
+        "interpreter_seconds": baseline,
+        "overhead_seconds": max(seconds - baseline, 0.0),
+        "heavy_modules": [m for m in loaded.split(",") if m],
+    }
+
+
+def _best(cmd: list[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(max(repeat, 1)):
+        start = time.perf_counter()
+        subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m constellation_engine.bench.startup",
+        description="Measure CLI startup time and fail when it exceeds a budget.",
+    )
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=150.0,
+        help="Maximum CLI overhead over a bare interpreter, in ms (default: 150)",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per command; best is kept")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        manifest = Path(tmp) / "manifest.json"
+        write_manifest(GENERATORS["layered"](50, seed=0), manifest)
+        # The pre-commit shape: validate and stats on a small JSON manifest, no cache.
+        commands = [
+            ["validate", "--no-cache", str(manifest)],
+            ["stats", "--no-cache", str(manifest)],
+        ]
+        failed = False
+        for cmd in commands:
+            row = measure_startup(cmd, repeat=args.repeat)
+            overhead_ms = row["overhead_seconds"] * 1000
+            heavy = ", ".join(row["heavy_modules"]) or "none"
+            print(f"{cmd[0]:>10} {overhead_ms:8.1f} ms over interpreter (heavy imports: {heavy})")
+            if overhead_ms > args.budget_ms:
+                print(f"OVER BUDGET {cmd[0]}: {overhead_ms:.1f} ms > {args.budget_ms:.1f} ms")
+                failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
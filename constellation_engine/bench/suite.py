@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import json
+import platform
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+from constellation_engine.bench.generators import GENERATORS, write_manifest
+from constellation_engine.core.compact import compact_model
+from constellation_engine.core.graph import build_graph
+from constellation_engine.core.validate import validate_model, validate_or_raise
+from constellation_engine.io.stream import load_compact, load_domain
+from constellation_engine.sim.compiled import compile_model
+from constellation_engine.sim.criticality import compute_criticality
+from constellation_engine.sim.models import FailureType
+from constellation_engine.sim.propagate import propagate_failure
+
+PHASES = (
+    "load",
+    "load_compact",
+    "validate",
+    "build_graph",
+    "compile",
+    "propagate_failure",
+    "compute_criticality",
+    "approximate_criticality",
+)
+
+# Number of start services timed per propagate_failure measurement.
+_PROPAGATION_STARTS = 10
+
+
+def run_suite(
+    *,
+    shapes: Iterable[str] = tuple(GENERATORS),
+    sizes: Iterable[int] = (1_000, 10_000),
+    seed: int = 0,
+    repeat: int = 3,
+    max_criticality_nodes: int = 100_000,
+    progress: Callable[[dict[str, Any]], None] | None = None,
+) -> dict[str, Any]:
+    """
+    Time every pipeline phase on generated topologies.
+
+    Each phase is run ``repeat`` times and the fastest run is kept. Criticality is
+    skipped above ``max_criticality_nodes``, where it would dominate the run time.
+    Returns a JSON-ready document with environment metadata and one result row per
+    (shape, size, phase).
+    """
+    results: list[dict[str, Any]] = []
+    for shape in shapes:
+        for size in sizes:
+            for row in _run_one(shape, size, seed, repeat, max_criticality_nodes):
+                results.append(row)
+                if progress is not None:
+                    progress(row)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": seed,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare(
+    current: dict[str, Any],
+    baseline: dict[str, Any],
+    *,
+    tolerance: float = 0.25,
+) -> list[str]:
+    """Describe every result that is more than ``tolerance`` slower than the baseline."""
+    before = {_key(r): r["seconds"] for r in baseline["results"]}
+    regressions = []
+    for row in current["results"]:
+        old = before.get(_key(row))
+        if old is not None and row["seconds"] > old * (1 + tolerance):
+            regressions.append(
+                f"{row['shape']}/{row['nodes']}/{row['phase']}: "
+                f"{row['seconds']:.4f}s vs baseline {old:.4f}s "
+                f"(+{(row['seconds'] / old - 1) * 100:.0f}%)"
+            )
+    return regressions
+
+
+def write_results(doc: dict[str, Any], path: str | Path) -> None:
+    Path(path).write_text(json.dumps(doc, indent=2), encoding="utf-8")
+
+
+def read_results(path: str | Path) -> dict[str, Any]:
+    doc: dict[str, Any] = json.loads(Path(path).read_text(encoding="utf-8"))
+    return doc
+
+
+def _run_one(
+    shape: str, size: int, seed: int, repeat: int, max_criticality_nodes: int
+) -> Iterable[dict[str, Any]]:
+    model = GENERATORS[shape](size, seed=seed)
+    services, deps = model
+    base = {"shape": shape, "nodes": len(services), "edges": len(deps)}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        manifest = Path(tmp) / f"{shape}-{size}.json"
+        write_manifest(model, manifest)
+        # Peak traced memory shows what the compact model saves over domain objects.
+        yield {
+            **base,
+            "phase": "load",
+            "seconds": _best(repeat, lambda: load_domain(manifest)),
+            "peak_bytes": _peak(lambda: load_domain(manifest)),
+        }
+        yield {
+            **base,
+            "phase": "load_compact",
+            "seconds": _best(repeat, lambda: load_compact(manifest)),
+            "peak_bytes": _peak(lambda: load_compact(manifest)),
+        }
+
+    yield {
+        **base,
+        "phase": "validate",
+        "seconds": _best(repeat, lambda: validate_model(services, deps)),
+    }
+    # Validation is timed above; the remaining phases reuse one validated model.
+    validated = validate_or_raise(services, deps)
+    yield {
+        **base,
+        "phase": "build_graph",
+        "seconds": _best(repeat, lambda: build_graph(validated)),
+        "peak_bytes": _peak(lambda: build_graph(validated)),
+    }
+    compact = compact_model(validated, metadata=False)
+    yield {
+        **base,
+        "phase": "compile",
+        "seconds": _best(repeat, lambda: compile_model(compact)),
+        "peak_bytes": _peak(lambda: compile_model(compact)),
+    }
+
+    g = build_graph(validated)
+    step = max(1, len(services) // _PROPAGATION_STARTS)
+    starts = [s.id for s in services[::step][:_PROPAGATION_STARTS]]
+
+    def propagate() -> None:
+        for start in starts:
+            propagate_failure(g, start=start, failure=FailureType.DOWN)
+
+    yield {**base, "phase": "propagate_failure", "seconds": _best(repeat, propagate)}
+
+    if len(services) <= max_criticality_nodes:
+        yield {
+            **base,
+            "phase": "compute_criticality",
+            "seconds": _best(repeat, lambda: compute_criticality(g, failure=FailureType.DOWN)),
+        }
+
+    # Sketch estimates are checked against exact scores wherever those are affordable.
+    compiled = compile_model(compact)
+    estimated = compute_criticality(compiled, approximate=True)
+    row = {
+        **base,
+        "phase": "approximate_criticality",
+        "seconds": _best(repeat, lambda: compute_criticality(compiled, approximate=True)),
+        "peak_bytes": _peak(lambda: compute_criticality(compiled, approximate=True)),
+    }
+    if len(services) <= max_criticality_nodes:
+        exact = compute_criticality(compiled)
+        errors = [abs(estimated[s] - n) / n for s, n in exact.items()]
+        row["max_relative_error"] = max(errors)
+        row["mean_relative_error"] = sum(errors) / len(errors)
+    yield row
+
+
+def _best(repeat: int, fn: Callable[[], object]) -> float:
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def _peak(fn: Callable[[], object]) -> int:
+    """Peak bytes traced while ``fn`` runs, including what its result keeps alive."""
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _key(row: dict[str, Any]) -> tuple[str, int, str]:
+    return row["shape"], row["nodes"], row["phase"]
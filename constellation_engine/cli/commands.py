@@ -0,0 +1,405 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Iterator
+
+from constellation_engine.cli.main import _cache, _describe
+from constellation_engine.core.metrics import note, stage
+from constellation_engine.core.types import ServiceId
+from constellation_engine.io.sources import is_federated
+from constellation_engine.io.stream import load_domain
+
+if TYPE_CHECKING:
+    from constellation_engine.sim.compiled import CompiledGraph
+    from constellation_engine.sim.explain import Propagation
+    from constellation_engine.sim.models import FailureType, Scenario
+
+
+def run_analysis(
+    args: argparse.Namespace, compiled: CompiledGraph, selected: list[ServiceId] | None
+) -> int:
+    """Run ``spof``, ``nk-sweep``, ``blast-radius`` or ``criticality`` on ``compiled``.
+
+    ``selected`` holds the services matching ``--where``, or None without it.
+    """
+    if args.cmd == "spof":
+        from constellation_engine.sim.spof import single_points_of_failure
+
+        entries = None if args.entry is None else [ServiceId(e) for e in args.entry]
+        unknown = [e for e in entries or () if e not in compiled.index]
+        if unknown:
+            print(f"unknown entry point: {', '.join(unknown)}")
+            return 2
+        with stage("spof"):
+            spofs = single_points_of_failure(compiled, entries)
+            note(nodes=compiled.num_nodes, edges=compiled.num_edges)
+        if args.format != "text":
+            _write(
+                args,
+                (
+                    {"entry": entry, "service": svc, "depth": depth}
+                    for entry, chain in spofs.items()
+                    for depth, svc in enumerate(chain, 1)
+                ),
+                ("entry", "service", "depth"),
+            )
+            return 0
+        print("single points of failure (hard sync dependencies, nearest first):")
+        for entry, chain in spofs.items():
+            print(f"- {entry}: {' -> '.join(chain) if chain else 'none'}")
+        return 0
+
+    if args.cmd == "nk-sweep":
+        from constellation_engine.sim.models import FailureType
+        from constellation_engine.sim.sweep import nk_sweep
+
+        with stage("nk_sweep"):
+            combinations = nk_sweep(
+                compiled,
+                args.k,
+                failure=FailureType(args.failure),
+                top=args.top,
+                workers=args.workers,
+            )
+            note(nodes=compiled.num_nodes, edges=compiled.num_edges)
+            # Each combination is written as soon as the sweep has settled it.
+            if args.format != "text":
+                _write(
+                    args,
+                    ({"services": ",".join(c), "impacts": n} for c, n in combinations),
+                    ("services", "impacts"),
+                )
+                return 0
+            print(f"worst {args.k}-service failures (failure={args.failure}):")
+            for members, n in combinations:
+                print(f"- {' + '.join(members)}: impacts {n} services")
+        return 0
+
+    if args.cmd == "blast-radius" and args.scenarios is not None:
+        from constellation_engine.io.loaders import load_scenarios
+        from constellation_engine.sim.models import FailureType
+        from constellation_engine.sim.scenarios import evaluate_scenarios
+
+        scenarios = load_scenarios(
+            args.scenarios,
+            default_failure=FailureType(args.failure or "down"),
+        )
+        if args.explain:
+            return _explain_scenarios(args, compiled, scenarios)
+        if args.timed:
+            return _timed_scenarios(args, compiled, scenarios)
+        with stage("scenarios"):
+            results = evaluate_scenarios(compiled, scenarios)
+            note(nodes=compiled.num_nodes, edges=compiled.num_edges)
+            # Each scenario is written as soon as it is evaluated, before the next one.
+            if args.format != "text":
+                _write(
+                    args,
+                    (
+                        {"scenario": scenario.name, "service": svc, "failure": f.value}
+                        for scenario, impacted in results
+                        for svc, f in impacted.items()
+                    ),
+                    ("scenario", "service", "failure"),
+                )
+                return 0
+            for scenario, impacted in results:
+                print(
+                    f"scenario {scenario.name} ({scenario.failure.value}) "
+                    f"[{', '.join(scenario.services)}]: impacts {len(impacted)} services"
+                )
+                for svc, f in impacted.items():
+                    print(f"- {svc}: {f.value}")
+        return 0
+
+    if args.cmd == "blast-radius":
+        from constellation_engine.sim.compiled import propagate_compiled_failures
+        from constellation_engine.sim.models import FailureType
+
+        if args.explain:
+            return _explain_scenarios(args, compiled, None)
+        if args.timed:
+            return _timed_scenarios(args, compiled, None)
+
+        with stage("propagate"):
+            impacted = propagate_compiled_failures(
+                compiled,
+                starts=_starts(args),
+                failure=FailureType(args.failure),
+            )
+            note(nodes=compiled.num_nodes, edges=compiled.num_edges)
+
+        if args.format != "text":
+            _write(
+                args,
+                ({"service": svc, "failure": f.value} for svc, f in impacted.items()),
+                ("service", "failure"),
+            )
+            return 0
+        print(f"blast radius from {_origin(args)} ({args.failure}) [impacts dependers]:")
+        for svc, f in impacted.items():
+            print(f"- {svc}: {f.value}")
+        return 0
+
+    if args.cmd == "criticality":
+        from constellation_engine.sim.criticality import iter_criticality
+        from constellation_engine.sim.models import FailureType
+
+        with stage("criticality"):
+            # Exact top-N pruning needs the whole ranking neither saved nor printed.
+            pruned = args.top and not (
+                args.save_scores or args.approximate or args.workers > 1 or selected
+            )
+            scores = iter_criticality(
+                compiled,
+                failure=FailureType(args.failure),
+                workers=args.workers,
+                approximate=args.approximate,
+                precision=args.precision,
+                top_k=args.top if pruned else None,
+                services=selected,
+            )
+            note(nodes=compiled.num_nodes, edges=compiled.num_edges)
+
+        _print_ranking(args, scores)
+        return 0
+
+    return 1
+
+
+def _explain_scenarios(
+    args: argparse.Namespace,
+    compiled: CompiledGraph,
+    scenarios: list[Scenario] | None,
+) -> int:
+    from constellation_engine.sim.explain import explain_propagation
+    from constellation_engine.sim.models import FailureType
+
+    todo: list[tuple[Scenario | None, list[ServiceId], FailureType]]
+    if scenarios is None:
+        todo = [(None, _starts(args), FailureType(args.failure))]
+    else:
+        todo = [(sc, list(sc.services), sc.failure) for sc in scenarios]
+    runs = (
+        (scenario, explain_propagation(compiled, starts=starts, failure=failure))
+        for scenario, starts, failure in todo
+    )
+    with stage("propagate"):
+        note(nodes=compiled.num_nodes, edges=compiled.num_edges)
+        # Each scenario is written as soon as it is evaluated, before the next one.
+        if args.format != "text":
+            fields: tuple[str, ...] = ("service", "failure", "via", "dep_type", "call_type")
+            if scenarios is not None:
+                fields = ("scenario", *fields)
+            _write(args, _explained_rows(runs), fields)
+            return 0
+        _print_explained(args, runs)
+    return 0
+
+
+def _print_explained(
+    args: argparse.Namespace, runs: Iterable[tuple[Scenario | None, Propagation]]
+) -> None:
+    for scenario, prop in runs:
+        impacted = prop.impacted
+        if scenario is None:
+            print(f"blast radius from {_origin(args)} ({args.failure}) [impacts dependers]:")
+        else:
+            print(
+                f"scenario {scenario.name} ({scenario.failure.value}) "
+                f"[{', '.join(scenario.services)}]: impacts {len(impacted)} services"
+            )
+        for svc, f in impacted.items():
+            chain = prop.explain(svc)
+            if not chain:
+                print(f"- {svc}: {f.value}")
+                continue
+            hops = "".join(
+                f" -[{s.dep_type.value}/{s.call_type.value}]-> {s.dependency}" for s in chain
+            )
+            print(f"- {svc}: {f.value} ({svc}{hops})")
+
+
+def _explained_rows(
+    runs: Iterable[tuple[Scenario | None, Propagation]],
+) -> Iterator[dict[str, object]]:
+    for scenario, prop in runs:
+        for svc, f in prop.impacted.items():
+            step = prop.via(svc)
+            row: dict[str, object] = {} if scenario is None else {"scenario": scenario.name}
+            row.update(
+                service=svc,
+                failure=f.value,
+                via=None if step is None else step.dependency,
+                dep_type=None if step is None else step.dep_type.value,
+                call_type=None if step is None else step.call_type.value,
+            )
+            yield row
+
+
+def _timed_scenarios(
+    args: argparse.Namespace,
+    compiled: CompiledGraph,
+    scenarios: list[Scenario] | None,
+) -> int:
+    from constellation_engine.io.cache import load_metadata
+    from constellation_engine.sim.models import FailureType
+    from constellation_engine.sim.timed import timed_propagation
+
+    todo: list[tuple[Scenario | None, list[ServiceId], FailureType]]
+    if scenarios is None:
+        todo = [(None, _starts(args), FailureType(args.failure))]
+    else:
+        todo = [(sc, list(sc.services), sc.failure) for sc in scenarios]
+    with stage("metadata"):
+        metadata = load_metadata(args.path, _cache(args))
+    runs = (
+        (
+            scenario,
+            failure,
+            timed_propagation(
+                compiled,
+                starts=starts,
+                failure=failure,
+                metadata=metadata,
+                key=args.delay_key,
+                deadline=args.deadline,
+            ),
+        )
+        for scenario, starts, failure in todo
+    )
+    with stage("propagate"):
+        note(nodes=compiled.num_nodes, edges=compiled.num_edges)
+        # Each scenario is written as soon as it is evaluated, before the next one.
+        if args.format != "text":
+            fields: tuple[str, ...] = ("service", "failure", "time_ms")
+            if scenarios is not None:
+                fields = ("scenario", *fields)
+            _write(
+                args,
+                (
+                    {
+                        **({} if scenario is None else {"scenario": scenario.name}),
+                        "service": svc,
+                        "failure": failure.value,
+                        "time_ms": t,
+                    }
+                    for scenario, failure, times in runs
+                    for svc, t in times.items()
+                ),
+                fields,
+            )
+            return 0
+        _print_timed(args, runs)
+    return 0
+
+
+def _print_timed(
+    args: argparse.Namespace,
+    runs: Iterable[tuple[Scenario | None, FailureType, dict[ServiceId, float]]],
+) -> None:
+    from constellation_engine.sim.timed import DELAY_KEYS
+
+    for scenario, failure, times in runs:
+        cutoff = "" if args.deadline is None else f", deadline {args.deadline:g} ms"
+        timing = f"{args.delay_key or DELAY_KEYS[failure]}{cutoff}"
+        if scenario is None:
+            print(
+                f"timed blast radius from {_origin(args)} ({args.failure}, {timing}) "
+                "[impacts dependers]:"
+            )
+        else:
+            print(
+                f"scenario {scenario.name} ({scenario.failure.value}, {timing}) "
+                f"[{', '.join(scenario.services)}]: impacts {len(times)} services"
+            )
+        for svc, t in times.items():
+            print(f"- {svc}: {failure.value} at {t:g} ms")
+
+
+def _starts(args: argparse.Namespace) -> list[ServiceId]:
+    return [ServiceId(args.service)] if args.starts is None else args.starts
+
+
+def _origin(args: argparse.Namespace) -> str:
+    return args.service if args.where is None else f"services where {_describe(args.where)}"
+
+
+def _print_ranking(args: argparse.Namespace, scores: Iterable[tuple[ServiceId, int]]) -> None:
+    from constellation_engine.sim.criticality import top_critical
+
+    if args.save_scores:
+        saved = dict(scores)
+        Path(args.save_scores).write_text(
+            json.dumps({"failure": args.failure, "scores": saved}, indent=2),
+            encoding="utf-8",
+        )
+        scores = saved.items()
+
+    ranked = top_critical(scores, args.top or None)
+
+    if args.format != "text":
+        _write(args, ({"service": s, "impacts": n} for s, n in ranked), ("service", "impacts"))
+        return
+    if args.approximate:
+        from constellation_engine.sim.sketch import relative_error
+
+        error = relative_error(args.precision)
+        print(
+            f"criticality ranking (failure={args.failure}, approximate, "
+            f"standard error {error:.1%}):"
+        )
+        for svc, score in ranked:
+            print(f"- {svc}: impacts ~{score} services")
+        return
+    print(f"criticality ranking (failure={args.failure}):")
+    for svc, score in ranked:
+        print(f"- {svc}: impacts {score} services")
+
+
+def _write(
+    args: argparse.Namespace, rows: Iterable[dict[str, object]], fields: tuple[str, ...]
+) -> None:
+    from constellation_engine.io.report import write_rows
+
+    write_rows(rows, fields, args.format, sys.stdout)
+
+
+def criticality_delta(args: argparse.Namespace) -> int:
+    from constellation_engine.core.graph import build_graph
+    from constellation_engine.io.loaders import load_delta
+    from constellation_engine.sim.criticality import compute_criticality
+    from constellation_engine.sim.incremental import update_criticality
+    from constellation_engine.sim.models import FailureType
+
+    failure = FailureType(args.failure)
+    if is_federated(args.path):
+        from constellation_engine.io.federated import FederatedLoader
+
+        model = FederatedLoader(args.path, cache=_cache(args)).load(metadata=True)
+        services, deps = list(model.services()), list(model.dependencies())
+    else:
+        with stage("load"):
+            services, deps = load_domain(args.path)
+            note(nodes=len(services), edges=len(deps))
+    g = build_graph(services, deps)
+
+    if args.baseline is None:
+        with stage("criticality"):
+            base = compute_criticality(g, failure=failure, workers=args.workers)
+    else:
+        data = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        if data.get("failure") != failure.value:
+            print(f"baseline was computed for failure={data.get('failure')}, not {failure.value}")
+            return 2
+        base = {ServiceId(k): int(v) for k, v in data["scores"].items()}
+
+    delta = load_delta(args.delta)
+    with stage("criticality_update"):
+        scores = update_criticality(g, base, delta, failure=failure)
+        note(nodes=g.number_of_nodes(), edges=g.number_of_edges())
+    _print_ranking(args, scores.items())
+    return 0
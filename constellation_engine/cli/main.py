@@ -1,37 +1,164 @@
 from __future__ import annotations
 
 import argparse
+import json
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING
 
-from constellation_engine.core.graph import build_graph
+from constellation_engine.core.metrics import count_edges, note, stage
+from constellation_engine.core.types import ServiceId
 from constellation_engine.core.validate import validate_model
-from constellation_engine.io.loaders import load_manifest, manifest_to_domain
+from constellation_engine.io.cache import (
+    GraphCache,
+    default_cache_dir,
+    load_compiled,
+    manifest_digest,
+)
+from constellation_engine.io.report import FORMATS
+from constellation_engine.io.sources import is_federated
+from constellation_engine.io.stream import load_domain
+from constellation_engine.sim.compiled import out_degrees
 
+if TYPE_CHECKING:
+    from constellation_engine.sim.compiled import CompiledGraph
+
+_PATH_HELP = "Manifest file (.yaml/.yml/.json), or a directory or quoted glob of them"
+_FORMAT_HELP = "Output format (default: text); jsonl, csv and json stream one row per result"
+_WHERE_DEP_HELP = (
+    "Only keep dependencies whose metadata has KEY=VALUE (repeatable; values of one key "
+    "are alternatives, different keys must all match)"
+)
+
+
+def main(argv: list[str] | None = None) -> int:
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not read or write the compiled manifest cache",
+    )
+    common.add_argument(
+        "--cache-dir",
+        default=None,
+        help="Compiled manifest cache directory (default: $CONSTELLATION_CACHE_DIR, "
+        "else $XDG_CACHE_HOME/constellation-engine, else ~/.cache/constellation-engine)",
+    )
+    common.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print per-stage wall time, peak memory, sizes and edges visited to stderr",
+    )
+    common.add_argument(
+        "--metrics-out",
+        default=None,
+        help="Write per-stage metrics as JSON to this file",
+    )
+    common.add_argument(
+        "--profile-out",
+        default=None,
+        help="Write a cProfile dump (readable with pstats/snakeviz) to this file",
+    )
 
-def main() -> int:
     parser = argparse.ArgumentParser(prog="constellation-engine")
     sub = parser.add_subparsers(dest="cmd", required=True)
 
-    p_validate = sub.add_parser("validate", help="Validate a manifest.")
-    p_validate.add_argument("path", help="Path to .yaml/.yml/.json manifest")
+    p_validate = sub.add_parser("validate", help="Validate a manifest.", parents=[common])
+    p_validate.add_argument("path", help=_PATH_HELP)
+    p_validate.add_argument(
+        "--max-errors",
+        type=int,
+        default=None,
+        help="Stop after reporting this many errors",
+    )
+    p_validate.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help="Stop at the first error",
+    )
 
-    p_stats = sub.add_parser("stats", help="Show basic graph stats from a manifest.")
-    p_stats.add_argument("path", help="Path to .yaml/.yml/.json manifest")
+    p_stats = sub.add_parser(
+        "stats", help="Show basic graph stats from a manifest.", parents=[common]
+    )
+    p_stats.add_argument("path", help=_PATH_HELP)
+    p_stats.add_argument(
+        "--where",
+        action="append",
+        default=None,
+        metavar="KEY=VALUE",
+        help="Only count services whose metadata has KEY=VALUE, and the dependencies "
+        "among them (repeatable; values of one key are alternatives, keys must all match)",
+    )
+    p_stats.add_argument(
+        "--where-dependency",
+        action="append",
+        default=None,
+        metavar="KEY=VALUE",
+        help=_WHERE_DEP_HELP,
+    )
 
-    p_blast = sub.add_parser("blast-radius", help="Compute blast radius from a failure.")
-    p_blast.add_argument("path", help="Path to manifest file")
-    p_blast.add_argument("--service", required=True, help="Service ID to fail")
+    p_blast = sub.add_parser(
+        "blast-radius", help="Compute blast radius from a failure.", parents=[common]
+    )
+    p_blast.add_argument("path", help=_PATH_HELP)
+    target = p_blast.add_mutually_exclusive_group(required=True)
+    target.add_argument("--service", help="Service ID to fail")
+    target.add_argument(
+        "--scenarios",
+        help="YAML/JSON file of named multi-service failure scenarios to evaluate",
+    )
+    target.add_argument(
+        "--where",
+        action="append",
+        default=None,
+        metavar="KEY=VALUE",
+        help="Fail every service whose metadata has KEY=VALUE together (repeatable; "
+        "values of one key are alternatives, keys must all match)",
+    )
+    p_blast.add_argument(
+        "--where-dependency",
+        action="append",
+        default=None,
+        metavar="KEY=VALUE",
+        help=_WHERE_DEP_HELP,
+    )
     p_blast.add_argument(
         "--failure",
-        required=True,
         choices=["down", "degraded", "latency_up"],
-        help="Failure type",
+        help="Failure type (required with --service and --where; scenario default with "
+        "--scenarios)",
+    )
+    p_blast.add_argument("--format", choices=["text", *FORMATS], default="text", help=_FORMAT_HELP)
+    p_blast.add_argument(
+        "--explain",
+        action="store_true",
+        help="Show the chain of dependencies (with dep_type/call_type) that impacts each "
+        "service; machine formats add the impacting edge to every row",
+    )
+    p_blast.add_argument(
+        "--timed",
+        action="store_true",
+        help="Report the earliest time each service is hit, summing per-dependency delays "
+        "from metadata (timeout_ms for down, latency_ms otherwise; missing delays are 0)",
+    )
+    p_blast.add_argument(
+        "--deadline",
+        type=float,
+        default=None,
+        help="With --timed, only report services hit within this many milliseconds",
+    )
+    p_blast.add_argument(
+        "--delay-key",
+        default=None,
+        help="With --timed, the dependency metadata key holding delays in milliseconds",
     )
 
     p_crit = sub.add_parser(
-    "criticality",
-    help="Rank services by blast radius size (most critical first).",
+        "criticality",
+        help="Rank services by blast radius size (most critical first).",
+        parents=[common],
     )
-    p_crit.add_argument("path", help="Path to manifest file")
+    p_crit.add_argument("path", help=_PATH_HELP)
     p_crit.add_argument(
         "--failure",
         choices=["down", "degraded", "latency_up"],
@@ -42,73 +169,355 @@ def main() -> int:
         "--top",
         type=int,
         default=10,
-        help="Show top N most critical services",
+        help="Show top N most critical services (default: 10; 0 for all)",
+    )
+    p_crit.add_argument(
+        "--format",
+        choices=["text", *FORMATS],
+        default="text",
+        help=f"{_FORMAT_HELP}; the ranking is computed in full before the first row",
+    )
+    p_crit.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes for the computation (default: 1)",
+    )
+    p_crit.add_argument(
+        "--approximate",
+        action="store_true",
+        help="Estimate scores with cardinality sketches (bounded memory, within a few "
+        "percent; see --precision)",
+    )
+    p_crit.add_argument(
+        "--precision",
+        type=int,
+        default=12,
+        help="Sketch precision p for --approximate, 4-16: 2**p bytes per sketch, "
+        "standard error 1.04/sqrt(2**p) (default: 12, about 1.6%%)",
+    )
+    p_crit.add_argument(
+        "--delta",
+        default=None,
+        help="Manifest delta (.yaml/.json) to apply before ranking; only services "
+        "whose blast radius can change are recomputed",
+    )
+    p_crit.add_argument(
+        "--baseline",
+        default=None,
+        help="Scores JSON for the manifest before --delta (from --save-scores)",
+    )
+    p_crit.add_argument(
+        "--save-scores",
+        default=None,
+        help="Write the resulting scores as JSON, for use as a later --baseline",
+    )
+    p_crit.add_argument(
+        "--where",
+        action="append",
+        default=None,
+        metavar="KEY=VALUE",
+        help="Only rank services whose metadata has KEY=VALUE (repeatable; values of one "
+        "key are alternatives, keys must all match)",
+    )
+    p_crit.add_argument(
+        "--where-dependency",
+        action="append",
+        default=None,
+        metavar="KEY=VALUE",
+        help=_WHERE_DEP_HELP,
+    )
+
+    p_spof = sub.add_parser(
+        "spof",
+        help="List, per entry point, the dependencies every hard sync path passes through.",
+        parents=[common],
+    )
+    p_spof.add_argument("path", help=_PATH_HELP)
+    p_spof.add_argument(
+        "--entry",
+        action="append",
+        default=None,
+        help="Entry-point service to report (repeatable; default: every service "
+        "that nothing depends on)",
+    )
+    p_spof.add_argument("--format", choices=["text", *FORMATS], default="text", help=_FORMAT_HELP)
+
+    p_nk = sub.add_parser(
+        "nk-sweep",
+        help="Find the sets of k services whose joint failure impacts the most services.",
+        parents=[common],
+    )
+    p_nk.add_argument("path", help=_PATH_HELP)
+    p_nk.add_argument(
+        "--k",
+        type=int,
+        default=2,
+        help="Number of services failing together (default: 2)",
+    )
+    p_nk.add_argument(
+        "--failure",
+        choices=["down", "degraded", "latency_up"],
+        default="down",
+        help="Failure type to evaluate (default: down)",
+    )
+    p_nk.add_argument(
+        "--top",
+        type=int,
+        default=10,
+        help="Show the N worst combinations (default: 10)",
     )
+    p_nk.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes for the sweep (default: 1)",
+    )
+    p_nk.add_argument("--format", choices=["text", *FORMATS], default="text", help=_FORMAT_HELP)
 
-    args = parser.parse_args()
+    p_convert = sub.add_parser(
+        "convert",
+        help="Convert a manifest to a binary edge list (.cedges) or back.",
+        parents=[common],
+    )
+    p_convert.add_argument("source", help="Manifest (.yaml/.yml/.json) or edge list (.cedges)")
+    p_convert.add_argument(
+        "dest",
+        help="Output file; .cedges for an edge list (names and metadata are dropped), "
+        "otherwise .yaml/.yml/.json",
+    )
 
-    manifest = load_manifest(args.path)
-    services, deps = manifest_to_domain(manifest)
+    p_serve = sub.add_parser(
+        "serve",
+        help="Serve analysis queries over HTTP, hot-reloading the manifest on change.",
+        parents=[common],
+    )
+    p_serve.add_argument("path", help=_PATH_HELP)
+    p_serve.add_argument("--host", default="127.0.0.1", help="Bind address (default: 127.0.0.1)")
+    p_serve.add_argument("--port", type=int, default=8765, help="TCP port (default: 8765)")
+    p_serve.add_argument(
+        "--unix-socket",
+        default=None,
+        help="Listen on this Unix socket path instead of TCP",
+    )
+    p_serve.add_argument(
+        "--poll-interval",
+        type=float,
+        default=1.0,
+        help="Seconds between manifest change checks (default: 1.0)",
+    )
+
+    args = parser.parse_args(argv)
+
+    if args.cmd == "validate" and args.max_errors is not None and args.max_errors < 1:
+        p_validate.error("--max-errors must be at least 1")
+    if args.cmd == "blast-radius" and args.scenarios is None and args.failure is None:
+        p_blast.error("--failure is required with --service and --where")
+    if args.cmd == "blast-radius" and not args.timed:
+        if args.deadline is not None or args.delay_key is not None:
+            p_blast.error("--deadline and --delay-key require --timed")
+    if args.cmd == "blast-radius" and args.timed:
+        if args.explain:
+            p_blast.error("--timed cannot be combined with --explain")
+        if args.deadline is not None and not args.deadline >= 0:
+            p_blast.error("--deadline must not be negative")
+    if args.cmd == "criticality" and args.top < 0:
+        p_crit.error("--top must not be negative")
+    if args.cmd == "nk-sweep" and args.k < 1:
+        p_nk.error("--k must be at least 1")
+    if args.cmd == "nk-sweep" and args.top < 1:
+        p_nk.error("--top must be at least 1")
+    if args.cmd == "criticality" and args.approximate:
+        if args.delta is not None or args.workers > 1:
+            p_crit.error("--approximate cannot be combined with --delta or --workers")
+        if not 4 <= args.precision <= 16:
+            p_crit.error("--precision must be between 4 and 16")
+
+    if args.cmd == "criticality" and args.delta is not None:
+        if args.where or args.where_dependency:
+            p_crit.error("--where and --where-dependency cannot be combined with --delta")
+    if args.cmd in ("stats", "blast-radius", "criticality"):
+        from constellation_engine.core.index import parse_filters
+
+        try:
+            args.where = parse_filters(args.where) if args.where else None
+            args.where_dependency = (
+                parse_filters(args.where_dependency) if args.where_dependency else None
+            )
+        except ValueError as exc:
+            sub.choices[args.cmd].error(str(exc))
 
+    if not (args.profile or args.metrics_out or args.profile_out):
+        return _run(args)
+    return _run_instrumented(args)
+
+
+def _run_instrumented(args: argparse.Namespace) -> int:
+    import cProfile
+
+    from constellation_engine.core.metrics import recording
+
+    profiler = cProfile.Profile() if args.profile_out else None
+    with recording(trace_memory=args.profile or args.metrics_out is not None) as rec:
+        if profiler is not None:
+            profiler.enable()
+        try:
+            code = _run(args)
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                profiler.dump_stats(args.profile_out)
+
+    if args.metrics_out:
+        Path(args.metrics_out).write_text(json.dumps(rec.to_dict(), indent=2), encoding="utf-8")
+    if args.profile:
+        print(
+            f"{'stage':<16} {'seconds':>9} {'peak MiB':>9} {'nodes':>9} {'edges':>9} "
+            f"{'visited':>10}",
+            file=sys.stderr,
+        )
+        for st in rec.stages:
+            peak = "-" if st.peak_bytes is None else f"{st.peak_bytes / 2**20:.1f}"
+            print(
+                f"{st.name:<16} {st.seconds:>9.4f} {peak:>9} {_dash(st.nodes):>9} "
+                f"{_dash(st.edges):>9} {st.edges_visited:>10}",
+                file=sys.stderr,
+            )
+    return code
+
+
+def _dash(value: int | None) -> str:
+    return "-" if value is None else str(value)
+
+
+def _run(args: argparse.Namespace) -> int:
     if args.cmd == "validate":
-        result = validate_model(services, deps)
+        # A cache entry only exists for manifests that already passed validation.
+        cache = _cache(args)
+        if cache is not None and cache.get(manifest_digest(args.path)) is not None:
+            print("OK: manifest is valid")
+            return 0
+        if is_federated(args.path):
+            from constellation_engine.io.federated import FederatedLoader
+
+            result = FederatedLoader(args.path, cache=cache).validate(
+                max_errors=args.max_errors,
+                fail_fast=args.fail_fast,
+            )
+        else:
+            with stage("load"):
+                services, deps = load_domain(args.path)
+                note(nodes=len(services), edges=len(deps))
+            with stage("validate"):
+                result = validate_model(
+                    services,
+                    deps,
+                    max_errors=args.max_errors,
+                    fail_fast=args.fail_fast,
+                )
         if result.ok:
             print("OK: manifest is valid")
             return 0
         print("INVALID:")
         for e in result.errors:
             print(f"- {e}")
+        if result.truncated:
+            print("- ... further errors not shown")
         return 2
 
+    if args.cmd == "convert":
+        from constellation_engine.io.loaders import convert_manifest
+
+        with stage("convert"):
+            model = convert_manifest(args.source, args.dest)
+        print(
+            f"wrote {model.num_services} services and {model.num_dependencies} "
+            f"dependencies to {args.dest}"
+        )
+        return 0
+
+    if args.cmd == "serve":
+        from constellation_engine.cli.serve import serve
+
+        serve(
+            args.path,
+            host=args.host,
+            port=args.port,
+            unix_socket=args.unix_socket,
+            poll_interval=args.poll_interval,
+            cache=_cache(args),
+        )
+        return 0
+
+    if args.cmd == "criticality" and args.delta is not None:
+        from constellation_engine.cli.commands import criticality_delta
+
+        return criticality_delta(args)
+
+    compiled = load_compiled(args.path, _cache(args))
+
+    selected: list[ServiceId] | None = None
+    if args.cmd in ("stats", "blast-radius", "criticality"):
+        if args.where or args.where_dependency:
+            compiled, selected = _scope(args, compiled)
+        if selected is not None and not selected:
+            print(f"no services match {_describe(args.where)}")
+            return 2
+        args.starts = selected
+
     if args.cmd == "stats":
-        g = build_graph(services, deps)
-        print(f"nodes: {g.number_of_nodes()}")
-        print(f"edges: {g.number_of_edges()}")
+        if selected is not None:
+            from constellation_engine.sim.compiled import subgraph
+
+            index = compiled.index
+            compiled = subgraph(compiled, nodes=[index[sid] for sid in selected])
+        with stage("stats"):
+            degrees = out_degrees(compiled)
+            count_edges(compiled.num_edges)
+        print(f"nodes: {compiled.num_nodes}")
+        print(f"edges: {compiled.num_edges}")
         # simple, deterministic summary
-        top = sorted(g.out_degree(), key=lambda x: x[1], reverse=True)[:5]
+        top = sorted(zip(compiled.ids, degrees), key=lambda x: x[1], reverse=True)[:5]
         print("top dependers (out-degree):")
         for node, deg in top:
             print(f"- {node}: {deg}")
         return 0
-    
-    if args.cmd == "blast-radius":
-        from constellation_engine.core.types import ServiceId
-        from constellation_engine.sim.models import FailureType
-        from constellation_engine.sim.propagate import propagate_failure
-
-        g = build_graph(services, deps)
-
-        impacted = propagate_failure(
-            g,
-            start=ServiceId(args.service),
-            failure=FailureType(args.failure),
-        )
 
-        print(f"blast radius from {args.service} ({args.failure}) [impacts dependers]:")
-        for svc, f in impacted.items():
-            print(f"- {svc}: {f.value}")
-        return 0
-    
-    if args.cmd == "criticality":
-        from constellation_engine.sim.criticality import compute_criticality
-        from constellation_engine.sim.models import FailureType
+    from constellation_engine.cli.commands import run_analysis
 
-        g = build_graph(services, deps)
+    return run_analysis(args, compiled, selected)
 
-        scores = compute_criticality(
-            g,
-            failure=FailureType(args.failure),
-        )
 
-        ranked = sorted(scores.items(), key=lambda x: x[1], reverse=True)
+def _scope(
+    args: argparse.Namespace, compiled: CompiledGraph
+) -> tuple[CompiledGraph, list[ServiceId] | None]:
+    """Apply --where-dependency to ``compiled`` and resolve --where to services."""
+    from constellation_engine.core.index import build_index
+    from constellation_engine.io.cache import load_metadata
+    from constellation_engine.sim.compiled import edge_selection, subgraph
 
-        print(f"criticality ranking (failure={args.failure}):")
-        for svc, score in ranked[: args.top]:
-            print(f"- {svc}: impacts {score} services")
+    with stage("metadata"):
+        index = build_index(load_metadata(args.path, _cache(args)))
+    with stage("select"):
+        if args.where_dependency:
+            pairs = index.select_dependencies(args.where_dependency)
+            compiled = subgraph(compiled, edges=edge_selection(compiled, pairs))
+        selected = None
+        if args.where:
+            at = compiled.index
+            selected = sorted(index.select_services(args.where) & at.keys(), key=at.__getitem__)
+        note(nodes=compiled.num_nodes, edges=compiled.num_edges)
+    return compiled, selected
+
+
+def _describe(filters: dict[str, list[str]]) -> str:
+    return ", ".join(f"{key}={'|'.join(values)}" for key, values in filters.items())
 
-        return 0
 
-    return 1
+def _cache(args: argparse.Namespace) -> GraphCache | None:
+    if args.no_cache:
+        return None
+    return GraphCache(args.cache_dir or default_cache_dir())
 
 
 if __name__ == "__main__":
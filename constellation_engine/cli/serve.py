@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import json
+import os
+import socketserver
+import threading
+from dataclasses import asdict, dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, cast
+from urllib.parse import parse_qs, urlsplit
+
+from constellation_engine.core.types import ServiceId
+from constellation_engine.io.cache import GraphCache, load_compiled
+from constellation_engine.io.federated import FederatedLoader, sources_digest
+from constellation_engine.io.sources import is_federated
+from constellation_engine.sim.compiled import CompiledGraph, compile_model, out_degrees
+from constellation_engine.sim.criticality import compute_criticality, top_critical
+from constellation_engine.sim.memo import BlastRadiusCache
+from constellation_engine.sim.models import FailureType
+
+
+@dataclass(slots=True)
+class _Snapshot:
+    """An immutable-once-published view of one successfully loaded manifest."""
+
+    compiled: CompiledGraph
+    fingerprint: object  # (mtime_ns, size) of the manifest file(s) when loaded
+    criticality: dict[FailureType, dict[ServiceId, int]] = field(default_factory=dict)
+
+
+class AnalysisService:
+    """
+    Keeps a compiled manifest in memory and answers analysis queries against it.
+
+    Queries read ``self._snapshot`` once and work on that object only, so a reload
+    that swaps in a new snapshot is atomic from every in-flight request's point of
+    view. A manifest edit that fails to load leaves the previous snapshot serving and
+    is reported through ``validate``.
+    """
+
+    def __init__(self, path: str | Path, *, cache: GraphCache | None = None) -> None:
+        self.path = Path(path)
+        self._cache = cache
+        # A directory or glob is re-merged on change, re-reading only the edited files.
+        self._federated = (
+            FederatedLoader(path, cache=cache) if is_federated(path) else None
+        )
+        self._reload_lock = threading.Lock()
+        self._errors: list[str] = []
+        self._blast_cache = BlastRadiusCache()
+        self._snapshot = self._load(self._fingerprint())
+
+    def reload_if_changed(self) -> bool:
+        """Reload the manifest if its mtime or size changed; True if a new graph is live."""
+        with self._reload_lock:
+            fingerprint = self._fingerprint()
+            if fingerprint == self._snapshot.fingerprint:
+                return False
+            try:
+                snapshot = self._load(fingerprint)
+            except Exception as exc:
+                # Any bad save (including a YAML syntax error) keeps the old snapshot
+                # serving and is reported by /validate until the next good save.
+                self._errors = str(exc).splitlines() or [type(exc).__name__]
+                return False
+            self._errors = []
+            stale, self._snapshot = self._snapshot, snapshot
+            self._blast_cache.invalidate(stale.fingerprint)
+            return True
+
+    def handle(self, endpoint: str, params: dict[str, str]) -> tuple[int, dict[str, Any]]:
+        """Answer one query; returns ``(http_status, json_payload)``."""
+        handler = self._endpoints().get(endpoint)
+        if handler is None:
+            return 404, {"error": f"unknown endpoint {endpoint!r}"}
+        try:
+            return 200, handler(self._snapshot, params)
+        except (KeyError, ValueError) as exc:
+            return 400, {"error": str(exc).strip("'\"")}
+
+    def _endpoints(
+        self,
+    ) -> dict[str, Callable[[_Snapshot, dict[str, str]], dict[str, Any]]]:
+        return {
+            "/validate": self._validate,
+            "/stats": self._stats,
+            "/blast-radius": self._blast_radius,
+            "/criticality": self._criticality,
+            "/cache-stats": self._cache_stats,
+        }
+
+    def _validate(self, snap: _Snapshot, params: dict[str, str]) -> dict[str, Any]:
+        errors = list(self._errors)
+        return {"ok": not errors, "errors": errors}
+
+    def _stats(self, snap: _Snapshot, params: dict[str, str]) -> dict[str, Any]:
+        compiled = snap.compiled
+        degrees = zip(compiled.ids, out_degrees(compiled))
+        top = sorted(degrees, key=lambda x: x[1], reverse=True)[:5]
+        return {
+            "nodes": compiled.num_nodes,
+            "edges": compiled.num_edges,
+            "top_dependers": [{"service": s, "out_degree": d} for s, d in top],
+        }
+
+    def _blast_radius(self, snap: _Snapshot, params: dict[str, str]) -> dict[str, Any]:
+        if "service" not in params:
+            raise KeyError("missing query parameter 'service'")
+        failure = FailureType(params.get("failure", "down"))
+        impacted = self._blast_cache.blast_radius(
+            snap.compiled,
+            ServiceId(params["service"]),
+            failure,
+            fingerprint=snap.fingerprint,
+        )
+        return {
+            "service": params["service"],
+            "failure": failure.value,
+            "impacted": [{"service": s, "failure": f.value} for s, f in impacted.items()],
+        }
+
+    def _criticality(self, snap: _Snapshot, params: dict[str, str]) -> dict[str, Any]:
+        failure = FailureType(params.get("failure", "down"))
+        top = int(params.get("top", "10"))
+        scores = snap.criticality.get(failure)
+        if scores is None:
+            # Concurrent first requests may both compute; the results are identical.
+            scores = compute_criticality(snap.compiled, failure=failure)
+            snap.criticality[failure] = scores
+        return {
+            "failure": failure.value,
+            "ranking": [
+                {"service": s, "impacts": n} for s, n in top_critical(scores.items(), top)
+            ],
+        }
+
+    def _cache_stats(self, snap: _Snapshot, params: dict[str, str]) -> dict[str, Any]:
+        stats = self._blast_cache.stats()
+        return {**asdict(stats), "hit_rate": stats.hit_rate}
+
+    def _fingerprint(self) -> object:
+        if self._federated is not None:
+            return sources_digest(self.path)
+        st = os.stat(self.path)
+        return st.st_mtime_ns, st.st_size
+
+    def _load(self, fingerprint: object) -> _Snapshot:
+        if self._federated is not None:
+            compiled = compile_model(self._federated.load())
+        else:
+            compiled = load_compiled(self.path, self._cache)
+        return _Snapshot(compiled=compiled, fingerprint=fingerprint)
+
+
+def make_server(
+    service: AnalysisService,
+    *,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    unix_socket: str | None = None,
+) -> socketserver.BaseServer:
+    """Build a threaded HTTP server (TCP, or a Unix socket) that answers ``service``."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            url = urlsplit(self.path)
+            params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            status, payload = service.handle(url.path, params)
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def address_string(self) -> str:
+            # Unix socket peers have no (host, port) address.
+            return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass  # keep the daemon quiet; callers get status codes in responses
+
+    if unix_socket is not None:
+        Path(unix_socket).unlink(missing_ok=True)
+        return _ThreadingUnixHTTPServer(unix_socket, Handler)
+    return ThreadingHTTPServer((host, port), Handler)
+
+
+def serve(
+    path: str | Path,
+    *,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    unix_socket: str | None = None,
+    poll_interval: float = 1.0,
+    cache: GraphCache | None = None,
+) -> None:
+    """Serve analysis queries for ``path`` until interrupted, hot-reloading on change."""
+    service = AnalysisService(path, cache=cache)
+    server = make_server(service, host=host, port=port, unix_socket=unix_socket)
+    stop = threading.Event()
+
+    watcher = threading.Thread(
+        target=watch,
+        args=(service, stop, poll_interval),
+        name="manifest-watcher",
+        daemon=True,
+    )
+    watcher.start()
+    if unix_socket is not None:
+        where = unix_socket
+    else:
+        where = f"http://{host}:{cast(ThreadingHTTPServer, server).server_port}"
+    print(f"serving {path} on {where}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        server.server_close()
+        if unix_socket is not None:
+            Path(unix_socket).unlink(missing_ok=True)
+
+
+def watch(service: AnalysisService, stop: threading.Event, poll_interval: float) -> None:
+    """Call ``service.reload_if_changed`` every ``poll_interval`` seconds until ``stop``."""
+    while not stop.wait(poll_interval):
+        try:
+            service.reload_if_changed()
+        except Exception:
+            # e.g. the manifest briefly missing during an editor's atomic save; the
+            # watcher must outlive any failure or hot reload stops for good.
+            pass
+
+
+class _ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
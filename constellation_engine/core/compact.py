@@ -0,0 +1,231 @@
+# Import statements
+from __future__ import annotations  # For future compatibility with type hinting
+
+from array import array  # For packed integer columns
+from dataclasses import dataclass, field  # For defining data classes
+from types import MappingProxyType  # For the shared empty mapping
+from typing import Any, Iterator, Mapping  # For type hinting
+
+from .types import CallType, Dependency, DependencyType, Service, ServiceId  # Domain types
+from .validate import ValidatedModel, _error_for, validate_references  # Validation
+
+# Small integer codes for edge attributes; the position in the tuple is the code.
+DEP_TYPES: tuple[DependencyType, ...] = tuple(DependencyType)
+CALL_TYPES: tuple[CallType, ...] = tuple(CallType)
+
+# Both enums subclass str, so these also map the raw manifest strings to codes.
+_DEP_CODE: dict[str, int] = {t: i for i, t in enumerate(DEP_TYPES)}
+_CALL_CODE: dict[str, int] = {t: i for i, t in enumerate(CALL_TYPES)}
+
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
+
+@dataclass(slots=True)
+class MetadataStore:
+    """Service names and metadata kept apart from the graph structure.
+
+    Only entries that actually carry a name or metadata are stored. A dependency listed
+    more than once keeps the metadata of its last listing, as build_graph does."""
+    names: dict[ServiceId, str] = field(default_factory=dict) # Display names by service
+    services: dict[ServiceId, Mapping[str, Any]] = field(default_factory=dict) # By service
+    dependencies: dict[tuple[ServiceId, ServiceId], Mapping[str, Any]] = field(
+        default_factory=dict
+    ) # By (src, dst)
+
+    def add_service(
+        self, sid: ServiceId, name: str | None, metadata: Mapping[str, Any] | None
+    ) -> None:
+        if name is not None:
+            self.names[sid] = name
+        if metadata:
+            self.services[sid] = metadata
+
+    def add_dependency(
+        self, src: ServiceId, dst: ServiceId, metadata: Mapping[str, Any] | None
+    ) -> None:
+        if metadata:
+            self.dependencies[src, dst] = metadata
+        else:
+            self.dependencies.pop((src, dst), None)
+
+    def service(self, sid: ServiceId) -> Mapping[str, Any]:
+        """Metadata of a service; empty if it has none."""
+        return self.services.get(sid, _EMPTY)
+
+    def dependency(self, src: ServiceId, dst: ServiceId) -> Mapping[str, Any]:
+        """Metadata of the dependency src -> dst; empty if it has none."""
+        return self.dependencies.get((src, dst), _EMPTY)
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-ready form, read back by from_dict."""
+        return {
+            "names": self.names,
+            "services": self.services,
+            "dependencies": [[s, d, m] for (s, d), m in self.dependencies.items()],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> MetadataStore:
+        return cls(
+            names=dict(data["names"]),
+            services=dict(data["services"]),
+            dependencies={(s, d): m for s, d, m in data["dependencies"]},
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class CompactModel:
+    """A validated model as interned service IDs and packed integer columns.
+
+    Dependency k is ids[src[k]] -> ids[dst[k]], typed DEP_TYPES[dep_codes[k]] and
+    CALL_TYPES[call_codes[k]]. Services are indexed in manifest order. Build it with
+    compact_model or io.stream.load_compact, which validate first."""
+    ids: tuple[ServiceId, ...] # Interning table: service index -> ServiceId
+    src: array[int] # Depender index of each dependency
+    dst: array[int] # Dependency index of each dependency
+    dep_codes: array[int] # DependencyType code of each dependency
+    call_codes: array[int] # CallType code of each dependency
+    metadata: MetadataStore | None = None # Names and metadata, if they were loaded
+
+    @property
+    def num_services(self) -> int:
+        return len(self.ids)
+
+    @property
+    def num_dependencies(self) -> int:
+        return len(self.src)
+
+    def services(self) -> Iterator[Service]:
+        """Materialize Service objects on demand, with names and metadata if loaded."""
+        meta = self.metadata
+        for sid in self.ids:
+            if meta is None:
+                yield Service(id=sid)
+            else:
+                yield Service(id=sid, name=meta.names.get(sid), metadata=meta.services.get(sid))
+
+    def dependencies(self) -> Iterator[Dependency]:
+        """Materialize Dependency objects on demand, with metadata if it was loaded.
+
+        Metadata is stored per (src, dst), so every listing of a repeated edge gets
+        the metadata of its last listing."""
+        ids, meta = self.ids, self.metadata
+        for s, d, dep, call in zip(self.src, self.dst, self.dep_codes, self.call_codes):
+            src, dst = ids[s], ids[d]
+            yield Dependency(
+                src=src,
+                dst=dst,
+                dep_type=DEP_TYPES[dep],
+                call_type=CALL_TYPES[call],
+                metadata=meta.dependencies.get((src, dst)) if meta is not None else None,
+            )
+
+
+class CompactBuilder:
+    """Accumulates records into packed columns, interning IDs as they are seen.
+
+    Dependencies may reference services declared later in the manifest; build()
+    validates the whole model and renumbers services into declaration order."""
+
+    def __init__(self, *, metadata: bool = False) -> None:
+        self._index: dict[str, int] = {} # Every ID seen, declared or referenced
+        self._ids: list[ServiceId] = [] # Inverse of _index
+        self._declared = array("i") # Interned index of each declared service, in order
+        self._src = array("i")
+        self._dst = array("i")
+        self._dep = array("B")
+        self._call = array("B")
+        self._metadata = MetadataStore() if metadata else None
+
+    def add_service(
+        self, sid: str, name: str | None = None, metadata: Mapping[str, Any] | None = None
+    ) -> None:
+        self._declared.append(self._intern(sid))
+        if self._metadata is not None:
+            self._metadata.add_service(ServiceId(sid), name, metadata)
+
+    def add_dependency(
+        self,
+        src: str,
+        dst: str,
+        dep_type: str = DependencyType.HARD,
+        call_type: str = CallType.SYNC,
+        metadata: Mapping[str, Any] | None = None,
+    ) -> None:
+        dep_code = _DEP_CODE.get(dep_type)
+        call_code = _CALL_CODE.get(call_type)
+        # Let the enums raise their usual errors for unknown values.
+        if dep_code is None:
+            dep_code = _DEP_CODE[DependencyType(dep_type)]
+        if call_code is None:
+            call_code = _CALL_CODE[CallType(call_type)]
+        self._src.append(self._intern(src))
+        self._dst.append(self._intern(dst))
+        self._dep.append(dep_code)
+        self._call.append(call_code)
+        if self._metadata is not None:
+            self._metadata.add_dependency(ServiceId(src), ServiceId(dst), metadata)
+
+    @property
+    def num_services(self) -> int:
+        return len(self._declared)
+
+    @property
+    def num_dependencies(self) -> int:
+        return len(self._src)
+
+    def build(self, *, max_errors: int | None = None, fail_fast: bool = False) -> CompactModel:
+        """Validate the accumulated model and return it in compact form.
+
+        Raises:
+            ValidationError: With the same messages validate_or_raise would produce."""
+        ids = self._ids
+        result = validate_references(
+            (ids[i] for i in self._declared),
+            ((ids[s], ids[d]) for s, d in zip(self._src, self._dst)),
+            max_errors=max_errors,
+            fail_fast=fail_fast,
+        )
+        if not result.ok:
+            raise _error_for(result)
+        return self.finish()
+
+    def _intern(self, sid: str) -> int:
+        i = self._index.get(sid)
+        if i is None:
+            i = self._index[sid] = len(self._ids)
+            self._ids.append(ServiceId(sid))
+        return i
+
+    def finish(self) -> CompactModel:
+        """The accumulated model, without validating it; the caller must have done so."""
+        src, dst = self._src, self._dst
+        # Renumber only if some ID was first seen as a dependency endpoint.
+        if self._declared != array("i", range(len(self._declared))):
+            remap = array("i", bytes(4 * len(self._ids)))
+            for new, old in enumerate(self._declared):
+                remap[old] = new
+            src = array("i", [remap[i] for i in src])
+            dst = array("i", [remap[i] for i in dst])
+        return CompactModel(
+            ids=tuple(self._ids[i] for i in self._declared),
+            src=src,
+            dst=dst,
+            dep_codes=self._dep,
+            call_codes=self._call,
+            metadata=self._metadata,
+        )
+
+
+def compact_model(model: ValidatedModel, *, metadata: bool = True) -> CompactModel:
+    """Convert a validated model to compact form without validating it again.
+
+    Args:
+        model: The model from validate_or_raise.
+        metadata: If False, names and metadata are dropped."""
+    builder = CompactBuilder(metadata=metadata)
+    for svc in model.services:
+        builder.add_service(svc.id, svc.name, svc.metadata)
+    for dep in model.dependencies:
+        builder.add_dependency(dep.src, dep.dst, dep.dep_type, dep.call_type, dep.metadata)
+    return builder.finish()
@@ -1,27 +1,105 @@
 from __future__ import annotations  # For future compatibility with type hinting
 
-import networkx as nx  # Importing NetworkX for graph operations
+from typing import TYPE_CHECKING  # For type-only imports
 
-from .types import Dependency, Service  # Importing types from the same package
-from .validate import validate_or_raise  # Importing validation function
+from .metrics import note, stage  # Importing stage instrumentation
+from .types import Dependency, ManifestDelta, Service  # Importing types from the same package
+from .validate import (  # Importing validation helpers
+    ValidatedModel,
+    ValidationError,
+    validate_or_raise,
+)
 
+if TYPE_CHECKING:
+    import networkx as nx  # Imported lazily in build_graph; it dominates CLI startup
 
-def build_graph(services: list[Service], dependencies: list[Dependency]) -> nx.DiGraph:
+
+def build_graph(
+    services: list[Service] | ValidatedModel,
+    dependencies: list[Dependency] | None = None,
+) -> nx.DiGraph:
     """Builds a directed graph from the given services and dependencies.
 
     Args:
-        services: A list of Service objects representing the nodes.
-        dependencies: A list of Dependency objects representing the edges."""
-    validate_or_raise(services, dependencies)  # Validate the model before building the graph
-    
-    g: nx.DiGraph = nx.DiGraph()  # Initialize a directed graph
-
-    # Add services as nodes
-    for svc in services:
-        g.add_node(svc.id, name=svc.name, metadata=svc.metadata)
+        services: A list of Service objects representing the nodes, or a ValidatedModel
+            from validate_or_raise, in which case validation is not repeated.
+        dependencies: A list of Dependency objects representing the edges. Omitted
+            when services is a ValidatedModel."""
+    if isinstance(services, ValidatedModel):
+        model = services  # Already validated; reuse it as is
+    else:
+        with stage("validate"):
+            # Validate the model before building the graph
+            model = validate_or_raise(services, dependencies or ())
+
+    import networkx as nx  # Deferred so commands that never build a graph don't pay for it
+
+    with stage("build_graph"):
+        g: nx.DiGraph = nx.DiGraph()  # Initialize a directed graph
+
+        # Add services as nodes
+        for svc in model.services:
+            g.add_node(svc.id, name=svc.name, metadata=svc.metadata)
+
+        # Add dependencies as edges
+        for dep in model.dependencies:
+            g.add_edge(
+                dep.src,
+                dep.dst,
+                dep_type=dep.dep_type,
+                call_type=dep.call_type,
+                metadata=dep.metadata,
+            )
+        note(nodes=g.number_of_nodes(), edges=g.number_of_edges())
+
+    return g  # Return the constructed graph
+
+
+def apply_delta(g: nx.DiGraph, delta: ManifestDelta) -> None:
+    """Applies a ManifestDelta to a graph from build_graph, in place.
 
-    # Add dependencies as edges
-    for dep in dependencies:
+    Removals are applied before additions, so a delta can replace a service. An added
+    dependency that already exists updates the edge's dep_type/call_type/metadata.
+
+    Args:
+        g: The graph to update.
+        delta: The changes to apply.
+    Raises:
+        ValidationError: If the delta references missing services or edges, adds an
+            existing service, or would introduce a self-dependency. The graph is left
+            unchanged in that case."""
+    errors: list[str] = []
+    removed = set(delta.remove_services)
+    added = {svc.id for svc in delta.add_services}
+
+    for src, dst in delta.remove_dependencies:
+        if not g.has_edge(src, dst):
+            errors.append(f"Dependency {src} -> {dst} does not exist.")
+    for sid in delta.remove_services:
+        if sid not in g:
+            errors.append(f"Service {sid} does not exist.")
+    for svc in delta.add_services:
+        if svc.id in g and svc.id not in removed:
+            errors.append(f"Service {svc.id} already exists.")
+
+    def exists(sid: object) -> bool:
+        return sid in added or (sid in g and sid not in removed)
+
+    for dep in delta.add_dependencies:
+        if not exists(dep.src):
+            errors.append(f"Dependency source {dep.src} does not exist among services.")
+        if not exists(dep.dst):
+            errors.append(f"Dependency destination {dep.dst} does not exist among services.")
+        if dep.src == dep.dst:
+            errors.append(f"Service {dep.src} has a self-dependency, which is not allowed.")
+    if errors:
+        raise ValidationError("Delta rejected with the following errors:\n" + "\n".join(errors))
+
+    g.remove_edges_from(delta.remove_dependencies)
+    g.remove_nodes_from(delta.remove_services)  # Also drops their incident edges
+    for svc in delta.add_services:
+        g.add_node(svc.id, name=svc.name, metadata=svc.metadata)
+    for dep in delta.add_dependencies:
         g.add_edge(
             dep.src,
             dep.dst,
@@ -29,5 +107,3 @@ def build_graph(services: list[Service], dependencies: list[Dependency]) -> nx.D
             call_type=dep.call_type,
             metadata=dep.metadata,
         )
-
-    return g  # Return the constructed graph
\ No newline at end of file
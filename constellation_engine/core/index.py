@@ -0,0 +1,143 @@
+# Import statements
+from __future__ import annotations  # For future compatibility with type hinting
+
+from dataclasses import dataclass, field  # For defining data classes
+from typing import TYPE_CHECKING, Any, Hashable, Iterable, Iterator, Mapping  # For type hinting
+
+from .compact import CompactModel, MetadataStore  # Metadata kept apart from the graph
+from .types import ServiceId  # Service identifiers
+from .validate import ValidatedModel  # Validated models carry metadata inline
+
+if TYPE_CHECKING:
+    import networkx as nx  # Only for annotations; graphs come from build_graph
+
+# A metadata filter: each key maps to the values it may take.
+Filters = Mapping[str, Iterable[str]]
+
+
+@dataclass(slots=True)
+class MetadataIndex:
+    """Inverted index from metadata key and value to the services and dependencies
+    that carry it.
+
+    Values are indexed by their text form (see metadata_tokens), so a filter given on
+    the command line as tier=1 matches both {"tier": 1} and {"tier": "1"}. Services and
+    dependencies without metadata are never indexed and so never match a filter."""
+    services: dict[str, dict[str, set[ServiceId]]] = field(default_factory=dict) # By key, value
+    dependencies: dict[str, dict[str, set[tuple[ServiceId, ServiceId]]]] = field(
+        default_factory=dict
+    ) # (src, dst) pairs by key, value
+
+    @classmethod
+    def from_store(cls, store: MetadataStore) -> MetadataIndex:
+        """Index the metadata of a MetadataStore (as from load_metadata)."""
+        index = cls()
+        for sid, values in store.services.items():
+            _add(index.services, sid, values)
+        for pair, values in store.dependencies.items():
+            _add(index.dependencies, pair, values)
+        return index
+
+    @classmethod
+    def from_graph(cls, graph: nx.DiGraph) -> MetadataIndex:
+        """Index the node and edge metadata of a graph from build_graph."""
+        index = cls()
+        for sid, values in graph.nodes(data="metadata"):
+            if values:
+                _add(index.services, sid, values)
+        for src, dst, values in graph.edges(data="metadata"):
+            if values:
+                _add(index.dependencies, (src, dst), values)
+        return index
+
+    def select_services(self, filters: Filters) -> set[ServiceId]:
+        """Services matching every key of filters, each with any of its values."""
+        return _select(self.services, filters)
+
+    def select_dependencies(self, filters: Filters) -> set[tuple[ServiceId, ServiceId]]:
+        """(src, dst) pairs matching every key of filters, each with any of its values."""
+        return _select(self.dependencies, filters)
+
+
+def build_index(
+    source: nx.DiGraph | MetadataStore | ValidatedModel | CompactModel,
+) -> MetadataIndex:
+    """Builds a MetadataIndex alongside build_graph.
+
+    Args:
+        source: A graph from build_graph, the ValidatedModel it was built from, a
+            CompactModel loaded with metadata, or a MetadataStore.
+    Returns:
+        The index of every service and dependency metadata value in source."""
+    if isinstance(source, MetadataStore):
+        return MetadataIndex.from_store(source)
+    if isinstance(source, CompactModel):
+        return MetadataIndex.from_store(source.metadata or MetadataStore())
+    if isinstance(source, ValidatedModel):
+        store = MetadataStore()  # Same last-listing-wins rule as build_graph
+        for svc in source.services:
+            store.add_service(svc.id, None, svc.metadata)
+        for dep in source.dependencies:
+            store.add_dependency(dep.src, dep.dst, dep.metadata)
+        return MetadataIndex.from_store(store)
+    return MetadataIndex.from_graph(source)
+
+
+def parse_filters(terms: Iterable[str]) -> dict[str, list[str]]:
+    """Parses KEY=VALUE terms into filters; repeating a key allows several values.
+
+    Raises:
+        ValueError: If a term has no "=" or an empty key."""
+    filters: dict[str, list[str]] = {}
+    for term in terms:
+        key, sep, value = term.partition("=")
+        key = key.strip()
+        if not sep or not key:
+            raise ValueError(f"Filter {term!r} is not of the form KEY=VALUE.")
+        filters.setdefault(key, []).append(value.strip())
+    return filters
+
+
+def metadata_tokens(values: Mapping[str, Any]) -> Iterator[tuple[str, str]]:
+    """(key, value) text pairs indexed for a metadata mapping.
+
+    Nested mappings contribute dotted keys ({"owner": {"team": "x"}} gives owner.team),
+    every element of a list is indexed under the list's key, booleans read true/false,
+    null reads null and whole floats read like integers."""
+    for key, value in values.items():
+        if isinstance(value, Mapping):
+            for sub, token in metadata_tokens(value):
+                yield f"{key}.{sub}", token
+        elif isinstance(value, (list, tuple)):
+            for item in value:
+                if not isinstance(item, (Mapping, list, tuple)):
+                    yield str(key), _token(item)
+        else:
+            yield str(key), _token(value)
+
+
+def _token(value: Any) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, bool):  # Before int: bool is a subclass of int
+        return "true" if value else "false"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _add(table: dict[str, dict[str, set[Any]]], item: Hashable, values: Mapping[str, Any]) -> None:
+    for key, token in metadata_tokens(values):
+        table.setdefault(key, {}).setdefault(token, set()).add(item)
+
+
+def _select(table: dict[str, dict[str, set[Any]]], filters: Filters) -> set[Any]:
+    if not filters:
+        raise ValueError("At least one filter is required.")
+    matches: list[set[Any]] = []
+    for key, wanted in filters.items():
+        by_value = table.get(key, {})
+        # Values of one key are alternatives; keys must all match.
+        matches.append(set().union(*(by_value.get(_token(v), ()) for v in wanted)))
+    matches.sort(key=len)  # Intersect from the smallest set
+    return matches[0].intersection(*matches[1:])
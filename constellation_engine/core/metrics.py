@@ -0,0 +1,130 @@
+# Import statements
+from __future__ import annotations  # For future compatibility with type hinting
+
+import time  # For wall-clock timing
+from contextlib import contextmanager, nullcontext  # For stage context managers
+from contextvars import ContextVar  # For the active recorder/stage
+from dataclasses import asdict, dataclass, field  # For defining data classes
+from typing import Any, Callable, ContextManager, Iterator  # For type hinting
+
+
+@dataclass(slots=True)
+class StageMetrics:
+    """Data class representing measurements for one pipeline stage."""
+    name: str # Stage name, e.g. "load" or "build_graph"
+    seconds: float = 0.0 # Wall time spent in the stage
+    peak_bytes: int | None = None # Peak traced allocation during the stage, if traced
+    nodes: int | None = None # Node count the stage produced or worked on
+    edges: int | None = None # Edge count the stage produced or worked on
+    edges_visited: int = 0 # Edges examined by graph traversals in the stage
+
+
+@dataclass(slots=True)
+class Recorder:
+    """Collects StageMetrics for every stage finished while it is active."""
+    trace_memory: bool = False # Whether peak memory is traced (slows allocation-heavy code)
+    stages: list[StageMetrics] = field(default_factory=list) # Finished stages, in order
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"stages": [asdict(s) for s in self.stages]}
+
+
+_recorder: ContextVar[Recorder | None] = ContextVar("constellation_recorder", default=None)
+_current: ContextVar[StageMetrics | None] = ContextVar("constellation_stage", default=None)
+_hooks: list[Callable[[StageMetrics], None]] = []
+
+
+def add_hook(hook: Callable[[StageMetrics], None]) -> Callable[[], None]:
+    """Registers a callback invoked with each finished stage; returns a remover.
+
+    Args:
+        hook: Called with the StageMetrics of every stage as it finishes."""
+    _hooks.append(hook)
+    return lambda: _hooks.remove(hook)
+
+
+@contextmanager
+def recording(*, trace_memory: bool = False) -> Iterator[Recorder]:
+    """Activates a Recorder for the duration of the block.
+
+    Args:
+        trace_memory: If True, trace allocations with tracemalloc to report per-stage
+            peak memory. This adds noticeable overhead to the measured stages."""
+    import tracemalloc  # Deferred; only needed when tracing memory
+
+    rec = Recorder(trace_memory=trace_memory)
+    started = trace_memory and not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    token = _recorder.set(rec)
+    try:
+        yield rec
+    finally:
+        _recorder.reset(token)
+        if started:
+            tracemalloc.stop()
+
+
+def stage(name: str) -> ContextManager[StageMetrics | None]:
+    """Measures the enclosed block as a pipeline stage.
+
+    When no Recorder is active and no hooks are registered this returns a no-op
+    context, so instrumented code pays a single context-variable lookup.
+
+    Args:
+        name: Name reported for the stage."""
+    rec = _recorder.get()
+    if rec is None and not _hooks:
+        return nullcontext()
+    return _measure(name, rec)
+
+
+def note(*, nodes: int | None = None, edges: int | None = None) -> None:
+    """Records node/edge counts on the current stage, if one is being measured."""
+    current = _current.get()
+    if current is None:
+        return
+    if nodes is not None:
+        current.nodes = nodes
+    if edges is not None:
+        current.edges = edges
+
+
+def count_edges(n: int) -> None:
+    """Adds n to the current stage's visited-edge count, if one is being measured."""
+    current = _current.get()
+    if current is not None:
+        current.edges_visited += n
+
+
+def is_measuring() -> bool:
+    """True inside a measured stage; lets engines skip bookkeeping otherwise."""
+    return _current.get() is not None
+
+
+@contextmanager
+def _measure(name: str, rec: Recorder | None) -> Iterator[StageMetrics]:
+    import tracemalloc  # Deferred; already loaded by recording() when it matters
+
+    metrics = StageMetrics(name=name)
+    tracing = rec is not None and rec.trace_memory and tracemalloc.is_tracing()
+    if tracing:
+        tracemalloc.reset_peak()
+    outer = _current.get()
+    token = _current.set(metrics)
+    start = time.perf_counter()
+    try:
+        yield metrics
+    finally:
+        metrics.seconds = time.perf_counter() - start
+        if tracing:
+            # Nested stages reset the tracemalloc peak, so fold theirs in (see below).
+            peak = tracemalloc.get_traced_memory()[1]
+            metrics.peak_bytes = max(peak, metrics.peak_bytes or 0)
+            if outer is not None:
+                outer.peak_bytes = max(outer.peak_bytes or 0, metrics.peak_bytes)
+        _current.reset(token)
+        if rec is not None:
+            rec.stages.append(metrics)
+        for hook in list(_hooks):
+            hook(metrics)
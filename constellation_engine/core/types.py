@@ -32,4 +32,12 @@ class Dependency:
     dst: ServiceId # Identifier of the service being depended on
     dep_type: DependencyType = DependencyType.HARD # Type of the dependency
     call_type: CallType = CallType.SYNC # Type of call for the dependency
-    metadata: Mapping[str, Any] | None = None # Additional metadata for the dependency
\ No newline at end of file
+    metadata: Mapping[str, Any] | None = None # Additional metadata for the dependency
+
+@dataclass(frozen=True, slots=True)
+class ManifestDelta:
+    """Data class representing a change set against an existing dependency model."""
+    add_services: tuple[Service, ...] = () # Services to add
+    remove_services: tuple[ServiceId, ...] = () # Services to remove, with their edges
+    add_dependencies: tuple[Dependency, ...] = () # New edges, or new types for existing edges
+    remove_dependencies: tuple[tuple[ServiceId, ServiceId], ...] = () # (src, dst) edges to remove
@@ -15,72 +15,133 @@ class ValidationResult:
     """Data class representing the result of a validation process."""
     ok: bool # Indicates if the model is valid
     errors: tuple[str, ...] # List of error messages if any
+    truncated: bool = False # True if validation stopped at the error cap
+
+@dataclass(frozen=True, slots=True)
+class ValidatedModel:
+    """Services and dependencies that passed validation, as returned by validate_or_raise.
+
+    build_graph and the compiled engines accept this in place of raw lists and skip
+    re-validating it. Construct it only through validate_or_raise."""
+    services: tuple[Service, ...] # Services in manifest order
+    dependencies: tuple[Dependency, ...] # Dependencies in manifest order
 
 def validate_model(
     services: Iterable[Service],
     dependencies: Iterable[Dependency],
     *,
     allow_self_dependencies: bool = False,
+    max_errors: int | None = None,
+    fail_fast: bool = False,
 ) -> ValidationResult:
     """Validates the given services and dependencies against Constellation rules.
 
+    Service IDs are checked in one pass over the services, and endpoints and
+    self-dependencies together in one pass over the dependencies. Errors are reported
+    as: duplicate IDs, then missing endpoints, then self-dependencies.
+
     Args:
         services: An iterable of Service objects to validate.
         dependencies: An iterable of Dependency objects to validate.
-        allow_self_dependencies: If True, allows services to depend on themselves. """
-    errors: list[str] = []
+        allow_self_dependencies: If True, allows services to depend on themselves.
+        max_errors: Stop after this many errors and mark the result truncated.
+        fail_fast: Stop at the first error; shorthand for max_errors=1."""
+    return validate_references(
+        (svc.id for svc in services),
+        ((d.src, d.dst) for d in dependencies),
+        allow_self_dependencies=allow_self_dependencies,
+        max_errors=max_errors,
+        fail_fast=fail_fast,
+    )
+
+def validate_references(
+    service_ids: Iterable[ServiceId],
+    edges: Iterable[tuple[ServiceId, ServiceId]],
+    *,
+    allow_self_dependencies: bool = False,
+    max_errors: int | None = None,
+    fail_fast: bool = False,
+) -> ValidationResult:
+    """validate_model over bare IDs and (src, dst) pairs, for compact representations.
 
-    services_list = list(services)
-    deps_list = list(dependencies)
+    Args:
+        service_ids: Declared service IDs, in manifest order.
+        edges: (src, dst) pairs of every dependency, in manifest order.
+        allow_self_dependencies: If True, allows services to depend on themselves.
+        max_errors: Stop after this many errors and mark the result truncated.
+        fail_fast: Stop at the first error; shorthand for max_errors=1."""
+    cap = 1 if fail_fast else max_errors
+    if cap is not None and cap < 1:
+        raise ValueError("max_errors must be at least 1.")
 
     # 1) Check for unique service IDs
-    ids = [svc.id for svc in services_list] # Extract service IDs
-    seen: set[ServiceId] = set() # Set to track seen IDs
+    known: set[ServiceId] = set() # Set of valid service IDs
     dupes: set[ServiceId] = set() # Set to track duplicate IDs
-    for sid in ids:
-        if sid in seen:
+    for sid in service_ids:
+        if sid in known:
             dupes.add(sid)
         else:
-            seen.add(sid)
+            known.add(sid)
+    errors: list[str] = []
     if dupes:
         errors.append(f"Duplicate service IDs found: {sorted(str(x) for x in dupes)}")
-    
-    service_ids = set(ids) # Set of valid service IDs
-
-    # 2) Validate dependencies endpoints exist
-    for d in deps_list:
-        if d.src not in service_ids:
-            errors.append(f"Dependency source {d.src} does not exist among services.")
-        if d.dst not in service_ids:
-            errors.append(f"Dependency destination {d.dst} does not exist among services.")
-    # 3) Check for self-dependencies if not allowed
-    if not allow_self_dependencies:
-        for d in deps_list:
-            if d.src == d.dst:
-                errors.append(f"Service {d.src} has a self-dependency, which is not allowed.")
-
-    return ValidationResult(ok=(len(errors) == 0), errors=tuple(errors)) # Return validation result
+
+    # 2) Validate dependency endpoints exist and 3) reject self-dependencies, in one pass.
+    # Self-dependency errors are reported last, so the pass only stops early once the
+    # endpoint errors alone exceed the cap; the result is then the first `cap` errors,
+    # marked truncated only if an error beyond them was actually found.
+    self_errors: list[str] = []
+    for src, dst in edges:
+        if cap is not None and len(errors) > cap:
+            break
+        if src not in known:
+            errors.append(f"Dependency source {src} does not exist among services.")
+        if dst not in known:
+            errors.append(f"Dependency destination {dst} does not exist among services.")
+        if src == dst and not allow_self_dependencies:
+            self_errors.append(f"Service {src} has a self-dependency, which is not allowed.")
+
+    errors.extend(self_errors)
+    truncated = cap is not None and len(errors) > cap
+    if truncated:
+        del errors[cap:]
+    return ValidationResult(ok=not errors, errors=tuple(errors), truncated=truncated)
 
 def validate_or_raise(
     services: Iterable[Service],
     dependencies: Iterable[Dependency],
     *,
     allow_self_dependencies: bool = False,
-) -> None:
+    max_errors: int | None = None,
+    fail_fast: bool = False,
+) -> ValidatedModel:
     """Validates the given services and dependencies, raising ValidationError on failure.
 
     Args:
         services: An iterable of Service objects to validate.
         dependencies: An iterable of Dependency objects to validate.
         allow_self_dependencies: If True, allows services to depend on themselves.
+        max_errors: Report at most this many errors in the exception.
+        fail_fast: Stop at the first error.
+    Returns:
+        A ValidatedModel wrapping the inputs, accepted by build_graph and the engines.
     Raises:
         ValidationError: If the validation fails.
     """
+    model = ValidatedModel(tuple(services), tuple(dependencies))
     result = validate_model(
-        services,
-        dependencies,
+        model.services,
+        model.dependencies,
         allow_self_dependencies=allow_self_dependencies,
+        max_errors=max_errors,
+        fail_fast=fail_fast,
     )
     if not result.ok:
-        msg = "Validation failed with the following errors:\n" + "\n".join(result.errors)
-        raise ValidationError(msg)
\ No newline at end of file
+        raise _error_for(result)
+    return model
+
+def _error_for(result: ValidationResult) -> ValidationError:
+    msg = "Validation failed with the following errors:\n" + "\n".join(result.errors)
+    if result.truncated:
+        msg += "\n(further errors not shown)"
+    return ValidationError(msg)
@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Any
+
+from constellation_engine.core.compact import CompactModel, MetadataStore
+from constellation_engine.core.metrics import note, stage
+from constellation_engine.sim.compiled import (
+    CompiledGraph,
+    compile_model,
+    pack_into,
+    packed_size,
+    unpack,
+)
+
+from .sources import is_federated
+from .stream import load_compact
+
+CACHE_DIR_ENV = "CONSTELLATION_CACHE_DIR"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Bump when loader, validation or the packed layout change meaning.
+_CACHE_VERSION = b"constellation-cache-2"
+_SUFFIX = ".cegraph"
+_META_SUFFIX = ".cemeta"
+FILE_SUFFIX = ".cefile"  # per-file parse results of federated manifests
+_SUFFIXES = (_SUFFIX, _META_SUFFIX, FILE_SUFFIX)
+
+
+def default_cache_dir() -> Path:
+    """``$CONSTELLATION_CACHE_DIR``, else ``$XDG_CACHE_HOME/constellation-engine``."""
+    env = os.environ.get(CACHE_DIR_ENV)
+    if env:
+        return Path(env)
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "constellation-engine"
+
+
+def manifest_digest(path: str | Path) -> str:
+    """Content hash of a manifest file, used as its cache key.
+
+    A federated manifest (directory or glob) is keyed by its files' paths, mtimes and
+    sizes instead, so an unchanged set of files is recognised without reading them.
+    """
+    if is_federated(path):
+        from .federated import sources_digest  # deferred: single files never need it
+
+        return hashlib.sha256(_CACHE_VERSION + sources_digest(path).encode()).hexdigest()
+    p = Path(path)
+    h = hashlib.sha256(_CACHE_VERSION)
+    h.update(p.suffix.lower().encode("utf-8"))
+    with p.open("rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _touch(path: Path) -> None:
+    # Mark an entry as recently used for eviction. Best-effort: a read-only or shared
+    # cache directory still serves hits, it just evicts by write time instead.
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+class GraphCache:
+    """
+    On-disk cache of compiled, already-validated graphs keyed by manifest digest.
+
+    Entries use the packed ``CompiledGraph`` layout and are memory-mapped on read, so
+    a warm lookup costs one ``mmap`` plus decoding the service ids. Names and metadata
+    live in a separate JSON sidecar that is only written and read on request. Least
+    recently used entries are evicted once the directory grows past ``max_bytes``.
+    """
+
+    def __init__(self, directory: str | Path, *, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+
+    def get(self, digest: str) -> CompiledGraph | None:
+        path = self._path(digest)
+        try:
+            with path.open("rb") as fh:
+                mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):  # ValueError: empty file
+            return None
+
+        try:
+            compiled = unpack(memoryview(mm))
+        except (ValueError, struct.error):
+            mm.close()
+            path.unlink(missing_ok=True)
+            return None
+
+        _touch(path)
+        return compiled
+
+    def put(self, digest: str, compiled: CompiledGraph) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        buf = bytearray(packed_size(compiled))
+        pack_into(compiled, memoryview(buf))
+        self._write(self._path(digest), buf)
+        self.evict(keep=digest)
+
+    def get_metadata(self, digest: str) -> MetadataStore | None:
+        data = self.get_json(digest, _META_SUFFIX)
+        try:
+            return None if data is None else MetadataStore.from_dict(data)
+        except (KeyError, TypeError, ValueError):
+            self._path(digest, _META_SUFFIX).unlink(missing_ok=True)
+            return None
+
+    def put_metadata(self, digest: str, metadata: MetadataStore) -> None:
+        self.put_json(digest, _META_SUFFIX, metadata.to_dict())
+
+    def get_json(self, key: str, suffix: str) -> Any:
+        """A JSON side entry stored by ``put_json``, or None if it is missing or corrupt."""
+        path = self._path(key, suffix)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            path.unlink(missing_ok=True)
+            return None
+        _touch(path)
+        return data
+
+    def put_json(self, key: str, suffix: str, data: Any, *, evict: bool = True) -> None:
+        """Store a JSON side entry; ``suffix`` must be one of the cache's entry kinds.
+
+        With ``evict=False`` the size bound is not enforced; a caller storing many
+        entries in a row calls ``evict`` once afterwards instead of rescanning the
+        directory per entry.
+
+        Raises TypeError (and stores nothing) if ``data`` is not JSON serializable,
+        e.g. YAML metadata holding dates.
+        """
+        assert suffix in _SUFFIXES, suffix
+        encoded = json.dumps(data).encode("utf-8")
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._write(self._path(key, suffix), encoded)
+        if evict:
+            self.evict(keep=key)
+
+    def evict(self, *, keep: str | None = None) -> None:
+        """Remove least recently used entries until the cache fits in ``max_bytes``."""
+        entries = []
+        for suffix in _SUFFIXES:
+            for p in self.directory.glob(f"*{suffix}"):
+                try:
+                    st = p.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((st.st_mtime_ns, st.st_size, p))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, p in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if p.stem == keep:
+                continue
+            p.unlink(missing_ok=True)
+            total -= size
+
+    def _write(self, path: Path, data: bytes | bytearray) -> None:
+        import tempfile  # deferred: pulls in shutil and random, which only writes need
+
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    def _path(self, digest: str, suffix: str = _SUFFIX) -> Path:
+        return self.directory / f"{digest}{suffix}"
+
+
+def load_compiled(path: str | Path, cache: GraphCache | None = None) -> CompiledGraph:
+    """Compiled graph for the manifest at ``path``, served from ``cache`` when possible.
+
+    ``path`` may also be a directory or glob of manifests, merged by ``FederatedLoader``.
+
+    A cache hit skips parsing and validation entirely; a miss loads, validates and
+    compiles the manifest, then stores the result for the next run.
+    """
+    if cache is not None:
+        with stage("cache_lookup"):
+            digest = manifest_digest(path)
+            cached = cache.get(digest)
+            if cached is not None:
+                note(nodes=cached.num_nodes, edges=cached.num_edges)
+        if cached is not None:
+            return cached
+
+    # Streaming into the compact model skips per-record objects, metadata and networkx.
+    model = _load_model(path, cache, metadata=False)
+    with stage("compile"):
+        compiled = compile_model(model)
+        note(nodes=compiled.num_nodes, edges=compiled.num_edges)
+
+    if cache is not None:
+        with stage("cache_store"):
+            try:
+                cache.put(digest, compiled)
+            except OSError:
+                pass  # an unwritable cache must not fail the analysis
+    return compiled
+
+
+def load_metadata(path: str | Path, cache: GraphCache | None = None) -> MetadataStore:
+    """Service names and metadata for the manifest at ``path``, for output that needs them.
+
+    Analyses never load metadata; this reads it from the cache sidecar when present,
+    otherwise from the manifest (storing the sidecar for next time).
+    """
+    if cache is not None:
+        digest = manifest_digest(path)
+        cached = cache.get_metadata(digest)
+        if cached is not None:
+            return cached
+
+    metadata = _load_model(path, cache, metadata=True).metadata
+    assert metadata is not None
+
+    if cache is not None:
+        try:
+            cache.put_metadata(digest, metadata)
+        except (OSError, TypeError):
+            pass  # an unwritable cache or non-JSON metadata must not fail the analysis
+    return metadata
+
+
+def _load_model(path: str | Path, cache: GraphCache | None, *, metadata: bool) -> CompactModel:
+    if is_federated(path):
+        from .federated import FederatedLoader  # deferred: single files never need it
+
+        return FederatedLoader(path, cache=cache).load(metadata=metadata)
+    return load_compact(path, metadata=metadata)
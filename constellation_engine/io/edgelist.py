@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import mmap
+import operator
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import NamedTuple
+
+from constellation_engine.core.compact import CALL_TYPES, DEP_TYPES, CompactModel
+from constellation_engine.core.metrics import note, stage
+from constellation_engine.core.types import ServiceId
+from constellation_engine.core.validate import _error_for, validate_references
+
+from .loaders import ManifestError
+
+# Layout, all little-endian, every section starting at a multiple of 8 bytes:
+#   header   magic, number of services n, number of dependencies e, id blob length
+#   offsets  int64[n + 1], byte offset of each service ID in the blob
+#   src      int32[e], depender service index of each dependency
+#   dst      int32[e], dependency service index of each dependency
+#   dep      uint8[e], DependencyType code (position in core.compact.DEP_TYPES)
+#   call     uint8[e], CallType code (position in core.compact.CALL_TYPES)
+#   blob     UTF-8 service IDs, back to back, in declaration order
+_MAGIC = b"CEEDGES1"
+_HEADER = "<8sqqq"
+
+
+def write_edgelist(model: CompactModel, path: str | Path) -> None:
+    """Write ``model`` as a binary edge list. Names and metadata are not stored."""
+    encoded = [sid.encode("utf-8") for sid in model.ids]
+    offsets = array("q", [0])
+    for raw in encoded:
+        offsets.append(offsets[-1] + len(raw))
+    blob = b"".join(encoded)
+    n, e = model.num_services, model.num_dependencies
+    at = _layout(n, e, len(blob))
+
+    buf = bytearray(at.end)
+    struct.pack_into(_HEADER, buf, 0, _MAGIC, n, e, len(blob))
+    buf[at.offsets : at.src] = _little_endian(offsets)
+    buf[at.src : at.src + 4 * e] = _little_endian(array("i", model.src))
+    buf[at.dst : at.dst + 4 * e] = _little_endian(array("i", model.dst))
+    buf[at.dep : at.call] = bytes(model.dep_codes)
+    buf[at.call : at.call + e] = bytes(model.call_codes)
+    buf[at.blob : at.end] = blob
+    Path(path).write_bytes(buf)
+
+
+def load_edgelist(
+    path: str | Path,
+    *,
+    validate: bool = True,
+    max_errors: int | None = None,
+    fail_fast: bool = False,
+) -> CompactModel:
+    """
+    Read a binary edge list straight into a ``CompactModel``, without metadata.
+
+    The file is memory-mapped and each column is copied into its array in one bulk
+    operation, so no object is created per dependency; only the service IDs are
+    decoded. Raises ``ManifestError`` if the file is not a well-formed edge list and,
+    unless ``validate`` is False, ``ValidationError`` like ``validate_or_raise``.
+    """
+    p = Path(path)
+    with stage("load"):
+        with p.open("rb") as fh:
+            try:
+                mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # empty file
+                raise ManifestError(f"{p} is not a binary edge list.") from None
+        with mm:
+            model = _read(memoryview(mm), p)
+        note(nodes=model.num_services, edges=model.num_dependencies)
+    if validate:
+        with stage("validate"):
+            _validate(model, max_errors=max_errors, fail_fast=fail_fast)
+    return model
+
+
+def _read(buf: memoryview, p: Path) -> CompactModel:
+    try:
+        try:
+            magic, n, e, blob_len = struct.unpack_from(_HEADER, buf, 0)
+        except struct.error:
+            magic = None
+        if magic != _MAGIC:
+            raise ManifestError(f"{p} is not a binary edge list.")
+        at = _layout(n, e, blob_len)
+        if min(n, e, blob_len) < 0 or len(buf) != at.end:
+            raise ManifestError(f"{p} is truncated or has trailing data.")
+
+        offsets = _column("q", buf[at.offsets : at.src])
+        src = _column("i", buf[at.src : at.src + 4 * e])
+        dst = _column("i", buf[at.dst : at.dst + 4 * e])
+        dep_codes = _column("B", buf[at.dep : at.call])
+        call_codes = _column("B", buf[at.call : at.call + e])
+        blob = bytes(buf[at.blob : at.end])
+    finally:
+        buf.release()
+
+    if offsets[0] != 0 or offsets[-1] != blob_len:
+        raise ManifestError(f"{p}: service ID offsets do not span the ID table.")
+    if not all(map(operator.lt, offsets, offsets[1:])):
+        raise ManifestError(f"{p}: service IDs must be non-empty strings.")
+    if e and (min(min(src), min(dst)) < 0 or max(max(src), max(dst)) >= n):
+        raise ManifestError(f"{p}: dependency endpoint index out of range.")
+    if e and (max(dep_codes) >= len(DEP_TYPES) or max(call_codes) >= len(CALL_TYPES)):
+        raise ManifestError(f"{p}: unknown dep_type or call_type code.")
+
+    try:
+        if blob.isascii():
+            # Byte offsets are character offsets: decode once and slice.
+            text = blob.decode("ascii")
+            ids = tuple(ServiceId(text[offsets[i] : offsets[i + 1]]) for i in range(n))
+        else:
+            ids = tuple(
+                ServiceId(blob[offsets[i] : offsets[i + 1]].decode("utf-8")) for i in range(n)
+            )
+    except UnicodeDecodeError:
+        raise ManifestError(f"{p}: service IDs are not valid UTF-8.") from None
+    return CompactModel(ids=ids, src=src, dst=dst, dep_codes=dep_codes, call_codes=call_codes)
+
+
+def _validate(model: CompactModel, *, max_errors: int | None, fail_fast: bool) -> None:
+    # Endpoints are indices already checked to be in range, so only duplicate IDs and
+    # self-dependencies can fail; check those in bulk and defer the messages.
+    ids = model.ids
+    if len(set(ids)) == len(ids) and not any(map(operator.eq, model.src, model.dst)):
+        return
+    result = validate_references(
+        ids,
+        ((ids[s], ids[d]) for s, d in zip(model.src, model.dst)),
+        max_errors=max_errors,
+        fail_fast=fail_fast,
+    )
+    if not result.ok:
+        raise _error_for(result)
+
+
+class _Layout(NamedTuple):
+    offsets: int
+    src: int
+    dst: int
+    dep: int
+    call: int
+    blob: int
+    end: int
+
+
+def _layout(n: int, e: int, blob_len: int) -> _Layout:
+    def align(x: int) -> int:
+        return (x + 7) & ~7
+
+    offsets_at = align(struct.calcsize(_HEADER))
+    src_at = offsets_at + 8 * (n + 1)
+    dst_at = align(src_at + 4 * e)
+    dep_at = align(dst_at + 4 * e)
+    call_at = dep_at + e
+    blob_at = align(call_at + e)
+    return _Layout(offsets_at, src_at, dst_at, dep_at, call_at, blob_at, blob_at + blob_len)
+
+
+def _column(typecode: str, raw: memoryview) -> array[int]:
+    col = array(typecode)
+    col.frombytes(raw)
+    if sys.byteorder == "big" and col.itemsize > 1:
+        col.byteswap()
+    return col
+
+
+def _little_endian(col: array[int]) -> bytes:
+    if sys.byteorder == "big" and col.itemsize > 1:
+        col = array(col.typecode, col)
+        col.byteswap()
+    return col.tobytes()
@@ -0,0 +1,281 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from constellation_engine.core.compact import CompactBuilder, CompactModel
+from constellation_engine.core.metrics import note, stage
+from constellation_engine.core.validate import ValidationResult, _error_for
+
+from .loaders import ManifestError, _dependency_fields, _service_fields
+from .sources import expand_sources
+from .stream import _records
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+    from .cache import GraphCache
+
+# Bump when the per-file record format changes meaning.
+_RECORDS_VERSION = b"constellation-records-1"
+
+
+def sources_digest(spec: str | Path) -> str:
+    """Cache key for a federated manifest: every file's path, mtime and size."""
+    h = hashlib.sha256(_RECORDS_VERSION)
+    for path, stamp in _stamps(expand_sources(spec)):
+        h.update(f"{path}\0{stamp[0]}\0{stamp[1]}\n".encode("utf-8"))
+    return h.hexdigest()
+
+
+@dataclass(frozen=True, slots=True)
+class FileRecords:
+    """The raw, field-checked records of one manifest file."""
+
+    path: Path
+    stamp: tuple[int, int]  # (mtime_ns, size) when parsed
+    services: tuple[tuple[str, str | None, dict[str, Any] | None], ...]
+    dependencies: tuple[tuple[str, str, str, str, dict[str, Any] | None], ...]
+
+
+def parse_file(path: Path) -> FileRecords:
+    """Parse one manifest file; ``ManifestError`` messages are prefixed with its path."""
+    stamp = _stamp(path)
+    services = []
+    dependencies = []
+    try:
+        for section, i, item in _records(path):
+            if section == "services":
+                services.append(_service_fields(i, item))
+            else:
+                dependencies.append(_dependency_fields(i, item))
+    except ManifestError as exc:
+        raise ManifestError(f"{path}: {exc}") from None
+    return FileRecords(path, stamp, tuple(services), tuple(dependencies))
+
+
+class FederatedLoader:
+    """
+    Loads many manifest files (one per team, say) concurrently into one model.
+
+    Files are parsed on a thread pool, or a process pool with ``processes=True``.
+    Parse results are kept per file and reused while the file's mtime and size are
+    unchanged, both in memory across ``load`` calls and, given a ``cache``, on disk
+    across runs, so only changed files are re-read. Files are merged in sorted path
+    order; duplicate and dangling references are reported with their source file.
+    """
+
+    def __init__(
+        self,
+        spec: str | Path,
+        *,
+        workers: int | None = None,
+        processes: bool = False,
+        cache: GraphCache | None = None,
+    ) -> None:
+        self.spec = spec
+        self.workers = workers
+        self.processes = processes
+        self.cache = cache
+        self.parsed: list[Path] = []  # files actually re-read by the last load
+        self._files: dict[Path, FileRecords] = {}
+
+    def fingerprint(self) -> tuple[tuple[Path, tuple[int, int]], ...]:
+        """(path, (mtime_ns, size)) of every current source file."""
+        return tuple(_stamps(expand_sources(self.spec)))
+
+    def load(
+        self,
+        *,
+        metadata: bool = False,
+        max_errors: int | None = None,
+        fail_fast: bool = False,
+    ) -> CompactModel:
+        """Parse changed files, then merge and validate all of them.
+
+        Raises:
+            ManifestError: If a file is malformed (the message names the file).
+            ValidationError: If the merged model is invalid (messages name files).
+        """
+        with stage("load"):
+            files = self._refresh()
+            builder = CompactBuilder(metadata=metadata)
+            for records in files:
+                for svc in records.services:
+                    builder.add_service(*svc)
+                for dep in records.dependencies:
+                    builder.add_dependency(*dep)
+            note(nodes=builder.num_services, edges=builder.num_dependencies)
+
+        with stage("validate"):
+            result = _check(files, max_errors=max_errors, fail_fast=fail_fast)
+            if not result.ok:
+                raise _error_for(result)
+            return builder.finish()
+
+    def validate(
+        self, *, max_errors: int | None = None, fail_fast: bool = False
+    ) -> ValidationResult:
+        """Parse changed files and validate the merged model without building it."""
+        with stage("load"):
+            files = self._refresh()
+        with stage("validate"):
+            return _check(files, max_errors=max_errors, fail_fast=fail_fast)
+
+    def _refresh(self) -> list[FileRecords]:
+        current = self.fingerprint()
+        stale = []
+        for path, stamp in current:
+            known = self._files.get(path)
+            if known is None or known.stamp != stamp:
+                known = self._from_disk(path, stamp)
+                if known is None:
+                    stale.append(path)
+                else:
+                    self._files[path] = known
+
+        self.parsed = stale
+        if stale:
+            for records in self._parse(stale):
+                self._files[records.path] = records
+                self._to_disk(records)
+            if self.cache is not None:
+                # Entries are added without evicting; one pass afterwards keeps a load
+                # of N files at O(N) directory scans rather than one scan per file.
+                try:
+                    self.cache.evict()
+                except OSError:
+                    pass
+
+        keep = {path for path, _ in current}
+        for path in [p for p in self._files if p not in keep]:
+            del self._files[path]
+        return [self._files[path] for path, _ in current]
+
+    def _parse(self, paths: list[Path]) -> list[FileRecords]:
+        if len(paths) == 1 or self.workers == 1:
+            return [parse_file(p) for p in paths]
+        # deferred: single-file runs never start a pool, so never load multiprocessing
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+        pool: Executor
+        if self.processes:
+            pool = ProcessPoolExecutor(max_workers=self.workers)
+        else:
+            pool = ThreadPoolExecutor(max_workers=self.workers)
+        with pool:
+            return list(pool.map(parse_file, paths))
+
+    def _from_disk(self, path: Path, stamp: tuple[int, int]) -> FileRecords | None:
+        if self.cache is None:
+            return None
+        from .cache import FILE_SUFFIX
+
+        data = self.cache.get_json(_file_key(path, stamp), FILE_SUFFIX)
+        if data is None:
+            return None
+        try:
+            return FileRecords(
+                path,
+                stamp,
+                tuple((s[0], s[1], s[2]) for s in data["services"]),
+                tuple((d[0], d[1], d[2], d[3], d[4]) for d in data["dependencies"]),
+            )
+        except (KeyError, IndexError, TypeError):
+            return None
+
+    def _to_disk(self, records: FileRecords) -> None:
+        if self.cache is None:
+            return
+        from .cache import FILE_SUFFIX
+
+        data = {"services": records.services, "dependencies": records.dependencies}
+        try:
+            self.cache.put_json(
+                _file_key(records.path, records.stamp), FILE_SUFFIX, data, evict=False
+            )
+        except (OSError, TypeError):
+            pass  # an unwritable cache or non-JSON metadata must not fail the load
+
+
+def load_federated(
+    spec: str | Path,
+    *,
+    metadata: bool = False,
+    workers: int | None = None,
+    cache: GraphCache | None = None,
+) -> CompactModel:
+    """One-shot ``FederatedLoader(spec, ...).load(metadata=metadata)``."""
+    return FederatedLoader(spec, workers=workers, cache=cache).load(metadata=metadata)
+
+
+def _check(
+    files: list[FileRecords], *, max_errors: int | None, fail_fast: bool
+) -> ValidationResult:
+    """Cross-file validation: the rules of ``validate_model``, with source files named.
+
+    Errors are grouped like ``validate_model``'s: duplicate IDs, then missing
+    endpoints, then self-dependencies.
+    """
+    cap = 1 if fail_fast else max_errors
+    if cap is not None and cap < 1:
+        raise ValueError("max_errors must be at least 1.")
+    owner: dict[str, Path] = {}
+    errors: list[str] = []
+    reported: set[str] = set()
+    for records in files:
+        path = records.path
+        defined: set[str] = set()
+        for sid, _, _ in records.services:
+            first = owner.setdefault(sid, path)
+            if first == path and sid not in defined:
+                defined.add(sid)
+                continue
+            if first == path:
+                msg = f"{path}: Service {sid} is defined more than once."
+            else:
+                msg = f"{path}: Service {sid} is already defined in {first}."
+            if msg not in reported:
+                reported.add(msg)
+                errors.append(msg)
+
+    self_errors: list[str] = []
+    for records in files:
+        where = records.path
+        for src, dst, _, _, _ in records.dependencies:
+            if cap is not None and len(errors) > cap:
+                # An error beyond the cap was found; later ones cannot change the result.
+                return ValidationResult(ok=False, errors=tuple(errors[:cap]), truncated=True)
+            if src not in owner:
+                errors.append(f"{where}: Dependency source {src} does not exist among services.")
+            if dst not in owner:
+                errors.append(
+                    f"{where}: Dependency destination {dst} does not exist among services."
+                )
+            if src == dst:
+                self_errors.append(
+                    f"{where}: Service {src} has a self-dependency, which is not allowed."
+                )
+
+    errors.extend(self_errors)
+    truncated = cap is not None and len(errors) > cap
+    if truncated:
+        del errors[cap:]
+    return ValidationResult(ok=not errors, errors=tuple(errors), truncated=truncated)
+
+
+def _file_key(path: Path, stamp: tuple[int, int]) -> str:
+    raw = f"{path.resolve()}\0{stamp[0]}\0{stamp[1]}".encode("utf-8")
+    return hashlib.sha256(_RECORDS_VERSION + raw).hexdigest()
+
+
+def _stamp(path: Path) -> tuple[int, int]:
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def _stamps(paths: list[Path]) -> list[tuple[Path, tuple[int, int]]]:
+    return [(p, _stamp(p)) for p in paths]
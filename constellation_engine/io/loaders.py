@@ -4,15 +4,16 @@ import json
 from pathlib import Path
 from typing import Any
 
-import yaml  # type: ignore
-
+from constellation_engine.core.compact import CompactModel
 from constellation_engine.core.types import (
     CallType,
     Dependency,
     DependencyType,
+    ManifestDelta,
     Service,
     ServiceId,
 )
+from constellation_engine.sim.models import FailureType, Scenario
 
 from .schema import DependencySpec, Manifest, ServiceSpec
 
@@ -39,49 +40,10 @@ def load_manifest(path: str | Path) -> Manifest:
     if not isinstance(deps_raw, list):
         raise ManifestError("'dependencies' must be a list.")
 
-    services: list[ServiceSpec] = []
-    for i, item in enumerate(services_raw):
-        if not isinstance(item, dict):
-            raise ManifestError(f"services[{i}] must be an object/dict.")
-        sid = item.get("id")
-        if not isinstance(sid, str) or not sid.strip():
-            raise ManifestError(f"services[{i}].id must be a non-empty string.")
-        services.append(
-            ServiceSpec(
-                id=sid,
-                name=item.get("name") if isinstance(item.get("name"), str) else None,
-                metadata=item.get("metadata") if isinstance(item.get("metadata"), dict) else None,
-            )
-        )
-
-    deps: list[DependencySpec] = []
-    for i, item in enumerate(deps_raw):
-        if not isinstance(item, dict):
-            raise ManifestError(f"dependencies[{i}] must be an object/dict.")
-        src = item.get("src")
-        dst = item.get("dst")
-        if not isinstance(src, str) or not src.strip():
-            raise ManifestError(f"dependencies[{i}].src must be a non-empty string.")
-        if not isinstance(dst, str) or not dst.strip():
-            raise ManifestError(f"dependencies[{i}].dst must be a non-empty string.")
-
-        dep_type = item.get("dep_type", "hard")
-        call_type = item.get("call_type", "sync")
-
-        if not isinstance(dep_type, str):
-            raise ManifestError(f"dependencies[{i}].dep_type must be a string.")
-        if not isinstance(call_type, str):
-            raise ManifestError(f"dependencies[{i}].call_type must be a string.")
-
-        deps.append(
-            DependencySpec(
-                src=src,
-                dst=dst,
-                dep_type=dep_type,
-                call_type=call_type,
-                metadata=item.get("metadata") if isinstance(item.get("metadata"), dict) else None,
-            )
-        )
+    services = [ServiceSpec(*_service_fields(i, item)) for i, item in enumerate(services_raw)]
+    deps = [
+        DependencySpec(*_dependency_fields(i, item)) for i, item in enumerate(deps_raw)
+    ]
 
     return Manifest(services=services, dependencies=deps)
 
@@ -106,11 +68,246 @@ def manifest_to_domain(manifest: Manifest) -> tuple[list[Service], list[Dependen
     return services, dependencies
 
 
+def load_delta(path: str | Path) -> ManifestDelta:
+    """Load a manifest delta (``add_services``, ``remove_services``, ``add_dependencies``,
+    ``remove_dependencies``; every section optional) from a YAML or JSON file."""
+    p = Path(path)
+    if not p.exists():
+        raise FileNotFoundError(str(p))
+
+    data = _read_yaml_or_json(p)
+    if not isinstance(data, dict):
+        raise ManifestError("Delta root must be an object/dict.")
+
+    sections = {}
+    for key in ("add_services", "remove_services", "add_dependencies", "remove_dependencies"):
+        raw = data.get(key, [])
+        if not isinstance(raw, list):
+            raise ManifestError(f"'{key}' must be a list.")
+        sections[key] = raw
+
+    removed_services = []
+    for i, sid in enumerate(sections["remove_services"]):
+        if not isinstance(sid, str) or not sid.strip():
+            raise ManifestError(f"remove_services[{i}] must be a non-empty string.")
+        removed_services.append(ServiceId(sid))
+
+    added_services = []
+    for i, item in enumerate(sections["add_services"]):
+        sid, name, metadata = _service_fields(i, item, "add_services")
+        added_services.append(Service(id=ServiceId(sid), name=name, metadata=metadata))
+
+    added_deps = []
+    for i, item in enumerate(sections["add_dependencies"]):
+        src, dst, dep_type, call_type, metadata = _dependency_fields(i, item, "add_dependencies")
+        added_deps.append(
+            Dependency(
+                src=ServiceId(src),
+                dst=ServiceId(dst),
+                dep_type=DependencyType(dep_type),
+                call_type=CallType(call_type),
+                metadata=metadata,
+            )
+        )
+
+    removed_deps = []
+    for i, item in enumerate(sections["remove_dependencies"]):
+        src, dst = _edge_fields(i, item, "remove_dependencies")
+        removed_deps.append((ServiceId(src), ServiceId(dst)))
+
+    return ManifestDelta(
+        add_services=tuple(added_services),
+        remove_services=tuple(removed_services),
+        add_dependencies=tuple(added_deps),
+        remove_dependencies=tuple(removed_deps),
+    )
+
+
+def load_scenarios(
+    path: str | Path,
+    *,
+    default_failure: FailureType = FailureType.DOWN,
+) -> list[Scenario]:
+    """Load named multi-service failure scenarios from a YAML or JSON file.
+
+    The root holds a ``scenarios`` list; each entry has a ``name``, a non-empty
+    ``services`` list and an optional ``failure`` (``default_failure`` otherwise).
+    """
+    p = Path(path)
+    if not p.exists():
+        raise FileNotFoundError(str(p))
+
+    data = _read_yaml_or_json(p)
+    if not isinstance(data, dict):
+        raise ManifestError("Scenarios root must be an object/dict.")
+    raw = data.get("scenarios")
+    if not isinstance(raw, list):
+        raise ManifestError("'scenarios' must be a list.")
+
+    valid_failures = {f.value for f in FailureType}
+    scenarios: list[Scenario] = []
+    for i, item in enumerate(raw):
+        if not isinstance(item, dict):
+            raise ManifestError(f"scenarios[{i}] must be an object/dict.")
+        name = item.get("name")
+        if not isinstance(name, str) or not name.strip():
+            raise ManifestError(f"scenarios[{i}].name must be a non-empty string.")
+        services = item.get("services")
+        if (
+            not isinstance(services, list)
+            or not services
+            or not all(isinstance(s, str) and s.strip() for s in services)
+        ):
+            raise ManifestError(
+                f"scenarios[{i}].services must be a non-empty list of non-empty strings."
+            )
+        failure = item.get("failure", default_failure.value)
+        if failure not in valid_failures:
+            raise ManifestError(
+                f"scenarios[{i}].failure must be one of {sorted(valid_failures)}."
+            )
+        scenarios.append(
+            Scenario(
+                name=name,
+                services=tuple(ServiceId(s) for s in services),
+                failure=FailureType(failure),
+            )
+        )
+
+    return scenarios
+
+
+def convert_manifest(src: str | Path, dst: str | Path) -> CompactModel:
+    """Convert a YAML/JSON manifest to a binary edge list or back, by file suffix.
+
+    The source is validated on the way. An edge list stores no names or metadata,
+    so converting to one drops them. Returns the converted model."""
+    from .edgelist import write_edgelist
+    from .sources import is_edgelist
+    from .stream import load_compact
+
+    if is_edgelist(src) == is_edgelist(dst):
+        raise ManifestError(
+            "Convert between a .cedges edge list and a .yaml/.yml/.json manifest."
+        )
+    model = load_compact(src)
+    if is_edgelist(dst):
+        write_edgelist(model, dst)
+    else:
+        write_manifest(model, dst)
+    return model
+
+
+def write_manifest(model: CompactModel, path: str | Path) -> None:
+    """Write ``model`` as a YAML or JSON manifest (by suffix), one record at a time.
+
+    Names and metadata are written when the model carries them. YAML records are
+    written as JSON flow mappings, which YAML reads as-is."""
+    p = Path(path)
+    suffix = p.suffix.lower()
+    if suffix not in {".yaml", ".yml", ".json"}:
+        raise ManifestError("Unsupported file extension. Use .yaml/.yml or .json.")
+
+    meta = model.metadata
+    services = (
+        {"id": sid}
+        if meta is None
+        else {
+            "id": sid,
+            **({"name": meta.names[sid]} if sid in meta.names else {}),
+            **({"metadata": dict(meta.services[sid])} if sid in meta.services else {}),
+        }
+        for sid in model.ids
+    )
+    dependencies = (
+        {
+            "src": dep.src,
+            "dst": dep.dst,
+            "dep_type": dep.dep_type.value,
+            "call_type": dep.call_type.value,
+            **({"metadata": dict(dep.metadata)} if dep.metadata else {}),
+        }
+        for dep in model.dependencies()
+    )
+    with p.open("w", encoding="utf-8") as out:
+        if suffix == ".json":
+            out.write("{")
+            for i, (section, records) in enumerate(
+                (("services", services), ("dependencies", dependencies))
+            ):
+                out.write(f'{", " if i else ""}"{section}": [')
+                for j, record in enumerate(records):
+                    out.write(("\n  " if j == 0 else ",\n  ") + json.dumps(record))
+                out.write("\n]")
+            out.write("}\n")
+        else:
+            for section, records in (("services", services), ("dependencies", dependencies)):
+                out.write(f"{section}:")
+                empty = True
+                for record in records:
+                    out.write("\n  - " + json.dumps(record))
+                    empty = False
+                out.write(" []\n" if empty else "\n")
+
+
+def _service_fields(
+    i: int, item: Any, section: str = "services"
+) -> tuple[str, str | None, dict[str, Any] | None]:
+    """Validate one raw ``services`` record and return its ``ServiceSpec`` fields."""
+    if not isinstance(item, dict):
+        raise ManifestError(f"{section}[{i}] must be an object/dict.")
+    sid = item.get("id")
+    if not isinstance(sid, str) or not sid.strip():
+        raise ManifestError(f"{section}[{i}].id must be a non-empty string.")
+    return (
+        sid,
+        item.get("name") if isinstance(item.get("name"), str) else None,
+        item.get("metadata") if isinstance(item.get("metadata"), dict) else None,
+    )
+
+
+def _dependency_fields(
+    i: int, item: Any, section: str = "dependencies"
+) -> tuple[str, str, str, str, dict[str, Any] | None]:
+    """Validate one raw ``dependencies`` record and return its ``DependencySpec`` fields."""
+    src, dst = _edge_fields(i, item, section)
+
+    dep_type = item.get("dep_type", "hard")
+    call_type = item.get("call_type", "sync")
+
+    if not isinstance(dep_type, str):
+        raise ManifestError(f"{section}[{i}].dep_type must be a string.")
+    if not isinstance(call_type, str):
+        raise ManifestError(f"{section}[{i}].call_type must be a string.")
+
+    return (
+        src,
+        dst,
+        dep_type,
+        call_type,
+        item.get("metadata") if isinstance(item.get("metadata"), dict) else None,
+    )
+
+
+def _edge_fields(i: int, item: Any, section: str) -> tuple[str, str]:
+    if not isinstance(item, dict):
+        raise ManifestError(f"{section}[{i}] must be an object/dict.")
+    src = item.get("src")
+    dst = item.get("dst")
+    if not isinstance(src, str) or not src.strip():
+        raise ManifestError(f"{section}[{i}].src must be a non-empty string.")
+    if not isinstance(dst, str) or not dst.strip():
+        raise ManifestError(f"{section}[{i}].dst must be a non-empty string.")
+    return src, dst
+
+
 def _read_yaml_or_json(path: Path) -> Any:
     suffix = path.suffix.lower()
     text = path.read_text(encoding="utf-8")
 
     if suffix in {".yaml", ".yml"}:
+        import yaml  # type: ignore  # deferred: JSON-only runs never load PyYAML
+
         return yaml.safe_load(text)
     if suffix == ".json":
         return json.loads(text)
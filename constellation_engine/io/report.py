@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import csv
+import json
+from typing import Any, Iterable, Mapping, Sequence, TextIO
+
+# Machine-readable output formats; the CLI's default "text" format is written by the CLI.
+FORMATS = ("jsonl", "csv", "json")
+
+
+def write_rows(
+    rows: Iterable[Mapping[str, Any]],
+    fields: Sequence[str],
+    fmt: str,
+    out: TextIO,
+) -> int:
+    """
+    Write result rows to ``out`` one at a time as they are produced.
+
+    ``jsonl`` writes one object per line, ``csv`` a header of ``fields`` and one line
+    per row, and ``json`` a single array whose elements are written incrementally,
+    so no format holds more than one row in memory. Returns the number of rows.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown output format {fmt!r}; expected one of {', '.join(FORMATS)}")
+    n = 0
+    if fmt == "csv":
+        writer = csv.DictWriter(out, fieldnames=fields, lineterminator="\n")
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            n += 1
+    elif fmt == "jsonl":
+        for row in rows:
+            out.write(json.dumps(row) + "\n")
+            n += 1
+    else:
+        out.write("[")
+        for row in rows:
+            out.write(("\n  " if n == 0 else ",\n  ") + json.dumps(row))
+            n += 1
+        out.write("\n]\n" if n else "]\n")
+    return n
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import glob
+from pathlib import Path
+
+MANIFEST_SUFFIXES = (".yaml", ".yml", ".json")
+EDGELIST_SUFFIX = ".cedges"
+
+
+def is_edgelist(path: str | Path) -> bool:
+    """Whether ``path`` names a binary edge list (by its ``.cedges`` suffix)."""
+    return Path(path).suffix.lower() == EDGELIST_SUFFIX
+
+
+def is_federated(spec: str | Path) -> bool:
+    """True if ``spec`` names a directory or glob of manifests rather than one file.
+
+    An existing file is never a glob, even if its name holds ``*``, ``?`` or ``[``.
+    """
+    p = Path(spec)
+    return p.is_dir() or (not p.exists() and glob.has_magic(str(spec)))
+
+
+def expand_sources(spec: str | Path) -> list[Path]:
+    """
+    Manifest files named by ``spec``, in sorted order.
+
+    A directory contributes every ``.yaml``/``.yml``/``.json`` file below it; a glob
+    (``teams/*/service.yaml``, ``teams/**/*.json``) its matches; anything else, including
+    an existing file whose name looks like a glob, is taken as a single file.
+    """
+    p = Path(spec)
+    if p.is_dir():
+        paths = [f for f in p.rglob("*") if f.suffix.lower() in MANIFEST_SUFFIXES]
+    elif is_federated(spec):
+        paths = [Path(f) for f in glob.glob(str(spec), recursive=True)]
+    else:
+        return [p]
+    paths = sorted(f for f in paths if f.is_file())
+    if not paths:
+        raise FileNotFoundError(f"No manifest files match {spec}")
+    return paths
@@ -0,0 +1,277 @@
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import replace
+from pathlib import Path
+from typing import IO, Any, Iterator
+
+from constellation_engine.core.compact import CompactBuilder, CompactModel, MetadataStore
+from constellation_engine.core.metrics import note, stage
+from constellation_engine.core.types import (
+    CallType,
+    Dependency,
+    DependencyType,
+    Service,
+    ServiceId,
+)
+
+from .loaders import ManifestError, _dependency_fields, _service_fields
+from .sources import is_edgelist
+
+_SECTIONS = ("services", "dependencies")
+_WHITESPACE = re.compile(r"[ \t\r\n]*")
+
+
+def iter_manifest(path: str | Path) -> Iterator[Service | Dependency]:
+    """
+    Stream domain objects out of a manifest without materializing the document.
+
+    Each ``services``/``dependencies`` record is parsed, validated and converted on
+    its own, so memory stays bounded by the largest record rather than the file.
+    Validation raises the same ``ManifestError`` messages as ``load_manifest``;
+    when a manifest has several problems, the first one encountered in file order
+    is reported.
+    """
+    for section, i, item in _records(path):
+        if section == "services":
+            sid, name, metadata = _service_fields(i, item)
+            yield Service(id=ServiceId(sid), name=name, metadata=metadata)
+        else:
+            src, dst, dep_type, call_type, metadata = _dependency_fields(i, item)
+            yield Dependency(
+                src=ServiceId(src),
+                dst=ServiceId(dst),
+                dep_type=DependencyType(dep_type),
+                call_type=CallType(call_type),
+                metadata=metadata,
+            )
+
+
+def load_domain(path: str | Path) -> tuple[list[Service], list[Dependency]]:
+    """Streaming equivalent of ``manifest_to_domain(load_manifest(path))``.
+
+    A binary edge list is read whole and converted, unvalidated like a manifest."""
+    if is_edgelist(path):
+        from .edgelist import load_edgelist  # deferred: manifests never need it
+
+        model = load_edgelist(path, validate=False)
+        return list(model.services()), list(model.dependencies())
+    services: list[Service] = []
+    dependencies: list[Dependency] = []
+    for obj in iter_manifest(path):
+        if isinstance(obj, Service):
+            services.append(obj)
+        else:
+            dependencies.append(obj)
+    return services, dependencies
+
+
+def load_compact(
+    path: str | Path,
+    *,
+    metadata: bool = False,
+    max_errors: int | None = None,
+    fail_fast: bool = False,
+) -> CompactModel:
+    """
+    Stream a manifest straight into a validated ``CompactModel``.
+
+    No ``Service``/``Dependency`` objects are created: IDs are interned and edge
+    types packed as records arrive. Names and metadata are dropped unless
+    ``metadata`` is True. Raises ``ManifestError`` like ``iter_manifest`` and
+    ``ValidationError`` like ``validate_or_raise``.
+
+    A binary edge list (``.cedges``) is memory-mapped by ``load_edgelist`` instead;
+    it carries no names or metadata.
+    """
+    if is_edgelist(path):
+        from .edgelist import load_edgelist  # deferred: manifests never need it
+
+        model = load_edgelist(path, max_errors=max_errors, fail_fast=fail_fast)
+        return replace(model, metadata=MetadataStore()) if metadata else model
+    builder = CompactBuilder(metadata=metadata)
+    with stage("load"):
+        for section, i, item in _records(path):
+            if section == "services":
+                builder.add_service(*_service_fields(i, item))
+            else:
+                builder.add_dependency(*_dependency_fields(i, item))
+        note(nodes=builder.num_services, edges=builder.num_dependencies)
+    with stage("validate"):
+        return builder.build(max_errors=max_errors, fail_fast=fail_fast)
+
+
+def _records(path: str | Path) -> Iterator[tuple[str, int, Any]]:
+    p = Path(path)
+    if not p.exists():
+        raise FileNotFoundError(str(p))
+
+    suffix = p.suffix.lower()
+    if suffix in {".yaml", ".yml"}:
+        events = _yaml_records
+    elif suffix == ".json":
+        events = _json_records
+    else:
+        raise ManifestError("Unsupported file extension. Use .yaml/.yml or .json.")
+
+    seen: set[str] = set()
+    with p.open("r", encoding="utf-8") as fh:
+        yield from events(fh, seen)
+
+    for section in _SECTIONS:
+        if section not in seen:
+            raise ManifestError(f"'{section}' must be a list.")
+
+
+def _json_records(fh: IO[str], seen: set[str]) -> Iterator[tuple[str, int, Any]]:
+    cur = _JsonCursor(fh)
+    if cur.peek() != "{":
+        cur.value()  # surfaces JSONDecodeError for malformed input
+        raise ManifestError("Manifest root must be an object/dict.")
+    cur.advance()
+
+    if cur.peek() == "}":
+        cur.advance()
+        cur.end()
+        return
+    while True:
+        key = cur.value()
+        cur.expect(":")
+        if key in _SECTIONS:
+            _first(key, seen)
+            if cur.peek() != "[":
+                cur.value()
+                raise ManifestError(f"'{key}' must be a list.")
+            seen.add(key)
+            cur.advance()
+            i = 0
+            if cur.peek() != "]":
+                while True:
+                    yield key, i, cur.value()
+                    i += 1
+                    if cur.expect(",]") == "]":
+                        break
+            else:
+                cur.advance()
+        else:
+            cur.value()
+        if cur.expect(",}") == "}":
+            cur.end()  # like json.loads, nothing may follow the root object
+            return
+
+
+class _JsonCursor:
+    """Incremental reader that decodes one JSON value at a time from a text stream."""
+
+    def __init__(self, fh: IO[str], chunk_size: int = 1 << 16) -> None:
+        self._fh = fh
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        chunk = self._fh.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buf = self._buf[self._pos :] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character, or ``""`` at end of input."""
+        while True:
+            self._pos = _WHITESPACE.match(self._buf, self._pos).end()  # type: ignore[union-attr]
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ""
+
+    def advance(self) -> None:
+        self._pos += 1
+
+    def expect(self, allowed: str) -> str:
+        ch = self.peek()
+        if not ch or ch not in allowed:
+            raise json.JSONDecodeError(f"Expecting one of {allowed!r}", self._buf, self._pos)
+        self._pos += 1
+        return ch
+
+    def end(self) -> None:
+        """Raise ``JSONDecodeError`` unless only whitespace is left."""
+        if self.peek() != "":
+            raise json.JSONDecodeError("Extra data", self._buf, self._pos)
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                obj, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A number that ends exactly at the buffer edge may continue in the next chunk.
+            if end == len(self._buf) and self._fill():
+                continue
+            self._pos = end
+            return obj
+
+
+def _yaml_records(fh: IO[str], seen: set[str]) -> Iterator[tuple[str, int, Any]]:
+    import yaml  # type: ignore  # deferred: JSON-only runs never load PyYAML
+
+    loader = yaml.SafeLoader(fh)
+    try:
+        loader.get_event()  # StreamStart
+        if loader.check_event(yaml.StreamEndEvent):
+            raise ManifestError("Manifest root must be an object/dict.")
+        loader.get_event()  # DocumentStart
+        if not loader.check_event(yaml.MappingStartEvent):
+            loader.compose_node(None, None)
+            raise ManifestError("Manifest root must be an object/dict.")
+        loader.get_event()
+
+        while not loader.check_event(yaml.MappingEndEvent):
+            key = _construct(loader, loader.compose_node(None, None))
+            if key not in _SECTIONS:
+                loader.compose_node(None, None)
+                continue
+            _first(key, seen)
+            if not loader.check_event(yaml.SequenceStartEvent):
+                loader.compose_node(None, None)
+                raise ManifestError(f"'{key}' must be a list.")
+            seen.add(key)
+            loader.get_event()
+            i = 0
+            while not loader.check_event(yaml.SequenceEndEvent):
+                yield key, i, _construct(loader, loader.compose_node(None, None))
+                i += 1
+            loader.get_event()
+        loader.get_event()  # MappingEnd
+        loader.get_event()  # DocumentEnd
+        # like yaml.safe_load, nothing may follow the root document
+        if not loader.check_event(yaml.StreamEndEvent):
+            raise ManifestError("Manifest must be a single YAML document.")
+    finally:
+        loader.dispose()
+
+
+def _first(section: str, seen: set[str]) -> None:
+    # The whole-document loaders keep only the last of a repeated key; records already
+    # streamed from the first one cannot be taken back, so a repeat is an error.
+    if section in seen:
+        raise ManifestError(f"'{section}' appears more than once.")
+
+
+def _construct(loader: Any, node: Any) -> Any:
+    obj = loader.construct_object(node, deep=True)
+    # The constructor memoizes every node of the document; drop it per record.
+    loader.constructed_objects = {}
+    loader.recursive_objects = {}
+    return obj
@@ -0,0 +1,414 @@
+from __future__ import annotations
+
+import struct
+from array import array
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterable, NamedTuple, Sequence
+
+from constellation_engine.core.compact import (
+    _CALL_CODE,
+    _DEP_CODE,
+    CALL_TYPES,
+    DEP_TYPES,
+    CompactModel,
+    compact_model,
+)
+from constellation_engine.core.metrics import count_edges, is_measuring
+from constellation_engine.core.types import ServiceId
+from constellation_engine.core.validate import ValidatedModel
+from constellation_engine.sim.models import FailureType
+from constellation_engine.sim.propagate import _should_propagate
+
+if TYPE_CHECKING:
+    import networkx as nx
+
+
+@dataclass(frozen=True, slots=True, weakref_slot=True)
+class CompiledGraph:
+    """Reverse-adjacency (CSR) form of a dependency graph with integer node indices.
+
+    The dependers of node ``v`` are ``indices[indptr[v]:indptr[v + 1]]``, in the same
+    order networkx reports them from ``in_edges``. ``masks[failure][k]`` is 1 when edge
+    ``k`` carries ``failure`` under the propagation rules.
+    """
+
+    ids: tuple[ServiceId, ...]
+    index: dict[ServiceId, int]
+    indptr: Sequence[int]
+    indices: Sequence[int]
+    dep_codes: Sequence[int]
+    call_codes: Sequence[int]
+    masks: dict[FailureType, Sequence[int]]
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.ids)
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.indices)
+
+
+def compile_graph(graph: nx.DiGraph) -> CompiledGraph:
+    """Compile a graph from ``core.graph.build_graph`` into a ``CompiledGraph``."""
+    ids: tuple[ServiceId, ...] = tuple(graph.nodes)
+    index = {sid: i for i, sid in enumerate(ids)}
+
+    indptr = array("q", [0])
+    indices = array("q")
+    dep_codes = array("B")
+    call_codes = array("B")
+
+    pred = graph.pred
+    for sid in ids:
+        for depender, attrs in pred[sid].items():
+            indices.append(index[depender])
+            dep_codes.append(_DEP_CODE[attrs["dep_type"]])
+            call_codes.append(_CALL_CODE[attrs["call_type"]])
+        indptr.append(len(indices))
+
+    return compiled_from_arrays(ids, indptr, indices, dep_codes, call_codes)
+
+
+def compile_model(model: ValidatedModel | CompactModel) -> CompiledGraph:
+    """Compile a validated model without building a networkx graph.
+
+    The result equals ``compile_graph(build_graph(model))``: nodes in service order,
+    dependers in first-seen order, and a repeated edge keeps its first position but
+    takes the last listed types.
+    """
+    if isinstance(model, ValidatedModel):
+        model = compact_model(model, metadata=False)
+
+    # Bucket edge positions by destination (a stable counting sort), so no per-node
+    # containers are needed; repeated edges are then merged within each bucket.
+    n = model.num_services
+    src, dst = model.src, model.dst
+    starts = array("q", bytes(8 * (n + 1)))
+    for d in dst:
+        starts[d + 1] += 1
+    for v in range(n):
+        starts[v + 1] += starts[v]
+    fill = array("q", starts)
+    order = array("q", bytes(8 * len(dst)))
+    for k, d in enumerate(dst):
+        order[fill[d]] = k
+        fill[d] += 1
+
+    indptr = array("q", [0])
+    indices = array("q")
+    dep_codes = array("B")
+    call_codes = array("B")
+    for v in range(n):
+        lo, hi = starts[v], starts[v + 1]
+        if hi - lo > 1:
+            slot: dict[int, int] = {}
+            for k in order[lo:hi]:
+                at = slot.get(src[k])
+                if at is None:
+                    slot[src[k]] = len(indices)
+                    indices.append(src[k])
+                    dep_codes.append(model.dep_codes[k])
+                    call_codes.append(model.call_codes[k])
+                else:
+                    dep_codes[at] = model.dep_codes[k]
+                    call_codes[at] = model.call_codes[k]
+        elif hi > lo:
+            k = order[lo]
+            indices.append(src[k])
+            dep_codes.append(model.dep_codes[k])
+            call_codes.append(model.call_codes[k])
+        indptr.append(len(indices))
+
+    return compiled_from_arrays(model.ids, indptr, indices, dep_codes, call_codes)
+
+
+def compiled_from_arrays(
+    ids: Sequence[ServiceId],
+    indptr: Sequence[int],
+    indices: Sequence[int],
+    dep_codes: Sequence[int],
+    call_codes: Sequence[int],
+) -> CompiledGraph:
+    """Assemble a ``CompiledGraph`` from raw CSR arrays, deriving the edge masks."""
+    ids = tuple(ids)
+    return CompiledGraph(
+        ids=ids,
+        index={sid: i for i, sid in enumerate(ids)},
+        indptr=indptr,
+        indices=indices,
+        dep_codes=dep_codes,
+        call_codes=call_codes,
+        masks={f: _edge_mask(f, dep_codes, call_codes) for f in FailureType},
+    )
+
+
+def subgraph(
+    compiled: CompiledGraph,
+    *,
+    nodes: Iterable[int] | None = None,
+    edges: Sequence[int] | None = None,
+) -> CompiledGraph:
+    """The part of ``compiled`` spanned by ``nodes`` and ``edges``.
+
+    ``nodes`` are node indices to keep (all of them if None), renumbered in their
+    original order. ``edges`` is a 0/1 flag per edge (as from ``edge_selection``); an
+    edge is kept if it is flagged, or ``edges`` is None, and both its ends are kept.
+    """
+    kept: Sequence[int]
+    renumber: Sequence[int]
+    if nodes is None:
+        kept = renumber = range(compiled.num_nodes)
+    else:
+        kept = sorted(set(nodes))
+        remap = array("q", [-1]) * compiled.num_nodes
+        for new, v in enumerate(kept):
+            remap[v] = new
+        renumber = remap
+
+    indptr = array("q", [0])
+    indices = array("q")
+    dep_codes = array("B")
+    call_codes = array("B")
+    old_indptr, old_indices = compiled.indptr, compiled.indices
+    for v in kept:
+        for k in range(old_indptr[v], old_indptr[v + 1]):
+            u = renumber[old_indices[k]]
+            if u >= 0 and (edges is None or edges[k]):
+                indices.append(u)
+                dep_codes.append(compiled.dep_codes[k])
+                call_codes.append(compiled.call_codes[k])
+        indptr.append(len(indices))
+
+    ids = compiled.ids
+    return compiled_from_arrays([ids[v] for v in kept], indptr, indices, dep_codes, call_codes)
+
+
+def edge_selection(
+    compiled: CompiledGraph, pairs: Iterable[tuple[ServiceId, ServiceId]]
+) -> bytearray:
+    """A 0/1 flag per edge of ``compiled``, set for each dependency ``(src, dst)``.
+
+    Pairs that are not dependencies of ``compiled`` are ignored.
+    """
+    index = compiled.index
+    indptr = compiled.indptr
+    indices = compiled.indices
+    flags = bytearray(compiled.num_edges)
+    for src, dst in pairs:
+        u, v = index.get(src), index.get(dst)
+        if u is None or v is None:
+            continue
+        for k in range(indptr[v], indptr[v + 1]):
+            if indices[k] == u:
+                flags[k] = 1
+    return flags
+
+
+def packed_size(compiled: CompiledGraph) -> int:
+    """Number of bytes ``pack_into`` writes for ``compiled``."""
+    return _layout(compiled.num_nodes, compiled.num_edges, len(_id_blob(compiled)[0])).end
+
+
+def pack_into(compiled: CompiledGraph, buf: memoryview) -> None:
+    """Write ``compiled`` into ``buf`` using the flat binary layout read by ``unpack``.
+
+    The layout is a fixed header followed by 8-byte aligned sections: ``indptr``,
+    ``indices`` and id offsets as int64, then edge codes and per-FailureType masks as
+    bytes, then the UTF-8 id blob. It is used for shared memory and on-disk caches.
+    """
+    n, e = compiled.num_nodes, compiled.num_edges
+    blob, offsets = _id_blob(compiled)
+    at = _layout(n, e, len(blob))
+
+    struct.pack_into(_HEADER, buf, 0, _MAGIC, n, e, len(blob))
+    buf[at.indptr : at.indices] = array("q", compiled.indptr).tobytes()
+    buf[at.indices : at.offsets] = array("q", compiled.indices).tobytes()
+    buf[at.offsets : at.dep] = offsets.tobytes()
+    buf[at.dep : at.call] = bytes(compiled.dep_codes)
+    buf[at.call : at.masks] = bytes(compiled.call_codes)
+    for i, failure in enumerate(FailureType):
+        buf[at.masks + i * e : at.masks + (i + 1) * e] = bytes(compiled.masks[failure])
+    buf[at.blob : at.end] = blob
+
+
+def unpack(buf: memoryview) -> CompiledGraph:
+    """Read a graph written by ``pack_into``.
+
+    Numeric arrays and masks are zero-copy views into ``buf``, so the caller must keep
+    the underlying buffer alive for as long as the returned graph is used.
+    """
+    magic, n, e, blob_len = struct.unpack_from(_HEADER, buf, 0)
+    if magic != _MAGIC:
+        raise ValueError("Buffer does not contain a compiled graph.")
+    at = _layout(n, e, blob_len)
+
+    offsets = buf[at.offsets : at.dep].cast("q")
+    blob = bytes(buf[at.blob : at.end])
+    ids = tuple(
+        ServiceId(blob[offsets[i] : offsets[i + 1]].decode("utf-8")) for i in range(n)
+    )
+
+    return CompiledGraph(
+        ids=ids,
+        index={sid: i for i, sid in enumerate(ids)},
+        indptr=buf[at.indptr : at.indices].cast("q"),
+        indices=buf[at.indices : at.offsets].cast("q"),
+        dep_codes=buf[at.dep : at.call],
+        call_codes=buf[at.call : at.masks],
+        masks={
+            f: buf[at.masks + i * e : at.masks + (i + 1) * e] for i, f in enumerate(FailureType)
+        },
+    )
+
+
+def as_compiled(
+    graph: nx.DiGraph | CompiledGraph | ValidatedModel | CompactModel,
+) -> CompiledGraph:
+    """Return ``graph`` unchanged if already compiled, otherwise compile it."""
+    if isinstance(graph, CompiledGraph):
+        return graph
+    if isinstance(graph, (ValidatedModel, CompactModel)):
+        return compile_model(graph)
+    return compile_graph(graph)
+
+
+def out_degrees(compiled: CompiledGraph) -> list[int]:
+    """Number of dependencies of every node, in node-index order."""
+    degrees = [0] * compiled.num_nodes
+    for depender in compiled.indices:
+        degrees[depender] += 1
+    return degrees
+
+
+def propagate_compiled(
+    compiled: CompiledGraph,
+    *,
+    start: ServiceId,
+    failure: FailureType,
+) -> dict[ServiceId, FailureType]:
+    """
+    Array-backed equivalent of ``propagate_failure``.
+
+    Returns the same mapping, in the same breadth-first order.
+    """
+    return propagate_compiled_failures(compiled, starts=[start], failure=failure)
+
+
+def propagate_compiled_failures(
+    compiled: CompiledGraph,
+    *,
+    starts: Iterable[ServiceId],
+    failure: FailureType,
+) -> dict[ServiceId, FailureType]:
+    """Array-backed equivalent of ``propagate_failures`` (several failed services)."""
+    index = compiled.index
+    ids = compiled.ids
+
+    impacted: dict[ServiceId, FailureType] = dict.fromkeys(starts, failure)
+    # Services missing from the graph are reported as failed but cannot spread.
+    sources = [index[sid] for sid in impacted if sid in index]
+    for i in bfs_order(compiled, sources, failure):
+        impacted[ids[i]] = failure
+    return impacted
+
+
+def bfs_order(
+    compiled: CompiledGraph,
+    sources: Iterable[int],
+    failure: FailureType,
+    *,
+    parents: array[int] | None = None,
+    limit: int | None = None,
+) -> list[int]:
+    """Breadth-first visit order (sources first) of nodes impacted by ``failure``.
+
+    The returned list doubles as the BFS queue, so no separate queue is allocated.
+    ``parents``, one entry per node, receives the edge position each visited node
+    was first reached over (-1 for a source); entries of unvisited nodes are left
+    as they were. The search stops once ``limit`` nodes are visited, for callers
+    that know the result is no larger.
+    """
+    indptr = compiled.indptr
+    indices = compiled.indices
+    mask = compiled.masks[failure]
+    seen = bytearray(compiled.num_nodes)
+    stop = len(indptr) if limit is None else limit  # more than every node if unset
+
+    order: list[int] = []
+    for s in sources:
+        if not seen[s]:
+            seen[s] = 1
+            order.append(s)
+            if parents is not None:
+                parents[s] = -1
+
+    head = 0
+    while head < len(order) < stop:
+        v = order[head]
+        head += 1
+        for k in range(indptr[v], indptr[v + 1]):
+            if mask[k]:
+                u = indices[k]
+                if not seen[u]:
+                    seen[u] = 1
+                    order.append(u)
+                    if parents is not None:
+                        parents[u] = k
+
+    if is_measuring():
+        count_edges(sum(indptr[v + 1] - indptr[v] for v in order[:head]))
+    return order
+
+
+def _edge_mask(
+    failure: FailureType,
+    dep_codes: Sequence[int],
+    call_codes: Sequence[int],
+) -> bytes:
+    width = len(CALL_TYPES)
+    table = bytes(
+        _should_propagate(failure=failure, dep_type=d, call_type=c)
+        for d in DEP_TYPES
+        for c in CALL_TYPES
+    )
+    return bytes(table[d * width + c] for d, c in zip(dep_codes, call_codes))
+
+
+_MAGIC = b"CEGRAPH1"
+_HEADER = "<8sqqq"
+
+
+def _id_blob(compiled: CompiledGraph) -> tuple[bytes, array[int]]:
+    encoded = [sid.encode("utf-8") for sid in compiled.ids]
+    offsets = array("q", [0])
+    for raw in encoded:
+        offsets.append(offsets[-1] + len(raw))
+    return b"".join(encoded), offsets
+
+
+class _Layout(NamedTuple):
+    indptr: int
+    indices: int
+    offsets: int
+    dep: int
+    call: int
+    masks: int
+    blob: int
+    end: int
+
+
+def _layout(n: int, e: int, blob_len: int) -> _Layout:
+    def align(x: int) -> int:
+        return (x + 7) & ~7
+
+    indptr_at = align(struct.calcsize(_HEADER))
+    indices_at = indptr_at + 8 * (n + 1)
+    offsets_at = indices_at + 8 * e
+    dep_at = offsets_at + 8 * (n + 1)
+    call_at = dep_at + e
+    masks_at = call_at + e
+    blob_at = align(masks_at + len(FailureType) * e)
+    return _Layout(
+        indptr_at, indices_at, offsets_at, dep_at, call_at, masks_at, blob_at, blob_at + blob_len
+    )
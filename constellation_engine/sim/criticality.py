@@ -1,30 +1,159 @@
 from __future__ import annotations
 
-import networkx as nx
+import heapq
+from typing import TYPE_CHECKING, Iterable, Iterator
 
+from constellation_engine.core.compact import CompactModel
 from constellation_engine.core.types import ServiceId
+from constellation_engine.core.validate import ValidatedModel
+from constellation_engine.sim.compiled import CompiledGraph, as_compiled, bfs_order
 from constellation_engine.sim.models import FailureType
-from constellation_engine.sim.propagate import propagate_failure
+from constellation_engine.sim.reachability import reachability_counts, top_counts
+from constellation_engine.sim.sketch import DEFAULT_PRECISION, approximate_counts
+
+if TYPE_CHECKING:
+    import networkx as nx
+
+# Selections of at most one service in this many are scored by per-service BFS.
+_SCOPED_RATIO = 64
 
 
 def compute_criticality(
-    graph: nx.DiGraph,
+    graph: nx.DiGraph | CompiledGraph | ValidatedModel | CompactModel,
     *,
     failure: FailureType = FailureType.DOWN,
+    workers: int = 1,
+    approximate: bool = False,
+    precision: int = DEFAULT_PRECISION,
+    top_k: int | None = None,
+    services: Iterable[ServiceId] | None = None,
 ) -> dict[ServiceId, int]:
     """
     Compute criticality for each service as the size of its blast radius.
 
     Criticality score = number of impacted services (including itself).
+    Scores for all services come from one pass over the SCC-condensed graph
+    (see ``sim.reachability``) instead of a separate search per service.
+
+    With ``workers > 1`` the start nodes are instead sharded across a process pool
+    attached to one shared-memory copy of the compiled graph (see ``sim.parallel``);
+    each worker runs a bounded-memory BFS per start and the scores are identical.
+
+    With ``approximate=True`` scores are estimated from mergeable cardinality sketches
+    of ``2**precision`` registers (see ``sim.sketch``), which bounds memory per
+    component; ``sim.sketch.relative_error(precision)`` is the standard error.
+
+    With ``top_k`` only the ``top_k`` most critical services are returned, most
+    critical first with ties broken by service ID: the same entries, in the same order,
+    as ``top_critical`` over the full scores. Cheap bounds on the condensed graph skip
+    services that cannot make the cut (see ``sim.reachability.top_counts``).
+
+    With ``services`` only those services are scored (their blast radius still spans
+    the whole graph). A small selection is scored by one BFS per service instead of
+    the full pass, so scoping an analysis to a few services costs only their radii.
+    """
+    scores = iter_criticality(
+        graph,
+        failure=failure,
+        workers=workers,
+        approximate=approximate,
+        precision=precision,
+        top_k=top_k,
+        services=services,
+    )
+    if top_k is not None:
+        return dict(top_critical(scores, top_k))
+    return dict(scores)
+
+
+def iter_criticality(
+    graph: nx.DiGraph | CompiledGraph | ValidatedModel | CompactModel,
+    *,
+    failure: FailureType = FailureType.DOWN,
+    workers: int = 1,
+    approximate: bool = False,
+    precision: int = DEFAULT_PRECISION,
+    top_k: int | None = None,
+    services: Iterable[ServiceId] | None = None,
+) -> Iterator[tuple[ServiceId, int]]:
     """
-    scores: dict[ServiceId, int] = {}
+    ``(service, score)`` pairs of ``compute_criticality``, in node-index order.
 
-    for node in graph.nodes:
-        impacted = propagate_failure(
-            graph,
-            start=node,
-            failure=failure,
+    Scores are computed before this returns; the pairs are produced lazily, so callers
+    that only rank or stream them never hold a second per-service mapping. With
+    ``top_k`` only a subset of services is scored, one that ``top_critical(pairs,
+    top_k)`` ranks exactly as it would rank every score. With ``services`` only those
+    are scored, in node-index order.
+
+    Raises:
+        ValueError: If ``services`` names a service that is not in the graph.
+    """
+    compiled = as_compiled(graph)
+    if services is not None:
+        return _scoped(compiled, services, failure, workers, approximate, precision)
+    if top_k is not None:
+        if approximate or workers > 1:
+            raise ValueError("top_k cannot be combined with approximate or workers.")
+        ids = compiled.ids
+        return ((ids[v], n) for v, n in sorted(top_counts(compiled, failure, top_k).items()))
+    if approximate:
+        if workers > 1:
+            raise ValueError("Approximate criticality runs in a single process.")
+        counts = approximate_counts(compiled, failure, precision=precision)
+    elif workers > 1:
+        from constellation_engine.sim.parallel import parallel_blast_radius_sizes
+
+        counts = parallel_blast_radius_sizes(compiled, failure, workers=workers)
+    else:
+        counts = reachability_counts(compiled, failure)
+    return zip(compiled.ids, counts)
+
+
+def _scoped(
+    compiled: CompiledGraph,
+    services: Iterable[ServiceId],
+    failure: FailureType,
+    workers: int,
+    approximate: bool,
+    precision: int,
+) -> Iterator[tuple[ServiceId, int]]:
+    index = compiled.index
+    wanted = set(services)
+    unknown = sorted(sid for sid in wanted if sid not in index)
+    if unknown:
+        raise ValueError(f"Unknown services: {', '.join(unknown)}")
+    selected = sorted(index[sid] for sid in wanted)
+    ids = compiled.ids
+    # One BFS costs at most O(n + m), the full pass about O(n * components / 64) for
+    # its bitsets, so per-service searches win while the selection is that small.
+    if approximate or workers > 1 or len(selected) * _SCOPED_RATIO > compiled.num_nodes:
+        counts = list(
+            iter_criticality(
+                compiled,
+                failure=failure,
+                workers=workers,
+                approximate=approximate,
+                precision=precision,
+            )
         )
-        scores[node] = len(impacted)
+        return iter([counts[v] for v in selected])
+    return iter([(ids[v], len(bfs_order(compiled, [v], failure))) for v in selected])
+
+
+def top_critical(
+    scores: Iterable[tuple[ServiceId, int]], k: int | None = None
+) -> list[tuple[ServiceId, int]]:
+    """
+    The ``k`` highest-scoring ``(service, score)`` pairs, most critical first.
+
+    Ties are broken by service ID, so the ranking does not depend on manifest order.
+    A top-k keeps a bounded heap of ``k`` entries instead of sorting every score;
+    ``k=None`` ranks all of them.
+    """
+    if k is None:
+        return sorted(scores, key=_rank_key)
+    return heapq.nsmallest(k, scores, key=_rank_key)
+
 
-    return scores
\ No newline at end of file
+def _rank_key(item: tuple[ServiceId, int]) -> tuple[int, ServiceId]:
+    return -item[1], item[0]
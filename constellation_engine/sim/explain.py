@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterable
+
+from constellation_engine.core.compact import CALL_TYPES, DEP_TYPES, CompactModel
+from constellation_engine.core.types import CallType, DependencyType, ServiceId
+from constellation_engine.core.validate import ValidatedModel
+from constellation_engine.sim.compiled import CompiledGraph, as_compiled, bfs_order
+from constellation_engine.sim.models import FailureType
+
+if TYPE_CHECKING:
+    import networkx as nx
+
+_UNSEEN = -2
+_SOURCE = -1  # bfs_order's parent entry for a source
+
+
+@dataclass(frozen=True, slots=True)
+class ImpactStep:
+    """One edge a failure spread over: ``depender`` depends on the failed ``dependency``."""
+
+    depender: ServiceId
+    dependency: ServiceId
+    dep_type: DependencyType
+    call_type: CallType
+
+
+class Propagation:
+    """
+    A blast radius together with the edge over which each service was first reached.
+
+    The edges are recorded by the propagation's own breadth-first search, one array
+    entry per impacted service, so ``explain`` follows stored pointers instead of
+    searching the graph again. Each explanation is a shortest impacting chain.
+    """
+
+    def __init__(
+        self,
+        compiled: CompiledGraph,
+        failure: FailureType,
+        starts: tuple[ServiceId, ...],
+        order: list[int],
+        via: array[int],
+    ) -> None:
+        self.compiled = compiled
+        self.failure = failure
+        self._starts = starts
+        self._order = order
+        self._via = via
+
+    @property
+    def impacted(self) -> dict[ServiceId, FailureType]:
+        """The same mapping, in the same order, as ``propagate_compiled_failures``."""
+        ids = self.compiled.ids
+        impacted = dict.fromkeys(self._starts, self.failure)
+        for i in self._order:
+            impacted[ids[i]] = self.failure
+        return impacted
+
+    def via(self, service: ServiceId) -> ImpactStep | None:
+        """The edge ``service`` was first reached over; None for a failed service.
+
+        Raises:
+            KeyError: If ``service`` is not impacted.
+        """
+        compiled = self.compiled
+        i = compiled.index.get(service)
+        if i is None or self._via[i] == _UNSEEN:
+            if service in self._starts:
+                return None  # a failed service missing from the graph
+            raise KeyError(service)
+        k = self._via[i]
+        if k == _SOURCE:
+            return None
+        dependency = bisect_right(compiled.indptr, k) - 1  # the CSR row holding edge k
+        return ImpactStep(
+            depender=service,
+            dependency=compiled.ids[dependency],
+            dep_type=DEP_TYPES[compiled.dep_codes[k]],
+            call_type=CALL_TYPES[compiled.call_codes[k]],
+        )
+
+    def explain(self, service: ServiceId) -> tuple[ImpactStep, ...]:
+        """
+        Why ``service`` is impacted: the edges from ``service`` back to a failed service.
+
+        The first step is ``service``'s own impacting dependency and the last one ends
+        at a failed service; a failed service itself has an empty explanation.
+
+        Raises:
+            KeyError: If ``service`` is not impacted.
+        """
+        steps = []
+        step = self.via(service)
+        while step is not None:
+            steps.append(step)
+            step = self.via(step.dependency)
+        return tuple(steps)
+
+
+def explain_propagation(
+    graph: nx.DiGraph | CompiledGraph | ValidatedModel | CompactModel,
+    *,
+    starts: Iterable[ServiceId],
+    failure: FailureType,
+) -> Propagation:
+    """
+    ``propagate_compiled_failures`` that also keeps a parent pointer per impacted service.
+
+    The traversal is ``bfs_order``'s, asked to fill in its ``parents`` array: one
+    store per newly reached service, recording the edge it was reached over.
+    """
+    compiled = as_compiled(graph)
+    index = compiled.index
+    via = array("q", [_UNSEEN]) * compiled.num_nodes
+
+    starts = tuple(dict.fromkeys(starts))
+    # Services missing from the graph are reported as failed but cannot spread.
+    sources = [index[sid] for sid in starts if sid in index]
+    order = bfs_order(compiled, sources, failure, parents=via)
+    return Propagation(compiled, failure, starts, order, via)
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import TYPE_CHECKING, Iterable, Mapping
+
+from constellation_engine.core.graph import apply_delta
+from constellation_engine.core.types import ManifestDelta, ServiceId
+from constellation_engine.sim.models import FailureType
+from constellation_engine.sim.propagate import _should_propagate, propagate_failure
+
+if TYPE_CHECKING:
+    import networkx as nx
+
+
+def update_criticality(
+    graph: nx.DiGraph,
+    scores: Mapping[ServiceId, int],
+    delta: ManifestDelta,
+    *,
+    failure: FailureType = FailureType.DOWN,
+) -> dict[ServiceId, int]:
+    """
+    Apply ``delta`` to ``graph`` in place and return updated criticality scores.
+
+    ``scores`` must be the ``compute_criticality`` result for ``graph`` before the
+    delta. A start service's blast radius can only change if it contains the
+    destination of a changed edge, i.e. if that destination depends on the start
+    service through edges that carry ``failure``. Only those services (found on the
+    old graph for removed edges and on the new graph for added ones) and newly added
+    services are recomputed; every other score is reused.
+    """
+    removed_edges = [(u, v) for u, v in delta.remove_dependencies]
+    for sid in delta.remove_services:
+        removed_edges.extend(graph.in_edges(sid))
+        removed_edges.extend(graph.out_edges(sid))
+    # Re-typed edges count as removed (old type) and added (new type).
+    removed_edges.extend(
+        (d.src, d.dst) for d in delta.add_dependencies if graph.has_edge(d.src, d.dst)
+    )
+
+    affected = _starts_reaching(graph, _carrying(graph, removed_edges, failure), failure)
+
+    apply_delta(graph, delta)
+
+    added_edges = [(d.src, d.dst) for d in delta.add_dependencies]
+    affected |= _starts_reaching(graph, _carrying(graph, added_edges, failure), failure)
+    affected.update(svc.id for svc in delta.add_services)
+
+    updated: dict[ServiceId, int] = {}
+    for node in graph.nodes:
+        if node in affected or node not in scores:
+            updated[node] = len(propagate_failure(graph, start=node, failure=failure))
+        else:
+            updated[node] = scores[node]
+    return updated
+
+
+def _carrying(
+    graph: nx.DiGraph,
+    edges: Iterable[tuple[ServiceId, ServiceId]],
+    failure: FailureType,
+) -> list[ServiceId]:
+    """Destinations of the given edges that propagate ``failure``."""
+    return [
+        dst
+        for src, dst in edges
+        if graph.has_edge(src, dst)
+        and _should_propagate(
+            failure=failure,
+            dep_type=graph.edges[src, dst]["dep_type"],
+            call_type=graph.edges[src, dst]["call_type"],
+        )
+    ]
+
+
+def _starts_reaching(
+    graph: nx.DiGraph,
+    targets: Iterable[ServiceId],
+    failure: FailureType,
+) -> set[ServiceId]:
+    """Services whose ``failure`` blast radius contains any of ``targets``.
+
+    That is every service the targets (transitively) depend on through edges
+    carrying ``failure``, found by walking dependencies forward from the targets.
+    """
+    seen: set[ServiceId] = set(targets)
+    queue: deque[ServiceId] = deque(seen)
+    while queue:
+        current = queue.popleft()
+        for _, dependency, attrs in graph.out_edges(current, data=True):
+            if dependency in seen:
+                continue
+            if _should_propagate(
+                failure=failure,
+                dep_type=attrs["dep_type"],
+                call_type=attrs["call_type"],
+            ):
+                seen.add(dependency)
+                queue.append(dependency)
+    return seen
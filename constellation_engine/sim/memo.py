@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Hashable
+
+from constellation_engine.core.compact import CALL_TYPES, DEP_TYPES
+from constellation_engine.core.types import ServiceId
+from constellation_engine.sim.compiled import CompiledGraph, bfs_order, pack_into, packed_size
+from constellation_engine.sim.models import FailureType
+from constellation_engine.sim.propagate import _should_propagate
+
+# Failure types whose propagating edges are a subset of DOWN's under the current rules;
+# their result from a start is a subset of DOWN's, so a cached DOWN result bounds it.
+_WITHIN_DOWN = frozenset(
+    f
+    for f in FailureType
+    if f is not FailureType.DOWN
+    and all(
+        _should_propagate(failure=FailureType.DOWN, dep_type=d, call_type=c)
+        for d in DEP_TYPES
+        for c in CALL_TYPES
+        if _should_propagate(failure=f, dep_type=d, call_type=c)
+    )
+)
+
+_fingerprints: dict[int, str] = {}
+_fingerprints_lock = threading.Lock()
+
+
+def graph_fingerprint(compiled: CompiledGraph) -> str:
+    """Content hash of a compiled graph, memoized for the lifetime of the object."""
+    key = id(compiled)
+    with _fingerprints_lock:
+        cached = _fingerprints.get(key)
+    if cached is not None:
+        return cached
+
+    buf = bytearray(packed_size(compiled))
+    pack_into(compiled, memoryview(buf))
+    digest = hashlib.blake2b(buf, digest_size=16).hexdigest()
+    with _fingerprints_lock:
+        _fingerprints[key] = digest
+    weakref.finalize(compiled, _fingerprints.pop, key, None)
+    return digest
+
+
+@dataclass(frozen=True, slots=True)
+class CacheStats:
+    """Counters of a ``BlastRadiusCache``."""
+
+    hits: int
+    misses: int
+    derived: int  # misses whose search was bounded by a cached DOWN result
+    evictions: int
+    size: int
+    maxsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class BlastRadiusCache:
+    """
+    LRU cache of single-service blast radii keyed by (graph fingerprint, start, failure).
+
+    Entries are never served for a graph with a different fingerprint; once a graph
+    changes, its old entries age out under the LRU bound, or ``invalidate`` drops them.
+
+    DEGRADED and LATENCY_UP spread over a subset of the edges DOWN spreads over, so their
+    result from a start is a subset of DOWN's. When the DOWN result for the same start is
+    cached, their search stops as soon as it has found as many nodes as DOWN did. This
+    saves work only when the two results are equal; otherwise every node of the result
+    is still expanded in full. Neighbours are not filtered against the DOWN result:
+    every edge that passes their mask also passes DOWN's, so no filter could reject one.
+    Safe to share between threads.
+    """
+
+    def __init__(self, maxsize: int = 4096) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self._entries: OrderedDict[tuple[Hashable, ServiceId, FailureType], tuple[int, ...]]
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = self._misses = self._derived = self._evictions = 0
+
+    def blast_radius(
+        self,
+        compiled: CompiledGraph,
+        start: ServiceId,
+        failure: FailureType,
+        *,
+        fingerprint: Hashable | None = None,
+    ) -> dict[ServiceId, FailureType]:
+        """Same result as ``propagate_compiled``, served from the cache when possible.
+
+        ``fingerprint`` identifies the graph's content; pass one the caller already has
+        (e.g. a manifest digest) to skip hashing the graph on first use.
+        """
+        if start not in compiled.index:
+            return {start: failure}  # unknown services fail alone, as in propagate_compiled
+        fp = graph_fingerprint(compiled) if fingerprint is None else fingerprint
+        key = (fp, start, failure)
+
+        with self._lock:
+            order = self._entries.get(key)
+            if order is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+            else:
+                self._misses += 1
+                down = None
+                if failure in _WITHIN_DOWN:
+                    down = self._entries.get((fp, start, FailureType.DOWN))
+                    if down is not None:
+                        self._derived += 1
+
+        if order is None:
+            s = compiled.index[start]
+            # The result is a subset of a cached DOWN result, so its size bounds the search.
+            limit = None if down is None else len(down)
+            order = tuple(bfs_order(compiled, [s], failure, limit=limit))
+            self._store(key, order)
+
+        ids = compiled.ids
+        return dict.fromkeys((ids[i] for i in order), failure)
+
+    def invalidate(self, fingerprint: Hashable | None = None) -> None:
+        """Drop the entries of one graph, or of every graph if ``fingerprint`` is None."""
+        with self._lock:
+            if fingerprint is None:
+                self._entries.clear()
+            else:
+                for key in [k for k in self._entries if k[0] == fingerprint]:
+                    del self._entries[key]
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                derived=self._derived,
+                evictions=self._evictions,
+                size=len(self._entries),
+                maxsize=self.maxsize,
+            )
+
+    def _store(self, key: tuple[Hashable, ServiceId, FailureType], order: tuple[int, ...]) -> None:
+        with self._lock:
+            self._entries[key] = order
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
@@ -1,10 +1,21 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 from enum import Enum
 
+from constellation_engine.core.types import ServiceId
+
 
 class FailureType(str, Enum):
     DOWN = "down"
     DEGRADED = "degraded"
     LATENCY_UP = "latency_up"
-    
\ No newline at end of file
+
+
+@dataclass(frozen=True, slots=True)
+class Scenario:
+    """A named incident in which several services fail the same way at once."""
+
+    name: str
+    services: tuple[ServiceId, ...]
+    failure: FailureType
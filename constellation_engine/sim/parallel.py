@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from multiprocessing.shared_memory import SharedMemory
+from typing import Iterator
+
+from constellation_engine.sim.compiled import (
+    CompiledGraph,
+    bfs_order,
+    pack_into,
+    packed_size,
+    unpack,
+)
+from constellation_engine.sim.models import FailureType
+
+# Per-worker state, set once by ``_attach`` when the worker process starts.
+_WORKER_SHM: SharedMemory | None = None
+_WORKER_GRAPH: CompiledGraph | None = None
+
+
+def parallel_blast_radius_sizes(
+    compiled: CompiledGraph,
+    failure: FailureType,
+    *,
+    workers: int,
+    chunk_size: int | None = None,
+) -> list[int]:
+    """
+    Blast-radius size of every node, computed by a pool of worker processes.
+
+    The compiled graph is packed once into a shared-memory block that every worker
+    attaches to; start nodes are sharded into contiguous index ranges. Results are
+    collected in submission order, so the output is identical to a serial run.
+    """
+    n = compiled.num_nodes
+    if n == 0:
+        return []
+    if chunk_size is None:
+        # A few chunks per worker keeps the pool busy when some shards are heavier.
+        chunk_size = max(1, -(-n // (workers * 4)))
+
+    ranges = [(lo, min(lo + chunk_size, n)) for lo in range(0, n, chunk_size)]
+    counts: list[int] = []
+    with shared_graph(compiled) as name, ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_attach,
+        initargs=(name,),
+    ) as pool:
+        for chunk in pool.map(_count_range, ranges, [failure] * len(ranges)):
+            counts.extend(chunk)
+    return counts
+
+
+@contextmanager
+def shared_graph(compiled: CompiledGraph) -> Iterator[str]:
+    """
+    Pack ``compiled`` into a shared-memory block for the duration of the block.
+
+    Yields the block's name; a pool ``initializer`` of ``_attach(name)`` gives every
+    worker process ``_WORKER_GRAPH``, a zero-copy view of the same graph.
+    """
+    shm = SharedMemory(create=True, size=max(1, packed_size(compiled)))
+    try:
+        pack_into(compiled, _buffer(shm))
+        yield shm.name
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def _attach(name: str) -> None:
+    global _WORKER_SHM, _WORKER_GRAPH
+    # Workers share the parent's resource tracker, so attaching registers nothing new
+    # and the parent's ``unlink`` remains the only cleanup.
+    shm = SharedMemory(name=name)
+    _WORKER_SHM = shm
+    _WORKER_GRAPH = unpack(_buffer(shm))
+
+
+def _buffer(shm: SharedMemory) -> memoryview:
+    buf = shm.buf
+    assert buf is not None, "shared memory block is closed"
+    return buf
+
+
+def _count_range(bounds: tuple[int, int], failure: FailureType) -> list[int]:
+    compiled = _WORKER_GRAPH
+    assert compiled is not None, "worker is not attached to a shared graph"
+    lo, hi = bounds
+    return [len(bfs_order(compiled, [i], failure)) for i in range(lo, hi)]
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
-import networkx as nx
+from collections import deque
+from typing import TYPE_CHECKING, Iterable
 
 from constellation_engine.core.types import CallType, DependencyType, ServiceId
 from constellation_engine.sim.models import FailureType
 
+if TYPE_CHECKING:
+    import networkx as nx
+
 
 def propagate_failure(
     graph: nx.DiGraph,
@@ -20,11 +24,26 @@ def propagate_failure(
     - DEGRADED propagates only through HARD dependencies
     - LATENCY_UP propagates only through SYNC calls
     """
-    impacted: dict[ServiceId, FailureType] = {start: failure}
-    queue: list[ServiceId] = [start]
+    return propagate_failures(graph, starts=[start], failure=failure)
+
+
+def propagate_failures(
+    graph: nx.DiGraph,
+    *,
+    starts: Iterable[ServiceId],
+    failure: FailureType,
+) -> dict[ServiceId, FailureType]:
+    """
+    Propagate a failure that hits several services at once.
+
+    The result is the union of the single-service blast radii, in breadth-first
+    order from all ``starts`` together. The rules are those of ``propagate_failure``.
+    """
+    impacted: dict[ServiceId, FailureType] = dict.fromkeys(starts, failure)
+    queue: deque[ServiceId] = deque(impacted)
 
     while queue:
-        current = queue.pop(0)
+        current = queue.popleft()
 
         for depender, _, attrs in graph.in_edges(current, data=True):
             dep_type: DependencyType = attrs["dep_type"]
@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+import heapq
+
+from constellation_engine.core.metrics import count_edges
+from constellation_engine.sim.compiled import CompiledGraph
+from constellation_engine.sim.models import FailureType
+
+
+def condense(
+    compiled: CompiledGraph,
+    failure: FailureType,
+) -> tuple[list[int], list[list[int]]]:
+    """
+    Collapse the strongly connected components of the ``failure``-filtered impact graph.
+
+    Returns ``(comp, components)`` where ``comp[v]`` is the component of node ``v`` and
+    ``components`` lists member nodes per component. Components are numbered in reverse
+    topological order: every component a failure can spread to has a smaller number.
+    """
+    n = compiled.num_nodes
+    indptr = compiled.indptr
+    indices = compiled.indices
+    mask = compiled.masks[failure]
+
+    order = [-1] * n  # Tarjan discovery index
+    low = [0] * n
+    on_stack = bytearray(n)
+    stack: list[int] = []
+    comp = [-1] * n
+    components: list[list[int]] = []
+    counter = 0
+
+    for root in range(n):
+        if order[root] != -1:
+            continue
+
+        order[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = 1
+        work = [(root, indptr[root])]
+
+        while work:
+            v, k = work[-1]
+            end = indptr[v + 1]
+            descend = -1
+            while k < end:
+                if mask[k]:
+                    u = indices[k]
+                    if order[u] == -1:
+                        descend = u
+                        k += 1
+                        break
+                    if on_stack[u] and order[u] < low[v]:
+                        low[v] = order[u]
+                k += 1
+
+            if descend != -1:
+                work[-1] = (v, k)
+                order[descend] = low[descend] = counter
+                counter += 1
+                stack.append(descend)
+                on_stack[descend] = 1
+                work.append((descend, indptr[descend]))
+                continue
+
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                if low[v] < low[parent]:
+                    low[parent] = low[v]
+
+            if low[v] == order[v]:
+                c = len(components)
+                members: list[int] = []
+                while True:
+                    w = stack.pop()
+                    on_stack[w] = 0
+                    comp[w] = c
+                    members.append(w)
+                    if w == v:
+                        break
+                components.append(members)
+
+    count_edges(compiled.num_edges)
+    return comp, components
+
+
+def condensed_successors(
+    compiled: CompiledGraph,
+    failure: FailureType,
+    comp: list[int],
+    components: list[list[int]],
+) -> list[list[int]]:
+    """Distinct successor components of each component in the condensed DAG."""
+    indptr = compiled.indptr
+    indices = compiled.indices
+    mask = compiled.masks[failure]
+
+    succ: list[list[int]] = []
+    for c, members in enumerate(components):
+        seen: set[int] = set()
+        for v in members:
+            for k in range(indptr[v], indptr[v + 1]):
+                if mask[k]:
+                    d = comp[indices[k]]
+                    if d != c:
+                        seen.add(d)
+        succ.append(sorted(seen))
+    count_edges(compiled.num_edges)
+    return succ
+
+
+def reachability_counts(compiled: CompiledGraph, failure: FailureType) -> list[int]:
+    """
+    Blast-radius size of every node for ``failure``, in node-index order.
+
+    Each condensed component gets a bitset of impacted nodes, built once from its own
+    members and the bitsets of the components it spreads to. Because components are
+    numbered in reverse topological order, a single pass suffices. Bitsets are released
+    as soon as the last component that needs them has been processed.
+    """
+    comp, components = condense(compiled, failure)
+    succ = condensed_successors(compiled, failure, comp, components)
+    sizes = _component_sizes(compiled.num_nodes, components, succ)
+    return [sizes[comp[v]] for v in range(compiled.num_nodes)]
+
+
+def _component_sizes(n: int, components: list[list[int]], succ: list[list[int]]) -> list[int]:
+    pending = [0] * len(components)  # predecessors not yet processed
+    for targets in succ:
+        for d in targets:
+            pending[d] += 1
+
+    reach: list[int] = [0] * len(components)
+    sizes = [0] * len(components)
+    for c, members in enumerate(components):
+        bits = _member_bits(members, n)
+        for d in succ[c]:
+            bits |= reach[d]
+            pending[d] -= 1
+            if pending[d] == 0:
+                reach[d] = 0
+        sizes[c] = bits.bit_count()
+        if pending[c]:
+            reach[c] = bits
+    return sizes
+
+
+def _member_bits(members: list[int], n: int) -> int:
+    if len(members) < 64:
+        bits = 0
+        for v in members:
+            bits |= 1 << v
+        return bits
+    # Large components: set bits in a byte buffer instead of growing an int per member.
+    buf = bytearray((n >> 3) + 1)
+    for v in members:
+        buf[v >> 3] |= 1 << (v & 7)
+    return int.from_bytes(buf, "little")
+
+
+def top_counts(compiled: CompiledGraph, failure: FailureType, k: int) -> dict[int, int]:
+    """
+    Exact blast-radius sizes of a set of nodes that contains the ``k`` largest.
+
+    One pass over the condensed DAG gives every component an upper bound (its size plus
+    the bounds of the components it spreads to, capped at the node count) and a lower
+    bound (its size plus the largest lower bound among them). The ``k``-th largest lower
+    bound is a score the top ``k`` must reach, so components whose upper bound falls
+    short are never searched. The rest are resolved in decreasing upper-bound order,
+    with a search of the condensed DAG only where the bounds disagree, until the next
+    upper bound is below the ``k``-th exact score found. If those searches together
+    cost more than the single pass of ``reachability_counts`` (deep graphs with loose
+    bounds), the remaining candidates are resolved by that pass instead. Nodes tied
+    with the ``k``-th score are included, so ranking the result gives the same top
+    ``k`` as ranking ``reachability_counts``.
+    """
+    n = compiled.num_nodes
+    if k < 1 or n == 0:
+        return {}
+    comp, components = condense(compiled, failure)
+    succ = condensed_successors(compiled, failure, comp, components)
+
+    size = [len(members) for members in components]
+    upper = [0] * len(components)
+    lower = [0] * len(components)
+    for c, targets in enumerate(succ):  # components a failure spreads to come first
+        upper[c] = min(n, size[c] + sum(upper[d] for d in targets))
+        lower[c] = size[c] + max((lower[d] for d in targets), default=0)
+
+    # k-th largest lower bound over nodes; every member of a component shares its bound.
+    threshold = 0
+    covered = 0
+    for c in heapq.nlargest(k, range(len(components)), key=lower.__getitem__):
+        threshold = lower[c]
+        covered += size[c]
+        if covered >= k:
+            break
+
+    candidates = sorted(
+        (c for c in range(len(components)) if upper[c] >= threshold),
+        key=upper.__getitem__,
+        reverse=True,
+    )
+    best: list[int] = []  # min-heap of the k largest exact scores found, one per node
+    counts: dict[int, int] = {}
+    budget = len(components) + sum(len(targets) for targets in succ)
+    exact: list[int] | None = None
+    for c in candidates:
+        if len(best) == k and upper[c] < best[0]:
+            break
+        if upper[c] == lower[c]:
+            score = upper[c]
+        elif exact is not None:
+            score = exact[c]
+        else:
+            score, work = _condensed_reach(c, succ, size)
+            budget -= work
+            if budget < 0:
+                exact = _component_sizes(n, components, succ)
+        for _ in range(min(size[c], k)):
+            if len(best) < k:
+                heapq.heappush(best, score)
+            elif score > best[0]:
+                heapq.heapreplace(best, score)
+        for v in components[c]:
+            counts[v] = score
+    return counts
+
+
+def _condensed_reach(start: int, succ: list[list[int]], size: list[int]) -> tuple[int, int]:
+    """Nodes in the components reachable from ``start`` (itself included), and the work.
+
+    Work counts the components and condensed edges visited.
+    """
+    seen = {start}
+    stack = [start]
+    total = work = 0
+    while stack:
+        c = stack.pop()
+        total += size[c]
+        work += 1 + len(succ[c])
+        for d in succ[c]:
+            if d not in seen:
+                seen.add(d)
+                stack.append(d)
+    return total, work
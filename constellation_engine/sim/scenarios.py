@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from typing import Iterable, Iterator
+
+from constellation_engine.core.types import ServiceId
+from constellation_engine.sim.compiled import CompiledGraph, propagate_compiled_failures
+from constellation_engine.sim.models import FailureType, Scenario
+
+
+def evaluate_scenarios(
+    compiled: CompiledGraph,
+    scenarios: Iterable[Scenario],
+) -> Iterator[tuple[Scenario, dict[ServiceId, FailureType]]]:
+    """
+    Evaluate many failure scenarios against one compiled graph.
+
+    Every scenario reuses the same CSR arrays and the per-FailureType edge masks
+    computed at compile time, so each one costs only its own multi-source BFS.
+    Results are yielded in input order as they are computed.
+    """
+    for scenario in scenarios:
+        yield scenario, propagate_compiled_failures(
+            compiled,
+            starts=scenario.services,
+            failure=scenario.failure,
+        )
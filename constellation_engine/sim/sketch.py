@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import math
+from typing import Iterable
+
+from constellation_engine.sim.compiled import CompiledGraph
+from constellation_engine.sim.models import FailureType
+from constellation_engine.sim.reachability import condense, condensed_successors
+
+DEFAULT_PRECISION = 12
+MIN_PRECISION = 4
+MAX_PRECISION = 16
+
+_MASK64 = (1 << 64) - 1
+# Fraction of empty registers expected at 2.5m distinct items, where HLL switches
+# from linear counting to the harmonic-mean estimate.
+_LINEAR_COUNTING_ZEROS = math.exp(-2.5)
+
+
+def relative_error(precision: int = DEFAULT_PRECISION) -> float:
+    """
+    Standard error of a sketch estimate relative to the true size: ``1.04 / sqrt(2**p)``.
+
+    About 68% of estimates fall within one standard error and 99.7% within three;
+    precision 12 (4 KiB per live sketch) gives 1.6%, precision 14 (16 KiB) 0.8%.
+    Results of up to ``2**p / 16`` nodes are exact, and results smaller than about
+    ``2.5 * 2**p`` are estimated by linear counting, which is considerably more
+    accurate than this bound.
+    """
+    _check_precision(precision)
+    return 1.04 / math.sqrt(1 << precision)
+
+
+def approximate_counts(
+    compiled: CompiledGraph,
+    failure: FailureType,
+    *,
+    precision: int = DEFAULT_PRECISION,
+) -> list[int]:
+    """
+    Estimated blast-radius size of every node for ``failure``, in node-index order.
+
+    Like ``reachability_counts``, but a condensed component whose impacted set exceeds
+    ``2**precision / 16`` nodes carries a HyperLogLog sketch of ``2**precision`` one-byte
+    registers instead of an exact bitset, so the memory per live component is bounded
+    rather than proportional to the graph. Smaller sets are kept exactly, so their sizes
+    are exact. Sketches merge by register-wise maximum in reverse topological order and
+    are released as soon as no later component needs them. An estimate is never below
+    the component's own size plus its largest successor's, nor above the number of
+    nodes; see ``relative_error`` for the bound.
+    """
+    _check_precision(precision)
+    m = 1 << precision
+    comp, components = condense(compiled, failure)
+    succ = condensed_successors(compiled, failure, comp, components)
+
+    pending = [0] * len(components)
+    for targets in succ:
+        for d in targets:
+            pending[d] += 1
+
+    guards = int.from_bytes(b"\x80" * m, "little")
+    limit = m // 16  # largest impacted set kept exactly, at about a sketch's memory
+    summaries: list[set[int] | int | None] = [None] * len(components)
+    estimates = [0.0] * len(components)  # raw estimate of each live sketch
+    sizes = [0] * len(components)
+    n = compiled.num_nodes
+    for c, members in enumerate(components):
+        exact: set[int] | None = set(members) if len(members) <= limit else None
+        sketch = 0 if exact is not None else _sketch(members, precision)
+        same_as = -1  # a successor whose sketch equals this one, so its estimate does too
+        for d in succ[c]:
+            other = summaries[d]
+            assert other is not None, "successor summary released too early"
+            if exact is not None and not isinstance(other, int):
+                exact |= other
+                if len(exact) > limit:
+                    sketch, exact = _sketch(exact, precision), None
+            else:
+                if exact is not None:
+                    sketch, exact = _sketch(exact, precision), None
+                if isinstance(other, int):
+                    merged = _merge(sketch, other, guards)
+                    if merged == other:
+                        same_as = d
+                    elif merged != sketch:
+                        same_as = -1
+                    sketch = merged
+                else:
+                    sketch = _merge(sketch, _sketch(other, precision), guards)
+                    same_as = -1
+            pending[d] -= 1
+            if pending[d] == 0:
+                summaries[d] = None
+
+        if exact is not None:
+            sizes[c] = len(exact)
+        else:
+            # Long chains mostly add nodes that change no register; reuse the estimate.
+            estimate = estimates[same_as] if same_as != -1 else _estimate(sketch, m)
+            # Never below what is known exactly: own members plus the largest successor.
+            low = len(members) + max((sizes[d] for d in succ[c]), default=0)
+            sizes[c] = min(n, max(low, round(estimate)))
+            if pending[c]:
+                estimates[c] = estimate
+        if pending[c]:
+            summaries[c] = exact if exact is not None else sketch
+
+    return [sizes[comp[v]] for v in range(n)]
+
+
+def _check_precision(precision: int) -> None:
+    if not MIN_PRECISION <= precision <= MAX_PRECISION:
+        raise ValueError(f"precision must be between {MIN_PRECISION} and {MAX_PRECISION}")
+
+
+def _sketch(nodes: Iterable[int], precision: int) -> int:
+    """Registers of a sketch of ``nodes``, one byte per register, as an int."""
+    registers = bytearray(1 << precision)
+    width = 64 - precision
+    for v in nodes:
+        h = _hash(v)
+        r = h >> width
+        # Rank of the first set bit in the remaining bits; 1 .. width + 1.
+        rank = width - (h & ((1 << width) - 1)).bit_length() + 1
+        if rank > registers[r]:
+            registers[r] = rank
+    return int.from_bytes(registers, "little")
+
+
+def _merge(a: int, b: int, guards: int) -> int:
+    """Register-wise maximum of two sketches, computed on all registers at once.
+
+    Registers stay below 0x80, so setting each byte's top bit in ``a`` before
+    subtracting ``b`` cannot borrow across bytes, and that bit survives exactly
+    where ``a``'s register is at least ``b``'s.
+    """
+    ge = (((a | guards) - b) & guards) >> 7
+    keep = ge * 0xFF
+    return (a & keep) | (b & ~keep)
+
+
+def _estimate(sketch: int, m: int) -> float:
+    registers = sketch.to_bytes(m, "little")
+    zeros = registers.count(0)
+    # Linear counting while enough registers are empty (below ~2.5m), as in HLL.
+    if zeros > m * _LINEAR_COUNTING_ZEROS:
+        return m * math.log(m / zeros)
+    total = 0.0
+    for value in range(max(registers) + 1):
+        count = registers.count(value)
+        if count:
+            total += count * 2.0**-value
+    return _alpha(m) * m * m / total
+
+
+def _alpha(m: int) -> float:
+    if m == 16:
+        return 0.673
+    if m == 32:
+        return 0.697
+    if m == 64:
+        return 0.709
+    return 0.7213 / (1 + 1.079 / m)
+
+
+def _hash(v: int) -> int:
+    """splitmix64 finalizer: a well-mixed, deterministic 64-bit hash of a node index."""
+    z = (v + 0x9E3779B97F4A7C15) & _MASK64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return z ^ (z >> 31)
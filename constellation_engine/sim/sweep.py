@@ -0,0 +1,353 @@
+from __future__ import annotations
+
+import heapq
+from bisect import bisect_right
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import combinations
+from typing import TYPE_CHECKING, Callable, Iterator
+
+from constellation_engine.core.compact import CompactModel
+from constellation_engine.core.types import ServiceId
+from constellation_engine.core.validate import ValidatedModel
+from constellation_engine.sim import parallel
+from constellation_engine.sim.compiled import CompiledGraph, as_compiled, bfs_order
+from constellation_engine.sim.models import FailureType
+from constellation_engine.sim.reachability import (
+    _component_sizes,
+    _member_bits,
+    condense,
+    condensed_successors,
+)
+
+if TYPE_CHECKING:
+    import networkx as nx
+
+# Reach bitsets kept per process; each is one bit per service.
+_BITS_CACHE_SIZE = 1024
+
+# Relative cost per unimpacted service of ranking every last member in one pass,
+# against traversing each candidate's blast radius separately.
+_RESIDUAL_COST = 4
+
+# A combination as (impacted count, member node indices) and its final form.
+_Found = tuple[int, tuple[int, ...]]
+Combination = tuple[tuple[ServiceId, ...], int]
+# Rank of a combination: (-impacted, sorted IDs); lower ranks first.
+_Key = tuple[int, tuple[ServiceId, ...]]
+
+# Per-worker state, set once by ``_attach`` when the worker process starts.
+_WORKER_SWEEP: _Sweep | None = None
+
+
+def nk_sweep(
+    graph: nx.DiGraph | CompiledGraph | ValidatedModel | CompactModel,
+    k: int,
+    *,
+    failure: FailureType = FailureType.DOWN,
+    top: int = 10,
+    workers: int = 1,
+) -> Iterator[Combination]:
+    """
+    The ``top`` sets of ``k`` services whose joint failure impacts the most services.
+
+    Yields ``(services, impacted)`` in rank order (most impacted first, ties broken by
+    the sorted service IDs), each one as soon as no unexamined combination can outrank
+    it, so the worst combinations stream out while the sweep is still running.
+
+    Services are ordered by their single-failure blast radius, computed in one pass by
+    ``reachability_counts``. The sweep is split into shards by each combination's
+    highest-scoring member. Within a shard, combinations are extended one member at a
+    time, and a branch is cut as soon as its union so far plus the next members' single
+    scores cannot reach the current ``top``-th result. Once a whole shard's bound falls
+    below it, the sweep stops. Unions are bitwise ORs of cached per-service reach bitsets;
+    when many candidates remain for the last member, they are ranked instead by one
+    condensed pass over the services the union leaves unimpacted.
+    With ``workers > 1`` shards run in worker processes attached to one shared-memory
+    copy of the graph; results are merged in shard order, so the output is identical.
+    """
+    if k < 1:
+        raise ValueError("k must be at least 1")
+    if top < 1:
+        return
+    compiled = as_compiled(graph)
+    sweep = _Sweep.build(compiled, failure, k)
+    if len(sweep.order) < k:
+        return
+    ids = compiled.ids
+
+    def final(entry: _Found) -> Combination:
+        return tuple(sorted(ids[v] for v in entry[1])), entry[0]
+
+    found: list[Combination] = []
+    emitted = 0
+    results_by_shard = _run_shards(compiled, sweep, top, workers, lambda: _threshold(found, top))
+    for shard, results in results_by_shard:
+        found.extend(final(r) for r in results)
+        found.sort(key=_rank_key)
+        del found[top:]
+        # Nothing in a later shard can impact more than that shard's bound.
+        rest = sweep.bound(shard + 1)
+        while emitted < len(found) and found[emitted][1] > rest:
+            yield found[emitted]
+            emitted += 1
+    yield from found[emitted:]
+
+
+class _Sweep:
+    """The search space of one sweep; shared by every shard and, pickled, every worker."""
+
+    def __init__(
+        self,
+        failure: FailureType,
+        k: int,
+        order: list[int],
+        scores: list[int],
+        ids: list[ServiceId],
+        condensed: tuple[list[int], list[list[int]], list[list[int]]],
+    ) -> None:
+        self.failure = failure
+        self.k = k
+        self.n = len(ids)
+        self.order = order  # node indices, highest single score first
+        self.scores = scores  # single score of order[i]
+        self.prefix = [0]  # prefix sums of scores, for the bounds
+        for s in scores:
+            self.prefix.append(self.prefix[-1] + s)
+        self._descending = [-s for s in scores]  # for bisecting on a score
+        self.position = [0] * self.n  # index into order of each node
+        for i, v in enumerate(order):
+            self.position[v] = i
+        self.comp, self.components, self.succ = condensed
+        # Ties in impact are broken by service IDs, so the bounds need their order too.
+        self.by_id = sorted(ids)
+        rank = {sid: r for r, sid in enumerate(self.by_id)}
+        self.id_rank = [rank[ids[v]] for v in order]  # ID rank of order[i]
+        self._bits: OrderedDict[int, int] = OrderedDict()
+
+    @classmethod
+    def build(cls, compiled: CompiledGraph, failure: FailureType, k: int) -> _Sweep:
+        comp, components = condense(compiled, failure)
+        succ = condensed_successors(compiled, failure, comp, components)
+        sizes = _component_sizes(compiled.num_nodes, components, succ)
+        counts = [sizes[c] for c in comp]
+        ids = compiled.ids
+        order = sorted(range(compiled.num_nodes), key=lambda v: (-counts[v], ids[v]))
+        scores = [counts[v] for v in order]
+        return cls(failure, k, order, scores, list(ids), (comp, components, succ))
+
+    def bound(self, i: int, need: int | None = None, base: int = 0) -> int:
+        """Most services ``base`` plus ``need`` members from ``order[i:]`` can impact."""
+        need = self.k if need is None else need
+        if i + need > len(self.order):
+            return -1  # not enough members left
+        return min(self.n, base + self.prefix[i + need] - self.prefix[i])
+
+    def contenders(self, start: int, base: int, threshold: _Key | None) -> int:
+        """How many single members from ``order[start:]`` might lift ``base`` to ``threshold``."""
+        if threshold is None:
+            return len(self.order) - start
+        end = bisect_right(self._descending, base + threshold[0])
+        return max(0, end - start)
+
+    def residual_cheaper(self, start: int, base: int, threshold: _Key | None) -> bool:
+        """Whether ``gains`` beats trying each last member from ``order[start:]`` in turn."""
+        tries = self.contenders(start, base, threshold)
+        if tries <= _BITS_CACHE_SIZE // 2:
+            return False  # their reach bitsets are likely cached from sibling branches
+        return _RESIDUAL_COST * (self.n - base) < tries * self.scores[start]
+
+    def gains(self, union: int) -> list[tuple[int, int]]:
+        """
+        ``(position, services it adds)`` for every service outside ``union``.
+
+        A union of blast radii is closed under impact, so what a service outside it adds
+        is its blast radius among the services outside it: one condensed pass over those.
+        """
+        rest = ((1 << self.n) - 1) ^ union
+        data = rest.to_bytes((self.n + 7) >> 3, "little")
+        nodes = [8 * i + b for i, x in enumerate(data) if x for b in range(8) if x >> b & 1]
+        comp, components, succ = self.comp, self.components, self.succ
+        local = {v: i for i, v in enumerate(nodes)}
+        kept = sorted({comp[v] for v in nodes})  # still in reverse topological order
+        index = {c: i for i, c in enumerate(kept)}
+        sizes = _component_sizes(
+            len(nodes),
+            [[local[v] for v in components[c]] for c in kept],
+            [[index[d] for d in succ[c] if d in index] for c in kept],
+        )
+        return [(self.position[v], sizes[index[comp[v]]]) for v in nodes]
+
+    def outranked(
+        self, impacted: int, chosen: list[ServiceId], need: int, threshold: _Key | None
+    ) -> bool:
+        """
+        Whether no combination of ``chosen`` and ``need`` more members that impacts at
+        most ``impacted`` services can rank ahead of ``threshold``.
+
+        Its IDs are at best ``chosen`` plus the ``need`` lowest other IDs of the graph.
+        """
+        if threshold is None or -impacted < threshold[0]:
+            return False
+        if -impacted > threshold[0]:
+            return True
+        fill: list[ServiceId] = []
+        for sid in self.by_id:
+            if len(fill) == need:
+                break
+            if sid not in chosen:
+                fill.append(sid)
+        return (-impacted, tuple(sorted(chosen + fill))) >= threshold
+
+    def reach(self, compiled: CompiledGraph, i: int) -> int:
+        bits = self._bits.get(i)
+        if bits is None:
+            v = self.order[i]
+            bits = _member_bits(bfs_order(compiled, [v], self.failure), self.n)
+            self._bits[i] = bits
+            if len(self._bits) > _BITS_CACHE_SIZE:
+                self._bits.popitem(last=False)
+        else:
+            self._bits.move_to_end(i)
+        return bits
+
+    def shard(
+        self, compiled: CompiledGraph, first: int, top: int, threshold: _Key | None
+    ) -> list[_Found]:
+        """
+        The best ``top`` combinations led by ``order[first]``, as (impacted, nodes).
+
+        Branches that cannot outrank ``threshold``, or the shard's own ``top``-th result
+        once it has that many, are not explored.
+        """
+        k, n = self.k, self.n
+        ids, order = compiled.ids, self.order
+        results: list[tuple[_Key, tuple[int, ...]]] = []  # (rank key, positions in order)
+        floor = threshold
+
+        def record(size: int, chosen: tuple[int, ...]) -> None:
+            nonlocal floor
+            results.append(((-size, tuple(sorted(ids[order[i]] for i in chosen))), chosen))
+            if len(results) >= 2 * top:
+                results.sort()
+                del results[top:]
+                if floor is None or results[-1][0] < floor:
+                    floor = results[-1][0]
+
+        def extend(union: int, size: int, chosen: tuple[int, ...], start: int) -> None:
+            if len(chosen) == k:
+                record(size, chosen)
+                return
+            need = k - len(chosen)
+            if size == n:
+                # Every completion impacts everything, so only the IDs rank them, and
+                # the best ``top`` are among the remaining members with the lowest IDs.
+                pool = heapq.nsmallest(
+                    top + need - 1, range(start, len(order)), key=self.id_rank.__getitem__
+                )
+                for rest in combinations(sorted(pool), need):
+                    record(n, (*chosen, *rest))
+                return
+            chosen_ids = [ids[order[i]] for i in chosen]
+            if need == 1 and self.residual_cheaper(start, size, floor):
+                # Rank every last member by what it adds, from one pass over the services
+                # left unimpacted, instead of traversing each candidate's blast radius.
+                gains = [(-g, self.id_rank[p], p) for p, g in self.gains(union) if p >= start]
+                for neg, _, p in heapq.nsmallest(top, gains):
+                    record(size - neg, (*chosen, p))
+                if not self.outranked(size, chosen_ids, 1, floor):
+                    # Members already impacted add nothing; only their IDs rank them.
+                    outside = {p for _, _, p in gains}
+                    inside = (p for p in range(start, len(order)) if p not in outside)
+                    for p in heapq.nsmallest(top, inside, key=self.id_rank.__getitem__):
+                        record(size, (*chosen, p))
+                return
+            for j in range(start, len(order) - need + 1):
+                ub = self.bound(j, need, size)
+                # Scores only fall from here on, so the first short bound ends the loop;
+                # a bound that only ties needs IDs that can still rank ahead.
+                if floor is not None and -ub > floor[0]:
+                    break
+                member_ids = [*chosen_ids, ids[order[j]]]
+                if union >> order[j] & 1:
+                    # Already impacted, so everything it impacts is too: nothing to add.
+                    left = self.bound(j + 1, need - 1, size)
+                    if not self.outranked(left, member_ids, need - 1, floor):
+                        extend(union, size, (*chosen, j), j + 1)
+                    continue
+                if self.outranked(ub, member_ids, need - 1, floor):
+                    continue
+                merged = union | self.reach(compiled, j)
+                extend(merged, merged.bit_count(), (*chosen, j), j + 1)
+
+        first_bits = self.reach(compiled, first)
+        extend(first_bits, first_bits.bit_count(), (first,), first + 1)
+        results.sort()
+        return [(-key[0], tuple(order[i] for i in chosen)) for key, chosen in results[:top]]
+
+
+def _run_shards(
+    compiled: CompiledGraph,
+    sweep: _Sweep,
+    top: int,
+    workers: int,
+    threshold: Callable[[], _Key | None],
+) -> Iterator[tuple[int, list[_Found]]]:
+    """Yield ``(shard, results)`` in shard order, skipping shards that cannot compete."""
+    shards = range(len(sweep.order) - sweep.k + 1)
+    ids = compiled.ids
+
+    def outranked(first: int, t: _Key | None) -> bool:
+        return sweep.outranked(sweep.bound(first), [ids[sweep.order[first]]], sweep.k - 1, t)
+
+    if workers <= 1:
+        for first in shards:
+            t = threshold()
+            if t is not None and -sweep.bound(first) > t[0]:
+                return
+            if not outranked(first, t):
+                yield first, sweep.shard(compiled, first, top, t)
+        return
+
+    with parallel.shared_graph(compiled) as name, ProcessPoolExecutor(
+        max_workers=workers, initializer=_attach, initargs=(name, sweep)
+    ) as pool:
+        pending: deque[tuple[int, Future[list[_Found]]]] = deque()
+        it = iter(shards)
+        exhausted = False
+        while True:
+            # Keep a few shards per worker in flight, submitted with the latest threshold.
+            while not exhausted and len(pending) < 2 * workers:
+                nxt = next(it, None)
+                t = threshold()
+                if nxt is None or (t is not None and -sweep.bound(nxt) > t[0]):
+                    exhausted = True
+                    break
+                if not outranked(nxt, t):
+                    pending.append((nxt, pool.submit(_shard, nxt, top, t)))
+            if not pending:
+                return
+            first, future = pending.popleft()
+            yield first, future.result()
+
+
+def _threshold(found: list[Combination], top: int) -> _Key | None:
+    """Rank a combination must beat to still enter the top ``top``; None until full."""
+    return _rank_key(found[top - 1]) if len(found) >= top else None
+
+
+def _rank_key(combination: Combination) -> _Key:
+    return -combination[1], combination[0]
+
+
+def _attach(name: str, sweep: _Sweep) -> None:
+    global _WORKER_SWEEP
+    parallel._attach(name)
+    _WORKER_SWEEP = sweep
+
+
+def _shard(first: int, top: int, threshold: _Key | None) -> list[_Found]:
+    compiled = parallel._WORKER_GRAPH
+    sweep = _WORKER_SWEEP
+    assert compiled is not None and sweep is not None, "worker is not attached to a sweep"
+    return sweep.shard(compiled, first, top, threshold)
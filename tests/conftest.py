@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from constellation_engine.io.cache import CACHE_DIR_ENV
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache_dir(
+    tmp_path_factory: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch
+) -> Path:
+    """Point the default compiled-manifest cache at a temporary directory.
+
+    CLI calls without --no-cache or --cache-dir would otherwise write to the user's
+    real cache directory.
+    """
+    path = tmp_path_factory.mktemp("cache")
+    monkeypatch.setenv(CACHE_DIR_ENV, str(path))
+    return path
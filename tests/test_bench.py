@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from constellation_engine.bench.generators import GENERATORS, write_manifest
+from constellation_engine.bench.suite import compare, run_suite
+from constellation_engine.core.validate import validate_model
+from constellation_engine.io.stream import load_domain
+
+
+@pytest.mark.parametrize("shape", sorted(GENERATORS))
+def test_generators_are_seeded_and_valid(shape: str, tmp_path: Path) -> None:
+    model = GENERATORS[shape](500, seed=7)
+
+    assert GENERATORS[shape](500, seed=7) == model
+    assert len(model[0]) == 500
+    assert validate_model(*model).ok
+
+    path = tmp_path / "m.json"
+    write_manifest(model, path)
+    assert load_domain(path) == model
+
+
+def test_run_suite_reports_every_phase_and_compare_flags_slowdowns() -> None:
+    doc = run_suite(shapes=["layered"], sizes=[200], repeat=1)
+    phases = [row["phase"] for row in doc["results"]]
+    assert phases == [
+        "load",
+        "load_compact",
+        "validate",
+        "build_graph",
+        "compile",
+        "propagate_failure",
+        "compute_criticality",
+        "approximate_criticality",
+    ]
+    peak = {row["phase"]: row.get("peak_bytes") for row in doc["results"]}
+    assert peak["load_compact"] < peak["load"]
+    assert doc["results"][-1]["max_relative_error"] == 0.0  # 200 nodes: all exact
+
+    slower = {
+        "results": [{**row, "seconds": row["seconds"] * 2 + 1} for row in doc["results"]]
+    }
+    assert compare(doc, doc) == []
+    assert len(compare(slower, doc, tolerance=0.5)) == len(phases)
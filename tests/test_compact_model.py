@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from constellation_engine.core.compact import compact_model
+from constellation_engine.core.graph import build_graph
+from constellation_engine.core.validate import ValidationError, validate_or_raise
+from constellation_engine.io import cache as cache_module
+from constellation_engine.io.cache import GraphCache, load_metadata
+from constellation_engine.io.stream import load_compact, load_domain
+from constellation_engine.sim.compiled import compile_graph, compile_model
+
+EXAMPLES = Path(__file__).resolve().parent.parent / "docs" / "examples"
+
+
+def _write(path: Path, doc: dict[str, object]) -> Path:
+    path.write_text(json.dumps(doc), encoding="utf-8")
+    return path
+
+
+def test_load_compact_matches_the_domain_model() -> None:
+    services, deps = load_domain(EXAMPLES / "enterprise.yaml")
+    compact = load_compact(EXAMPLES / "enterprise.yaml")
+
+    assert compact.metadata is None
+    assert compact.ids == tuple(svc.id for svc in services)
+    assert list(compact.dependencies()) == deps
+    assert compact_model(validate_or_raise(services, deps), metadata=False) == compact
+    assert compile_model(compact) == compile_graph(build_graph(services, deps))
+
+
+def test_services_declared_after_their_dependencies_are_renumbered(tmp_path: Path) -> None:
+    path = _write(
+        tmp_path / "m.json",
+        {
+            "dependencies": [
+                {"src": "api", "dst": "db", "dep_type": "soft"},
+                {"src": "worker", "dst": "db", "call_type": "async"},
+                {"src": "api", "dst": "db", "dep_type": "hard", "metadata": {"port": 5432}},
+            ],
+            "services": [
+                {"id": "db", "metadata": {"tier": "data"}},
+                {"id": "api", "name": "Public API"},
+                {"id": "worker"},
+            ],
+        },
+    )
+    services, deps = load_domain(path)
+
+    compact = load_compact(path, metadata=True)
+
+    assert compact.ids == ("db", "api", "worker")
+    assert [(d.src, d.dst, d.dep_type, d.call_type) for d in compact.dependencies()] == [
+        (d.src, d.dst, d.dep_type, d.call_type) for d in deps
+    ]
+    assert compile_model(compact) == compile_graph(build_graph(services, deps))
+    assert compact.metadata is not None
+    assert compact.metadata.names == {"api": "Public API"}
+    assert compact.metadata.service("db") == {"tier": "data"}
+    assert compact.metadata.service("worker") == {}
+    assert compact.metadata.dependency("api", "db") == {"port": 5432}
+
+
+def test_load_compact_reports_validation_errors_like_validate_or_raise(tmp_path: Path) -> None:
+    path = _write(
+        tmp_path / "bad.json",
+        {
+            "services": [{"id": "a"}, {"id": "a"}],
+            "dependencies": [{"src": "a", "dst": "a"}, {"src": "a", "dst": "ghost"}],
+        },
+    )
+    with pytest.raises(ValidationError) as expected:
+        validate_or_raise(*load_domain(path))
+
+    with pytest.raises(ValidationError) as actual:
+        load_compact(path)
+
+    assert str(actual.value) == str(expected.value)
+
+
+def test_metadata_is_cached_in_a_sidecar(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    path = _write(
+        tmp_path / "m.json",
+        {"services": [{"id": "a", "metadata": {"team": "core"}}], "dependencies": []},
+    )
+    cache = GraphCache(tmp_path / "cache")
+
+    assert load_metadata(path, cache).service("a") == {"team": "core"}
+
+    def fail(*args: object, **kwargs: object) -> None:
+        raise AssertionError("cached metadata must not re-read the manifest")
+
+    monkeypatch.setattr(cache_module, "load_compact", fail)
+    assert load_metadata(path, cache).service("a") == {"team": "core"}
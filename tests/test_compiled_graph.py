@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from array import array
+from pathlib import Path
+
+from constellation_engine.core.graph import build_graph
+from constellation_engine.core.types import (
+    CallType,
+    Dependency,
+    DependencyType,
+    Service,
+    ServiceId,
+)
+from constellation_engine.core.validate import validate_or_raise
+from constellation_engine.io.loaders import load_manifest, manifest_to_domain
+from constellation_engine.sim.compiled import (
+    bfs_order,
+    compile_graph,
+    compile_model,
+    propagate_compiled,
+)
+from constellation_engine.sim.models import FailureType
+from constellation_engine.sim.propagate import propagate_failure
+
+EXAMPLES = Path(__file__).resolve().parent.parent / "docs" / "examples"
+
+
+def test_compiled_graph_matches_reference_on_enterprise_example() -> None:
+    services, deps = manifest_to_domain(load_manifest(EXAMPLES / "enterprise.yaml"))
+    g = build_graph(services, deps)
+    compiled = compile_graph(g)
+
+    assert compiled.num_nodes == g.number_of_nodes()
+    assert compiled.num_edges == g.number_of_edges()
+
+    for node in g.nodes:
+        for failure in FailureType:
+            expected = propagate_failure(g, start=node, failure=failure)
+            actual = propagate_compiled(compiled, start=node, failure=failure)
+            # Same mapping and same breadth-first order.
+            assert list(actual.items()) == list(expected.items())
+
+
+def test_compiled_graph_applies_edge_masks() -> None:
+    services = [Service(ServiceId(s)) for s in ("api", "auth", "db", "cache")]
+    deps = [
+        Dependency(ServiceId("api"), ServiceId("auth"), DependencyType.SOFT, CallType.SYNC),
+        Dependency(ServiceId("auth"), ServiceId("db"), DependencyType.HARD, CallType.ASYNC),
+        Dependency(ServiceId("api"), ServiceId("cache"), DependencyType.HARD, CallType.SYNC),
+    ]
+    compiled = compile_graph(build_graph(services, deps))
+
+    degraded = propagate_compiled(compiled, start=ServiceId("db"), failure=FailureType.DEGRADED)
+    latency = propagate_compiled(compiled, start=ServiceId("db"), failure=FailureType.LATENCY_UP)
+
+    assert set(degraded) == {ServiceId("db"), ServiceId("auth")}
+    assert set(latency) == {ServiceId("db")}
+
+
+def test_compile_model_matches_compiling_the_networkx_graph() -> None:
+    services, deps = manifest_to_domain(load_manifest(EXAMPLES / "enterprise.yaml"))
+    # A repeated edge keeps its first position and takes the last listed types.
+    deps = [
+        *deps,
+        Dependency(deps[0].src, deps[0].dst, DependencyType.SOFT, CallType.ASYNC),
+    ]
+
+    model = validate_or_raise(services, deps)
+    assert compile_model(model) == compile_graph(build_graph(services, deps))
+
+
+def test_bfs_order_records_parents_and_stops_at_limit() -> None:
+    services, deps = manifest_to_domain(load_manifest(EXAMPLES / "enterprise.yaml"))
+    compiled = compile_graph(build_graph(services, deps))
+    indptr, indices = compiled.indptr, compiled.indices
+    for s in range(compiled.num_nodes):
+        parents = array("q", [-2]) * compiled.num_nodes
+        order = bfs_order(compiled, [s], FailureType.DOWN, parents=parents)
+        assert parents[s] == -1
+        position = {v: i for i, v in enumerate(order)}
+        for v in order[1:]:
+            k = parents[v]
+            assert indices[k] == v and compiled.masks[FailureType.DOWN][k]
+            dependency = next(u for u in order if indptr[u] <= k < indptr[u + 1])
+            assert position[dependency] < position[v]
+        assert all(parents[v] == -2 for v in set(range(compiled.num_nodes)) - set(order))
+
+        for limit in (1, len(order)):
+            assert bfs_order(compiled, [s], FailureType.DOWN, limit=limit) == order[:limit]
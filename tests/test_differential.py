@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import networkx as nx
+import pytest
+
+from constellation_engine.bench import differential
+from constellation_engine.bench.differential import (
+    CRITICALITY_ENGINES,
+    PROPAGATION_ENGINES,
+    SCENARIO_ENGINES,
+    MultiPropagator,
+    Propagator,
+    check_case,
+    generate_case,
+    run_differential,
+)
+from constellation_engine.core.graph import build_graph
+from constellation_engine.core.types import DependencyType
+from constellation_engine.core.validate import ValidatedModel
+from constellation_engine.io.stream import load_domain
+from constellation_engine.sim.compiled import (
+    compile_model,
+    propagate_compiled,
+    propagate_compiled_failures,
+)
+from constellation_engine.sim.models import FailureType
+
+
+def test_registered_engines_agree_with_the_reference() -> None:
+    report = run_differential(seed=100, cases=40, max_services=16)
+    assert report.ok, report.failures
+    assert report.cases == 40
+    assert {"scenarios", "parallel"} <= {*SCENARIO_ENGINES, *CRITICALITY_ENGINES}
+
+
+def test_generated_cases_are_seeded_and_varied() -> None:
+    assert generate_case(3) == generate_case(3)
+    cases = [generate_case(s, self_dependencies=s % 2 == 1) for s in range(60)]
+    graphs = [build_graph(c.model()) for c in cases]
+
+    assert any(not nx.is_directed_acyclic_graph(g) for g in graphs)
+    assert {d.dep_type for c in cases for d in c.dependencies} == set(DependencyType)
+    loops = [any(d.src == d.dst for d in c.dependencies) for c in cases]
+    assert any(loops[1::2]) and not any(loops[::2])
+
+
+def _ignores_soft(model: ValidatedModel) -> Propagator:
+    compiled = compile_model(model)
+
+    def propagate(start: str, failure: FailureType) -> dict[str, FailureType]:
+        spread = FailureType.DEGRADED if failure is FailureType.DOWN else failure
+        return dict.fromkeys(propagate_compiled(compiled, start=start, failure=spread), failure)
+
+    return propagate  # type: ignore[return-value]
+
+
+def test_mismatches_are_shrunk_to_minimal_models(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    monkeypatch.setitem(PROPAGATION_ENGINES, "ignores_soft", _ignores_soft)
+    report = run_differential(cases=50, engines=["ignores_soft"])
+    assert report.cases < 50  # stops once every checked engine has failed
+    (failure,) = report.failures
+    assert failure.mismatch.failure is FailureType.DOWN
+
+    shrunk = failure.shrunk
+    assert len(shrunk.services) == 2
+    (dep,) = shrunk.dependencies
+    assert dep.dep_type is not DependencyType.HARD
+    assert check_case(shrunk, ["ignores_soft"]) == [failure.shrunk_mismatch]
+
+    argv = ["--cases", "50", "--engines", "ignores_soft", "--out-dir", str(tmp_path)]
+    assert differential.main(argv) == 1
+    out = capsys.readouterr().out
+    assert "MISMATCH ignores_soft failure=down" in out
+    (written,) = tmp_path.iterdir()
+    services, deps = load_domain(written)
+    assert (len(services), len(deps)) == (2, 1)
+
+
+def _first_start_only(model: ValidatedModel) -> MultiPropagator:
+    compiled = compile_model(model)
+    return lambda starts, failure: propagate_compiled_failures(
+        compiled, starts=starts[:1], failure=failure
+    )
+
+
+def test_scenario_engines_are_checked_against_the_union(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setitem(SCENARIO_ENGINES, "first_start_only", _first_start_only)
+    report = run_differential(cases=20, engines=["first_start_only", "scenarios"])
+    (failure,) = report.failures
+    m = failure.shrunk_mismatch
+    assert (m.engine, len(failure.shrunk.services)) == ("first_start_only", 2)
+    assert m.starts is not None and len(m.starts) == 2
+    assert set(m.expected) == set(m.starts)  # type: ignore[call-overload]
+
+
+def test_cli(capsys: pytest.CaptureFixture[str]) -> None:
+    assert differential.main(["--cases", "5", "--engines", "compiled_model,top_k"]) == 0
+    assert capsys.readouterr().out.startswith("checked 5 models in ")
+    with pytest.raises(SystemExit):
+        differential.main(["--engines", "nope"])
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from array import array
+from pathlib import Path
+
+import pytest
+
+from constellation_engine.cli import main as cli
+from constellation_engine.core.compact import CompactModel
+from constellation_engine.core.types import ServiceId
+from constellation_engine.core.validate import ValidationError
+from constellation_engine.io.edgelist import load_edgelist, write_edgelist
+from constellation_engine.io.loaders import ManifestError, convert_manifest
+from constellation_engine.io.stream import load_compact, load_domain
+from constellation_engine.sim.compiled import compile_model
+
+EXAMPLES = Path(__file__).resolve().parent.parent / "docs" / "examples"
+
+
+def _model(ids: list[str], edges: list[tuple[int, int]]) -> CompactModel:
+    return CompactModel(
+        ids=tuple(ServiceId(s) for s in ids),
+        src=array("i", [s for s, _ in edges]),
+        dst=array("i", [d for _, d in edges]),
+        dep_codes=array("B", [i % 2 for i in range(len(edges))]),
+        call_codes=array("B", [i // 2 % 2 for i in range(len(edges))]),
+    )
+
+
+def test_edge_list_round_trips_through_manifests(tmp_path: Path) -> None:
+    original = load_compact(EXAMPLES / "enterprise.yaml")
+    binary = tmp_path / "enterprise.cedges"
+    convert_manifest(EXAMPLES / "enterprise.yaml", binary)
+
+    loaded = load_edgelist(binary)
+    assert loaded == original
+    assert compile_model(loaded) == compile_model(original)
+
+    for suffix in (".json", ".yaml"):
+        text = tmp_path / f"enterprise{suffix}"
+        convert_manifest(binary, text)
+        assert load_compact(text) == original
+        assert load_domain(text) == load_domain(binary)
+
+
+def test_non_ascii_ids_and_empty_models(tmp_path: Path) -> None:
+    path = tmp_path / "m.cedges"
+    model = _model(["zürich", "東京", "api"], [(2, 0), (2, 1)])
+    write_edgelist(model, path)
+    assert load_edgelist(path) == model
+
+    write_edgelist(_model([], []), path)
+    assert load_edgelist(path) == _model([], [])
+
+
+def test_malformed_edge_lists_are_rejected(tmp_path: Path) -> None:
+    path = tmp_path / "m.cedges"
+    path.write_bytes(b"not an edge list")
+    with pytest.raises(ManifestError, match="not a binary edge list"):
+        load_edgelist(path)
+
+    write_edgelist(_model(["a", "b"], [(0, 1)]), path)
+    path.write_bytes(path.read_bytes()[:-1])
+    with pytest.raises(ManifestError, match="truncated"):
+        load_edgelist(path)
+
+    write_edgelist(_model(["a", "b"], [(0, 2)]), path)
+    with pytest.raises(ManifestError, match="out of range"):
+        load_edgelist(path)
+
+
+def test_edge_lists_are_validated_like_manifests(tmp_path: Path) -> None:
+    path = tmp_path / "m.cedges"
+    write_edgelist(_model(["a", "a", "b"], [(0, 0), (2, 0)]), path)
+    with pytest.raises(ValidationError) as err:
+        load_edgelist(path)
+    assert "Duplicate service IDs found: ['a']" in str(err.value)
+    assert "Service a has a self-dependency" in str(err.value)
+    assert load_edgelist(path, validate=False).num_dependencies == 2
+
+    assert cli.main(["validate", str(path), "--no-cache"]) == 2
+
+
+def test_cli_convert(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    binary = tmp_path / "e.cedges"
+    assert cli.main(["convert", str(EXAMPLES / "enterprise.yaml"), str(binary), "--no-cache"]) == 0
+    assert capsys.readouterr().out == f"wrote 27 services and 49 dependencies to {binary}\n"
+
+    assert cli.main(["criticality", str(binary), "--no-cache", "--top", "1"]) == 0
+    assert capsys.readouterr().out.splitlines()[1] == "- postgres: impacts 18 services"
+
+    with pytest.raises(ManifestError):
+        cli.main(["convert", str(binary), str(tmp_path / "copy.cedges"), "--no-cache"])
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import random
+from pathlib import Path
+
+import networkx as nx
+import pytest
+
+from constellation_engine.cli import main as cli
+from constellation_engine.core.graph import build_graph
+from constellation_engine.core.types import (
+    CallType,
+    Dependency,
+    DependencyType,
+    Service,
+    ServiceId,
+)
+from constellation_engine.sim.compiled import compile_graph, propagate_compiled_failures
+from constellation_engine.sim.explain import explain_propagation
+from constellation_engine.sim.models import FailureType
+from constellation_engine.sim.propagate import _should_propagate
+
+ENTERPRISE = str(Path(__file__).resolve().parent.parent / "docs" / "examples" / "enterprise.yaml")
+
+
+def _random_graph(seed: int, n: int = 30, m: int = 70) -> nx.DiGraph:
+    rng = random.Random(seed)
+    deps = []
+    for _ in range(m):
+        a, b = rng.sample(range(n), 2)
+        deps.append(
+            Dependency(
+                ServiceId(f"s{a}"),
+                ServiceId(f"s{b}"),
+                rng.choice(list(DependencyType)),
+                rng.choice(list(CallType)),
+            )
+        )
+    return build_graph([Service(ServiceId(f"s{i}")) for i in range(n)], deps)
+
+
+def test_explanations_are_shortest_impacting_chains() -> None:
+    for seed in range(10):
+        g = _random_graph(seed)
+        compiled = compile_graph(g)
+        starts = [ServiceId(f"s{seed}"), ServiceId(f"s{seed + 7}")]
+        for failure in FailureType:
+            prop = explain_propagation(compiled, starts=starts, failure=failure)
+            expected = propagate_compiled_failures(compiled, starts=starts, failure=failure)
+            assert list(prop.impacted.items()) == list(expected.items())
+
+            spread = nx.DiGraph()
+            spread.add_nodes_from(g.nodes)
+            spread.add_edges_from(
+                (dst, src)
+                for src, dst, a in g.edges(data=True)
+                if _should_propagate(
+                    failure=failure, dep_type=a["dep_type"], call_type=a["call_type"]
+                )
+            )
+            distance = nx.multi_source_dijkstra_path_length(spread, set(starts))
+            for svc in expected:
+                chain = prop.explain(svc)
+                assert len(chain) == distance[svc]
+                at = svc
+                for step in chain:
+                    attrs = g.edges[step.depender, step.dependency]
+                    assert step.depender == at
+                    assert step.dep_type == attrs["dep_type"]
+                    assert step.call_type == attrs["call_type"]
+                    at = step.dependency
+                assert at in starts
+
+
+def test_unknown_and_unimpacted_services() -> None:
+    compiled = compile_graph(_random_graph(0))
+    prop = explain_propagation(compiled, starts=[ServiceId("ghost")], failure=FailureType.DOWN)
+    assert prop.impacted == {ServiceId("ghost"): FailureType.DOWN}
+    assert prop.explain(ServiceId("ghost")) == ()
+    with pytest.raises(KeyError):
+        prop.explain(ServiceId("s1"))
+
+
+def test_cli_explain(capsys: pytest.CaptureFixture[str]) -> None:
+    argv = ["blast-radius", ENTERPRISE, "--no-cache", "--service", "postgres", "--failure", "down"]
+    assert cli.main(argv) == 0
+    plain = capsys.readouterr().out.splitlines()
+
+    assert cli.main([*argv, "--explain"]) == 0
+    explained = capsys.readouterr().out.splitlines()
+    assert explained[0] == plain[0]
+    assert [line.split(" (")[0] for line in explained[1:]] == plain[1:]
+    assert (
+        "- checkout: down (checkout -[hard/sync]-> payments -[hard/sync]-> postgres)" in explained
+    )
+
+    assert cli.main([*argv, "--explain", "--format", "jsonl"]) == 0
+    rows = capsys.readouterr().out.splitlines()
+    assert rows[0] == (
+        '{"service": "postgres", "failure": "down", "via": null, "dep_type": null, '
+        '"call_type": null}'
+    )
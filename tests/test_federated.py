@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from constellation_engine.bench.generators import GENERATORS, write_manifest
+from constellation_engine.cli import main as cli
+from constellation_engine.core.validate import ValidationError
+from constellation_engine.io.cache import GraphCache
+from constellation_engine.io.federated import FederatedLoader, load_federated
+from constellation_engine.io.loaders import ManifestError
+from constellation_engine.io.sources import expand_sources, is_federated
+from constellation_engine.io.stream import load_compact
+
+
+def _split(tmp_path: Path, teams: int = 8) -> tuple[Path, Path]:
+    """Write one generated model whole, and split across per-team files."""
+    services, deps = GENERATORS["layered"](240, seed=5)
+    whole = tmp_path / "whole.json"
+    write_manifest((services, deps), whole)
+
+    owner = {svc.id: i * teams // len(services) for i, svc in enumerate(services)}
+    root = tmp_path / "teams"
+    for team in range(teams):
+        mine = [s for s in services if owner[s.id] == team]
+        theirs = [d for d in deps if owner[d.src] == team]
+        (root / f"team-{team}").mkdir(parents=True)
+        write_manifest((mine, theirs), root / f"team-{team}" / "manifest.json")
+    return whole, root
+
+
+def test_directory_and_glob_merge_to_the_single_file_model(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    whole, root = _split(tmp_path)
+    expected = load_compact(whole)
+    model = load_federated(root)
+
+    assert model.ids == expected.ids
+    assert sorted(model.dependencies(), key=repr) == sorted(expected.dependencies(), key=repr)
+    assert load_federated(f"{root}/team-*/manifest.json").ids == expected.ids
+
+    argv = ["criticality", "--no-cache", "--top", "5"]
+    assert cli.main([*argv, str(whole)]) == 0
+    single = capsys.readouterr().out
+    assert cli.main([*argv, str(root)]) == 0
+    assert capsys.readouterr().out == single
+
+
+def test_only_changed_files_are_reparsed(tmp_path: Path) -> None:
+    _, root = _split(tmp_path)
+    cache = GraphCache(tmp_path / "cache")
+    loader = FederatedLoader(root, cache=cache)
+
+    loader.load()
+    assert len(loader.parsed) == 8
+    loader.load()
+    assert loader.parsed == []
+
+    edited = root / "team-3" / "manifest.json"
+    doc = json.loads(edited.read_text(encoding="utf-8"))
+    doc["services"].append({"id": "brand-new"})
+    edited.write_text(json.dumps(doc), encoding="utf-8")
+    assert "brand-new" in loader.load().ids
+    assert loader.parsed == [edited]
+
+    # A fresh loader (a new CLI run) reuses the per-file results cached on disk.
+    fresh = FederatedLoader(root, cache=cache)
+    fresh.load()
+    assert fresh.parsed == []
+
+
+def test_cache_is_evicted_once_per_load(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    _, root = _split(tmp_path)
+    cache = GraphCache(tmp_path / "cache")
+    scans = []
+    monkeypatch.setattr(cache, "evict", lambda **kw: scans.append(kw))
+    FederatedLoader(root, cache=cache).load()
+    assert len(scans) == 1
+    assert len(list((tmp_path / "cache").iterdir())) == 8
+
+
+def test_single_files_with_glob_characters_are_not_globs(tmp_path: Path) -> None:
+    manifest = tmp_path / "prod[eu].yaml"
+    manifest.write_text("services: [{id: api}, {id: db}]\ndependencies: [{src: api, dst: db}]\n")
+    (tmp_path / "prode.yaml").write_text("services: [{id: other}]\ndependencies: []\n")
+
+    assert not is_federated(manifest)
+    assert expand_sources(manifest) == [manifest]
+    assert is_federated(tmp_path / "prod[eu]-missing.yaml")
+    assert load_compact(manifest).ids == ("api", "db")
+    assert cli.main(["stats", str(manifest)]) == 0
+
+
+def test_errors_name_their_source_files(tmp_path: Path) -> None:
+    a, b = tmp_path / "a.yaml", tmp_path / "b.json"
+    a.write_text("services: [{id: api}, {id: db}]\ndependencies: [{src: api, dst: db}]\n")
+    b.write_text(
+        json.dumps(
+            {
+                "services": [{"id": "db"}, {"id": "worker"}],
+                "dependencies": [{"src": "worker", "dst": "queue"}],
+            }
+        )
+    )
+
+    with pytest.raises(ValidationError) as exc:
+        load_federated(tmp_path)
+    assert str(exc.value).splitlines()[1:] == [
+        f"{b}: Service db is already defined in {a}.",
+        f"{b}: Dependency destination queue does not exist among services.",
+    ]
+
+    assert cli.main(["validate", "--no-cache", "--fail-fast", str(tmp_path)]) == 2
+    assert FederatedLoader(tmp_path).validate(max_errors=1).truncated is True
+    b.write_text(
+        json.dumps(
+            {
+                "services": [{"id": "db"}, {"id": "worker"}],
+                "dependencies": [{"src": "worker", "dst": "db"}],
+            }
+        )
+    )
+    result = FederatedLoader(tmp_path).validate(fail_fast=True)
+    assert len(result.errors) == 1 and result.truncated is False
+
+    b.write_text('{"services": [{"id": ""}], "dependencies": []}')
+    with pytest.raises(ManifestError, match=f"^{b}: services\\[0\\].id"):
+        load_federated(tmp_path)
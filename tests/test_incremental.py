@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import json
+import random
+from pathlib import Path
+
+import pytest
+
+from constellation_engine.cli import main as cli
+from constellation_engine.core.graph import apply_delta, build_graph
+from constellation_engine.core.types import (
+    CallType,
+    Dependency,
+    DependencyType,
+    ManifestDelta,
+    Service,
+    ServiceId,
+)
+from constellation_engine.core.validate import ValidationError
+from constellation_engine.sim.criticality import compute_criticality
+from constellation_engine.sim.incremental import update_criticality
+from constellation_engine.sim.models import FailureType
+
+EXAMPLES = Path(__file__).resolve().parent.parent / "docs" / "examples"
+
+
+def _dep(rng: random.Random, a: int, b: int) -> Dependency:
+    return Dependency(
+        ServiceId(f"s{a}"),
+        ServiceId(f"s{b}"),
+        rng.choice(list(DependencyType)),
+        rng.choice(list(CallType)),
+    )
+
+
+def _random_delta(rng: random.Random, n: int, edges: list[tuple[str, str]]) -> ManifestDelta:
+    removed_svc = ServiceId(f"s{rng.randrange(n)}")
+    kept = [e for e in edges if removed_svc not in e]
+    removed_edges = tuple(
+        (ServiceId(u), ServiceId(v)) for u, v in rng.sample(kept, min(3, len(kept)))
+    )
+    alive = [i for i in range(n) if f"s{i}" != removed_svc]
+    added = []
+    for _ in range(4):
+        a, b = rng.sample(alive, 2)
+        added.append(_dep(rng, a, b))
+    added.append(Dependency(ServiceId("new"), ServiceId(f"s{alive[0]}")))
+    return ManifestDelta(
+        add_services=(Service(ServiceId("new")),),
+        remove_services=(removed_svc,),
+        add_dependencies=tuple(added),
+        remove_dependencies=removed_edges,
+    )
+
+
+def test_incremental_update_matches_full_recompute() -> None:
+    for seed in range(8):
+        rng = random.Random(seed)
+        n = 30
+        services = [Service(ServiceId(f"s{i}")) for i in range(n)]
+        deps = [_dep(rng, *rng.sample(range(n), 2)) for _ in range(60)]
+        for failure in FailureType:
+            g = build_graph(services, deps)
+            base = compute_criticality(g, failure=failure)
+            delta = _random_delta(rng, n, list(g.edges))
+
+            updated = update_criticality(g, base, delta, failure=failure)
+
+            assert updated == compute_criticality(g, failure=failure)
+
+
+def test_apply_delta_rejects_invalid_changes_without_mutating() -> None:
+    g = build_graph(
+        [Service(ServiceId("a")), Service(ServiceId("b"))],
+        [Dependency(ServiceId("a"), ServiceId("b"))],
+    )
+    delta = ManifestDelta(
+        remove_services=(ServiceId("b"),),
+        add_dependencies=(Dependency(ServiceId("a"), ServiceId("b")),),
+    )
+
+    with pytest.raises(ValidationError, match="destination b does not exist"):
+        apply_delta(g, delta)
+    assert g.has_edge(ServiceId("a"), ServiceId("b"))
+
+
+def test_cli_applies_delta_to_saved_baseline(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    manifest = str(EXAMPLES / "enterprise.yaml")
+    baseline = tmp_path / "base.json"
+    delta = tmp_path / "delta.yaml"
+    delta.write_text(
+        "remove_services: [telemetry]\n"
+        "add_dependencies:\n"
+        "  - {src: notifications, dst: postgres, dep_type: hard, call_type: sync}\n",
+        encoding="utf-8",
+    )
+
+    assert cli.main(["criticality", manifest, "--no-cache", "--save-scores", str(baseline)]) == 0
+    assert cli.main(
+        ["criticality", manifest, "--delta", str(delta), "--baseline", str(baseline), "--top", "1"]
+    ) == 0
+
+    out = capsys.readouterr().out.splitlines()
+    assert out[-1] == "- postgres: impacts 19 services"
+    assert json.loads(baseline.read_text(encoding="utf-8"))["failure"] == "down"
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+from constellation_engine.cli import main as cli
+from constellation_engine.core.graph import build_graph
+from constellation_engine.io import cache as cache_module
+from constellation_engine.io.cache import GraphCache, manifest_digest
+from constellation_engine.io.stream import load_domain
+from constellation_engine.sim.compiled import compile_graph
+
+EXAMPLES = Path(__file__).resolve().parent.parent / "docs" / "examples"
+
+
+def test_warm_run_skips_loading_and_validation(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    manifest = tmp_path / "enterprise.yaml"
+    shutil.copy(EXAMPLES / "enterprise.yaml", manifest)
+    argv = ["criticality", str(manifest), "--cache-dir", str(tmp_path / "cache")]
+
+    assert cli.main(argv) == 0
+    cold = capsys.readouterr().out
+
+    def fail(*args: object, **kwargs: object) -> None:
+        raise AssertionError("warm run must not load the manifest")
+
+    monkeypatch.setattr(cli, "load_domain", fail)
+    monkeypatch.setattr(cache_module, "load_compact", fail)
+    monkeypatch.setattr(cache_module, "compile_model", fail)
+
+    assert cli.main(argv) == 0
+    assert capsys.readouterr().out == cold
+    assert cli.main(["validate", *argv[1:]]) == 0
+
+    # --no-cache always goes back to the manifest.
+    with pytest.raises(AssertionError):
+        cli.main([*argv, "--no-cache"])
+
+
+def test_cache_key_follows_manifest_content(tmp_path: Path) -> None:
+    manifest = tmp_path / "simple.yaml"
+    shutil.copy(EXAMPLES / "simple.yaml", manifest)
+    before = manifest_digest(manifest)
+
+    manifest.write_text(manifest.read_text(encoding="utf-8") + "\n# edited\n", encoding="utf-8")
+
+    assert manifest_digest(manifest) != before
+
+
+def test_cache_round_trips_and_evicts_least_recently_used(tmp_path: Path) -> None:
+    compiled = compile_graph(build_graph(*load_domain(EXAMPLES / "enterprise.yaml")))
+    cache = GraphCache(tmp_path, max_bytes=1)
+
+    cache.put("a", compiled)
+    restored = cache.get("a")
+    assert restored is not None
+    assert restored.ids == compiled.ids
+    assert list(restored.indices) == list(compiled.indices)
+
+    # Over budget: adding a second entry evicts the first but keeps the newest.
+    cache.put("b", compiled)
+    assert cache.get("a") is None
+    assert cache.get("b") is not None
+
+
+def test_cache_hits_survive_a_failed_recency_touch(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    compiled = compile_graph(build_graph(*load_domain(EXAMPLES / "simple.yaml")))
+    cache = GraphCache(tmp_path)
+    cache.put("a", compiled)
+    cache.put_json("a", cache_module.FILE_SUFFIX, {"k": 1})
+
+    def refuse(*args: object, **kwargs: object) -> None:
+        raise PermissionError("read-only cache")
+
+    monkeypatch.setattr(cache_module.os, "utime", refuse)
+    restored = cache.get("a")
+    assert restored is not None and restored.ids == compiled.ids
+    assert cache.get_json("a", cache_module.FILE_SUFFIX) == {"k": 1}
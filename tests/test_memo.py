@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+from constellation_engine.bench.generators import GENERATORS
+from constellation_engine.cli.serve import AnalysisService
+from constellation_engine.core.types import ServiceId
+from constellation_engine.core.validate import validate_or_raise
+from constellation_engine.io.stream import load_compact
+from constellation_engine.sim.compiled import compile_model, propagate_compiled
+from constellation_engine.sim.memo import BlastRadiusCache, graph_fingerprint
+from constellation_engine.sim.models import FailureType
+
+EXAMPLES = Path(__file__).resolve().parent.parent / "docs" / "examples"
+
+
+@pytest.mark.parametrize("shape", ["layered", "large_cycles"])
+def test_cached_and_derived_results_match_propagation(shape: str) -> None:
+    compiled = compile_model(validate_or_raise(*GENERATORS[shape](300, seed=3)))
+    cache = BlastRadiusCache()
+    derived = [FailureType.DEGRADED, FailureType.LATENCY_UP]
+
+    for sid in compiled.ids:
+        for failure in [FailureType.DOWN, *derived, FailureType.DOWN]:
+            expected = propagate_compiled(compiled, start=sid, failure=failure)
+            result = cache.blast_radius(compiled, sid, failure)
+            assert list(result.items()) == list(expected.items())
+
+    stats = cache.stats()
+    n = compiled.num_nodes
+    assert (stats.misses, stats.hits, stats.derived) == (3 * n, n, 2 * n)
+
+
+def test_lru_bound_and_invalidation() -> None:
+    compiled = compile_model(load_compact(EXAMPLES / "enterprise.yaml"))
+    cache = BlastRadiusCache(maxsize=2)
+    postgres, kafka, redis = ServiceId("postgres"), ServiceId("kafka"), ServiceId("redis")
+
+    for sid in (postgres, kafka, postgres, redis):
+        cache.blast_radius(compiled, sid, FailureType.DOWN)
+    # kafka was least recently used when redis arrived.
+    cache.blast_radius(compiled, kafka, FailureType.DOWN)
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions, stats.size) == (1, 4, 2, 2)
+
+    cache.invalidate(graph_fingerprint(compiled))
+    assert cache.stats().size == 0
+    assert cache.blast_radius(compiled, ServiceId("ghost"), FailureType.DOWN) == {
+        "ghost": FailureType.DOWN
+    }
+
+
+def test_service_reports_cache_stats_and_drops_entries_on_reload(tmp_path: Path) -> None:
+    manifest = tmp_path / "simple.yaml"
+    shutil.copy(EXAMPLES / "simple.yaml", manifest)
+    service = AnalysisService(manifest)
+    query = {"service": "db", "failure": "down"}
+
+    first = service.handle("/blast-radius", query)
+    assert service.handle("/blast-radius", query) == first
+    assert service.handle("/cache-stats", {})[1]["hits"] == 1
+
+    manifest.write_text(
+        "services: [{id: db}, {id: app}]\ndependencies: [{src: app, dst: db}]\n",
+        encoding="utf-8",
+    )
+    assert service.reload_if_changed()
+    assert service.handle("/cache-stats", {})[1]["size"] == 0
+    impacted = service.handle("/blast-radius", query)[1]["impacted"]
+    assert [row["service"] for row in impacted] == ["db", "app"]
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import json
+import random
+from pathlib import Path
+
+import pytest
+
+from constellation_engine.cli import main as cli
+from constellation_engine.core.compact import DEP_TYPES
+from constellation_engine.core.graph import build_graph
+from constellation_engine.core.index import build_index, parse_filters
+from constellation_engine.core.types import Dependency, DependencyType, Service, ServiceId
+from constellation_engine.core.validate import validate_or_raise
+from constellation_engine.sim.compiled import (
+    CompiledGraph,
+    compile_graph,
+    edge_selection,
+    subgraph,
+)
+from constellation_engine.sim.criticality import compute_criticality
+from constellation_engine.sim.models import FailureType
+
+MANIFEST = {
+    "services": [
+        {"id": "web", "metadata": {"tier": 1, "region": "us-east", "team": "edge"}},
+        {"id": "api", "metadata": {"tier": 1, "region": "eu-west", "tags": ["public", "pii"]}},
+        {"id": "auth", "metadata": {"tier": "1", "region": "us-east"}},
+        {"id": "db", "metadata": {"tier": 0, "owner": {"team": "data"}}},
+        {"id": "batch"},
+    ],
+    "dependencies": [
+        {"src": "web", "dst": "api", "metadata": {"critical": True}},
+        {"src": "api", "dst": "auth", "metadata": {"critical": False}},
+        {"src": "api", "dst": "db", "metadata": {"critical": True}},
+        {"src": "auth", "dst": "db"},
+        {"src": "batch", "dst": "db", "metadata": {"critical": True}},
+    ],
+}
+
+
+def _model() -> tuple[list[Service], list[Dependency]]:
+    services = [
+        Service(ServiceId(s["id"]), metadata=s.get("metadata")) for s in MANIFEST["services"]
+    ]
+    deps = [
+        Dependency(ServiceId(d["src"]), ServiceId(d["dst"]), metadata=d.get("metadata"))
+        for d in MANIFEST["dependencies"]
+    ]
+    return services, deps
+
+
+def test_index_selects_services_and_dependencies() -> None:
+    services, deps = _model()
+    index = build_index(build_graph(services, deps))
+    assert build_index(validate_or_raise(services, deps)) == index
+
+    assert index.select_services({"tier": ["1"]}) == {"web", "api", "auth"}
+    assert index.select_services({"tier": ["1"], "region": ["us-east"]}) == {"web", "auth"}
+    assert index.select_services({"region": ["us-east", "eu-west"]}) == {"web", "api", "auth"}
+    assert index.select_services({"tags": ["pii"]}) == {"api"}
+    assert index.select_services({"owner.team": ["data"]}) == {"db"}
+    assert index.select_services({"tier": ["7"]}) == set()
+    assert index.select_dependencies({"critical": ["true"]}) == {
+        ("web", "api"),
+        ("api", "db"),
+        ("batch", "db"),
+    }
+
+    assert parse_filters(["tier=1", "region=us-east", "tier=2"]) == {
+        "tier": ["1", "2"],
+        "region": ["us-east"],
+    }
+    with pytest.raises(ValueError, match="KEY=VALUE"):
+        parse_filters(["tier"])
+
+
+def test_subgraph_keeps_selected_nodes_and_edges() -> None:
+    for seed in range(20):
+        rng = random.Random(seed)
+        n = rng.randint(2, 20)
+        services = [Service(ServiceId(f"s{i}")) for i in range(n)]
+        deps = {}
+        for _ in range(rng.randint(0, 3 * n)):
+            a, b = rng.sample(range(n), 2)
+            deps[a, b] = Dependency(
+                ServiceId(f"s{a}"), ServiceId(f"s{b}"), rng.choice(list(DependencyType))
+            )
+        g = build_graph(services, list(deps.values()))
+        compiled = compile_graph(g)
+
+        nodes = set(rng.sample(sorted(g.nodes), rng.randint(0, n)))
+        pairs = {e for e in g.edges if rng.random() < 0.5}
+        picked = subgraph(
+            compiled,
+            nodes=[compiled.index[s] for s in nodes],
+            edges=edge_selection(compiled, pairs),
+        )
+        assert picked.ids == tuple(s for s in compiled.ids if s in nodes)
+        assert _edges(picked) == {
+            (src, dst, g.edges[src, dst]["dep_type"])
+            for src, dst in pairs
+            if src in nodes and dst in nodes
+        }
+        assert subgraph(compiled) == compiled
+
+
+def _edges(compiled: CompiledGraph) -> set[tuple[ServiceId, ServiceId, DependencyType]]:
+    ids = compiled.ids
+    return {
+        (ids[compiled.indices[k]], ids[v], DEP_TYPES[compiled.dep_codes[k]])
+        for v in range(compiled.num_nodes)
+        for k in range(compiled.indptr[v], compiled.indptr[v + 1])
+    }
+
+
+def test_scoped_criticality_matches_full_scores() -> None:
+    rng = random.Random(7)
+    n = 300
+    services = [Service(ServiceId(f"s{i}")) for i in range(n)]
+    deps = {
+        (a, b): Dependency(ServiceId(f"s{a}"), ServiceId(f"s{b}"))
+        for a, b in (rng.sample(range(n), 2) for _ in range(600))
+    }
+    g = build_graph(services, list(deps.values()))
+    full = compute_criticality(g, failure=FailureType.DOWN)
+    for size in (1, 3, 200):  # per-service BFS, then the full pass
+        chosen = rng.sample(sorted(full), size)
+        scoped = compute_criticality(g, failure=FailureType.DOWN, services=chosen)
+        assert scoped == {s: full[s] for s in chosen}
+    with pytest.raises(ValueError, match="Unknown services: nope"):
+        compute_criticality(g, services=[ServiceId("nope")])
+
+
+def test_cli_where(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    path = tmp_path / "m.json"
+    path.write_text(json.dumps(MANIFEST), encoding="utf-8")
+    base = [str(path), "--no-cache"]
+
+    assert cli.main(["stats", *base, "--where", "tier=1"]) == 0
+    assert capsys.readouterr().out.splitlines()[:2] == ["nodes: 3", "edges: 2"]
+    assert cli.main(["stats", *base, "--where-dependency", "critical=true"]) == 0
+    assert capsys.readouterr().out.splitlines()[:2] == ["nodes: 5", "edges: 3"]
+
+    assert cli.main(
+        ["blast-radius", *base, "--where", "region=us-east", "--failure", "down"]
+    ) == 0
+    assert capsys.readouterr().out.splitlines() == [
+        "blast radius from services where region=us-east (down) [impacts dependers]:",
+        "- web: down",
+        "- auth: down",
+        "- api: down",
+    ]
+    argv = ["blast-radius", *base, "--service", "db", "--failure", "down"]
+    assert cli.main([*argv, "--where-dependency", "critical=true", "--format", "csv"]) == 0
+    assert capsys.readouterr().out.splitlines() == [
+        "service,failure",
+        "db,down",
+        "api,down",
+        "batch,down",
+        "web,down",
+    ]
+
+    assert cli.main(["criticality", *base, "--where", "tier=0", "--where", "tier=1"]) == 0
+    assert capsys.readouterr().out.splitlines() == [
+        "criticality ranking (failure=down):",
+        "- db: impacts 5 services",
+        "- auth: impacts 3 services",
+        "- api: impacts 2 services",
+        "- web: impacts 1 services",
+    ]
+
+    assert cli.main(["criticality", *base, "--where", "team=nobody"]) == 2
+    assert capsys.readouterr().out == "no services match team=nobody\n"
+    with pytest.raises(SystemExit):
+        cli.main(["stats", *base, "--where", "tier"])
+    with pytest.raises(SystemExit):
+        cli.main(["blast-radius", *base, "--where", "tier=1"])
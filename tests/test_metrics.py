@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from constellation_engine.cli import main as cli
+from constellation_engine.core.graph import build_graph
+from constellation_engine.core.metrics import StageMetrics, add_hook, recording, stage
+from constellation_engine.io.stream import load_domain
+from constellation_engine.sim.criticality import compute_criticality
+
+EXAMPLES = Path(__file__).resolve().parent.parent / "docs" / "examples"
+
+
+def test_recording_collects_library_stages_and_hooks() -> None:
+    seen: list[str] = []
+    remove = add_hook(lambda st: seen.append(st.name))
+    try:
+        with recording(trace_memory=True) as rec:
+            g = build_graph(*load_domain(EXAMPLES / "enterprise.yaml"))
+            with stage("criticality"):
+                compute_criticality(g)
+    finally:
+        remove()
+
+    names = [st.name for st in rec.stages]
+    assert names == ["validate", "build_graph", "criticality"]
+    assert seen == names
+    build = rec.stages[1]
+    assert (build.nodes, build.edges) == (27, 49)
+    assert rec.stages[2].edges_visited > 0
+    assert all(st.peak_bytes is not None for st in rec.stages)
+
+
+def test_stage_is_a_no_op_when_not_recording() -> None:
+    with stage("anything") as st:
+        pass
+    assert st is None
+
+
+def test_cli_writes_metrics_and_profile(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    metrics = tmp_path / "metrics.json"
+    prof = tmp_path / "run.prof"
+    argv = [
+        "criticality",
+        str(EXAMPLES / "enterprise.yaml"),
+        "--no-cache",
+        "--profile",
+        "--metrics-out",
+        str(metrics),
+        "--profile-out",
+        str(prof),
+    ]
+
+    assert cli.main(argv) == 0
+
+    stages = [StageMetrics(**st) for st in json.loads(metrics.read_text())["stages"]]
+    assert [st.name for st in stages] == [
+        "load",
+        "validate",
+        "compile",
+        "criticality",
+    ]
+    assert prof.stat().st_size > 0
+    assert "criticality" in capsys.readouterr().err
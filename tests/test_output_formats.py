@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+import random
+from pathlib import Path
+
+import pytest
+
+from constellation_engine.cli import main as cli
+from constellation_engine.core.types import ServiceId
+from constellation_engine.io.report import write_rows
+from constellation_engine.sim.criticality import top_critical
+
+ENTERPRISE = str(Path(__file__).resolve().parent.parent / "docs" / "examples" / "enterprise.yaml")
+
+
+def test_top_critical_matches_a_full_sort_with_id_tie_breaks() -> None:
+    rng = random.Random(7)
+    scores = [(ServiceId(f"svc-{i:03d}"), rng.randint(1, 5)) for i in range(200)]
+    rng.shuffle(scores)
+    expected = sorted(scores, key=lambda x: (-x[1], x[0]))
+
+    for k in (0, 1, 10, 200, 500):
+        assert top_critical(iter(scores), k) == expected[:k]
+    assert top_critical(scores) == expected
+
+
+@pytest.mark.parametrize("fmt", ["jsonl", "csv", "json"])
+def test_formats_round_trip_the_same_rows(fmt: str) -> None:
+    rows = [{"service": "a", "impacts": 3}, {"service": "b,c", "impacts": 1}]
+    out = io.StringIO()
+    assert write_rows(iter(rows), ("service", "impacts"), fmt, out) == 2
+
+    text = out.getvalue()
+    if fmt == "jsonl":
+        parsed = [json.loads(line) for line in text.splitlines()]
+    elif fmt == "json":
+        parsed = json.loads(text)
+    else:
+        parsed = [{**r, "impacts": int(r["impacts"])} for r in csv.DictReader(io.StringIO(text))]
+    assert parsed == rows
+
+    empty = io.StringIO()
+    write_rows([], ("service",), fmt, empty)
+    if fmt == "json":
+        assert json.loads(empty.getvalue()) == []
+
+
+def test_cli_machine_formats_agree_with_text(capsys: pytest.CaptureFixture[str]) -> None:
+    argv = ["criticality", ENTERPRISE, "--no-cache", "--top", "0"]
+    assert cli.main(argv) == 0
+    text = capsys.readouterr().out.splitlines()[1:]
+
+    assert cli.main([*argv, "--format", "jsonl"]) == 0
+    rows = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [f"- {r['service']}: impacts {r['impacts']} services" for r in rows] == text
+    assert len(rows) == 27
+
+    argv = ["blast-radius", ENTERPRISE, "--no-cache", "--service", "kafka", "--failure", "down"]
+    assert cli.main(argv) == 0
+    text = capsys.readouterr().out.splitlines()[1:]
+    assert cli.main([*argv, "--format", "csv"]) == 0
+    rows = list(csv.DictReader(io.StringIO(capsys.readouterr().out)))
+    assert [f"- {r['service']}: {r['failure']}" for r in rows] == text
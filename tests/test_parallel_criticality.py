@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from constellation_engine.core.graph import build_graph
+from constellation_engine.io.loaders import load_manifest, manifest_to_domain
+from constellation_engine.sim.compiled import compile_graph, pack_into, packed_size, unpack
+from constellation_engine.sim.criticality import compute_criticality
+from constellation_engine.sim.models import FailureType
+
+EXAMPLES = Path(__file__).resolve().parent.parent / "docs" / "examples"
+
+
+def _enterprise_graph():  # type: ignore[no-untyped-def]
+    services, deps = manifest_to_domain(load_manifest(EXAMPLES / "enterprise.yaml"))
+    return build_graph(services, deps)
+
+
+def test_packed_graph_round_trips() -> None:
+    compiled = compile_graph(_enterprise_graph())
+    buf = memoryview(bytearray(packed_size(compiled)))
+    pack_into(compiled, buf)
+
+    restored = unpack(buf)
+
+    assert restored.ids == compiled.ids
+    assert list(restored.indptr) == list(compiled.indptr)
+    assert list(restored.indices) == list(compiled.indices)
+    for failure in FailureType:
+        assert bytes(restored.masks[failure]) == bytes(compiled.masks[failure])
+
+
+def test_parallel_criticality_matches_serial() -> None:
+    g = _enterprise_graph()
+    for failure in FailureType:
+        serial = compute_criticality(g, failure=failure)
+        parallel = compute_criticality(g, failure=failure, workers=2)
+        assert list(parallel.items()) == list(serial.items())
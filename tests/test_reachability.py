@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import random
+
+import networkx as nx
+import pytest
+
+from constellation_engine.bench.generators import GENERATORS
+from constellation_engine.core.compact import compact_model
+from constellation_engine.core.graph import build_graph
+from constellation_engine.core.types import (
+    CallType,
+    Dependency,
+    DependencyType,
+    Service,
+    ServiceId,
+)
+from constellation_engine.core.validate import validate_or_raise
+from constellation_engine.sim.compiled import compile_graph, compile_model
+from constellation_engine.sim.criticality import compute_criticality, top_critical
+from constellation_engine.sim.models import FailureType
+from constellation_engine.sim.propagate import propagate_failure
+from constellation_engine.sim.reachability import condense, top_counts
+
+
+def _random_graph(seed: int, n: int = 40, m: int = 90) -> nx.DiGraph:
+    rng = random.Random(seed)
+    services = [Service(ServiceId(f"s{i}")) for i in range(n)]
+    deps = []
+    for _ in range(m):
+        a, b = rng.sample(range(n), 2)
+        deps.append(
+            Dependency(
+                ServiceId(f"s{a}"),
+                ServiceId(f"s{b}"),
+                rng.choice(list(DependencyType)),
+                rng.choice(list(CallType)),
+            )
+        )
+    return build_graph(services, deps)
+
+
+def test_criticality_matches_per_node_propagation_on_cyclic_graphs() -> None:
+    for seed in range(5):
+        g = _random_graph(seed)
+        for failure in FailureType:
+            expected = {
+                node: len(propagate_failure(g, start=node, failure=failure)) for node in g.nodes
+            }
+            assert compute_criticality(g, failure=failure) == expected
+
+
+def test_condense_orders_components_reverse_topologically() -> None:
+    services = [Service(ServiceId(s)) for s in ("a", "b", "c", "d")]
+    deps = [
+        Dependency(ServiceId("a"), ServiceId("b")),
+        Dependency(ServiceId("b"), ServiceId("a")),
+        Dependency(ServiceId("a"), ServiceId("c")),
+        Dependency(ServiceId("d"), ServiceId("a")),
+    ]
+    compiled = compile_graph(build_graph(services, deps))
+
+    comp, components = condense(compiled, FailureType.DOWN)
+    a, b, c, d = (compiled.index[ServiceId(s)] for s in "abcd")
+
+    assert comp[a] == comp[b]
+    assert len(components) == 3
+    # c fails into {a, b}, which fails into d: impacted components come first.
+    assert comp[d] < comp[a] < comp[c]
+    assert compute_criticality(compiled)[ServiceId("c")] == 4
+
+
+def test_top_k_ranking_matches_the_full_ranking() -> None:
+    for seed in range(5):
+        compiled = compile_graph(_random_graph(seed))
+        for failure in FailureType:
+            full = compute_criticality(compiled, failure=failure)
+            for k in (1, 3, 10, 40, 100):
+                expected = top_critical(full.items(), k)
+                top = compute_criticality(compiled, failure=failure, top_k=k)
+                assert list(top.items()) == expected
+
+
+@pytest.mark.parametrize("shape", sorted(GENERATORS))
+def test_top_k_prunes_and_stays_exact_on_generated_topologies(shape: str) -> None:
+    model = validate_or_raise(*GENERATORS[shape](2000, seed=4))
+    compiled = compile_model(compact_model(model, metadata=False))
+    full = compute_criticality(compiled)
+
+    counts = top_counts(compiled, FailureType.DOWN, 20)
+    assert all(full[compiled.ids[v]] == n for v, n in counts.items())
+    if shape in ("layered", "scale_free"):
+        assert len(counts) < len(full) // 10
+    assert list(compute_criticality(compiled, top_k=20).items()) == top_critical(full.items(), 20)
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import importlib
+import json
+from pathlib import Path
+
+import pytest
+
+from constellation_engine.cli import main as cli
+from constellation_engine.core.graph import build_graph
+from constellation_engine.core.types import ServiceId
+from constellation_engine.io.loaders import ManifestError, load_scenarios
+from constellation_engine.io.stream import load_domain
+from constellation_engine.sim.compiled import compile_graph, propagate_compiled_failures
+from constellation_engine.sim.models import FailureType, Scenario
+from constellation_engine.sim.propagate import propagate_failure, propagate_failures
+from constellation_engine.sim.scenarios import evaluate_scenarios
+
+EXAMPLES = Path(__file__).resolve().parent.parent / "docs" / "examples"
+
+
+def test_multi_source_propagation_is_union_of_single_sources() -> None:
+    g = build_graph(*load_domain(EXAMPLES / "enterprise.yaml"))
+    compiled = compile_graph(g)
+    starts = [ServiceId("redis"), ServiceId("kafka"), ServiceId("elastic")]
+
+    for failure in FailureType:
+        expected = propagate_failures(g, starts=starts, failure=failure)
+        union: set[ServiceId] = set()
+        for s in starts:
+            union |= set(propagate_failure(g, start=s, failure=failure))
+
+        assert set(expected) == union
+        actual = propagate_compiled_failures(compiled, starts=starts, failure=failure)
+        assert list(actual.items()) == list(expected.items())
+
+
+def test_evaluate_scenarios_yields_one_result_per_scenario(tmp_path: Path) -> None:
+    p = tmp_path / "scenarios.yaml"
+    p.write_text(
+        """
+scenarios:
+  - name: zone-a
+    services: [db, auth]
+  - name: auth-slow
+    services: [auth]
+    failure: latency_up
+""".strip(),
+        encoding="utf-8",
+    )
+    scenarios = load_scenarios(p, default_failure=FailureType.DEGRADED)
+    compiled = compile_graph(build_graph(*load_domain(EXAMPLES / "simple.yaml")))
+
+    results = list(evaluate_scenarios(compiled, scenarios))
+
+    assert scenarios[0] == Scenario(
+        "zone-a", (ServiceId("db"), ServiceId("auth")), FailureType.DEGRADED
+    )
+    assert [list(impacted) for _, impacted in results] == [
+        ["db", "auth", "api"],
+        ["auth", "api"],
+    ]
+
+
+def test_load_scenarios_rejects_empty_service_lists(tmp_path: Path) -> None:
+    p = tmp_path / "scenarios.yaml"
+    p.write_text("scenarios:\n  - name: empty\n    services: []\n", encoding="utf-8")
+
+    with pytest.raises(ManifestError, match="services must be a non-empty list"):
+        load_scenarios(p)
+
+
+def test_cli_blast_radius_scenarios(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    p = tmp_path / "scenarios.yaml"
+    p.write_text("scenarios:\n  - name: db\n    services: [db]\n", encoding="utf-8")
+
+    argv = ["blast-radius", str(EXAMPLES / "simple.yaml"), "--no-cache", "--scenarios", str(p)]
+    assert cli.main(argv) == 0
+
+    assert capsys.readouterr().out.splitlines() == [
+        "scenario db (down) [db]: impacts 3 services",
+        "- db: down",
+        "- auth: down",
+        "- api: down",
+    ]
+
+
+@pytest.mark.parametrize(
+    ("flags", "module", "name"),
+    [
+        ([], "constellation_engine.sim.scenarios", "propagate_compiled_failures"),
+        (["--explain"], "constellation_engine.sim.explain", "explain_propagation"),
+        (["--timed"], "constellation_engine.sim.timed", "timed_propagation"),
+    ],
+)
+def test_cli_writes_each_scenario_before_evaluating_the_next(
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+    monkeypatch: pytest.MonkeyPatch,
+    flags: list[str],
+    module: str,
+    name: str,
+) -> None:
+    p = tmp_path / "scenarios.yaml"
+    p.write_text(
+        "scenarios:\n  - name: db\n    services: [db]\n  - name: auth\n    services: [auth]\n",
+        encoding="utf-8",
+    )
+    written: list[str] = []
+    engine = getattr(importlib.import_module(module), name)
+
+    def spy(*args: object, **kwargs: object) -> object:
+        written.append(capsys.readouterr().out)
+        return engine(*args, **kwargs)
+
+    monkeypatch.setattr(f"{module}.{name}", spy)
+    argv = ["blast-radius", str(EXAMPLES / "simple.yaml"), "--no-cache", "--scenarios", str(p)]
+    assert cli.main([*argv, *flags, "--format", "jsonl"]) == 0
+
+    before_first, before_second = written
+    assert before_first == ""
+    assert [json.loads(line)["scenario"] for line in before_second.splitlines()] == ["db"] * 3
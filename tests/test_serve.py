@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import json
+import shutil
+import threading
+import time
+import urllib.request
+from pathlib import Path
+from typing import Any, Callable, cast
+
+from constellation_engine.cli.serve import AnalysisService, make_server, watch
+
+EXAMPLES = Path(__file__).resolve().parent.parent / "docs" / "examples"
+
+
+def _get(port: int, url: str) -> tuple[int, Any]:
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}{url}") as resp:
+            return resp.status, json.loads(resp.read())
+    except urllib.error.HTTPError as exc:
+        return exc.code, json.loads(exc.read())
+
+
+def test_server_answers_queries_over_http(tmp_path: Path) -> None:
+    manifest = tmp_path / "enterprise.yaml"
+    shutil.copy(EXAMPLES / "enterprise.yaml", manifest)
+    server = make_server(AnalysisService(manifest), port=0)
+    port = cast(Any, server).server_port
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        assert _get(port, "/validate") == (200, {"ok": True, "errors": []})
+
+        status, stats = _get(port, "/stats")
+        assert (status, stats["nodes"]) == (200, 27)
+
+        status, blast = _get(port, "/blast-radius?service=postgres&failure=down")
+        assert len(blast["impacted"]) == 18
+
+        status, crit = _get(port, "/criticality?top=2")
+        assert crit["ranking"] == [
+            {"service": "postgres", "impacts": 18},
+            {"service": "telemetry", "impacts": 16},
+        ]
+
+        assert _get(port, "/blast-radius")[0] == 400
+        assert _get(port, "/nope")[0] == 404
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_hot_reload_swaps_graph_and_keeps_serving_on_bad_edit(tmp_path: Path) -> None:
+    manifest = tmp_path / "simple.yaml"
+    shutil.copy(EXAMPLES / "simple.yaml", manifest)
+    service = AnalysisService(manifest)
+    assert service.handle("/stats", {})[1]["nodes"] == 3
+
+    manifest.write_text(
+        "services: [{id: a}, {id: b}]\ndependencies: [{src: a, dst: b}]\n", encoding="utf-8"
+    )
+    assert service.reload_if_changed()
+    assert service.handle("/stats", {})[1]["nodes"] == 2
+    assert not service.reload_if_changed()
+
+    manifest.write_text(
+        "services: [{id: a}]\ndependencies: [{src: a, dst: zz}]\n", encoding="utf-8"
+    )
+    assert not service.reload_if_changed()
+    assert service.handle("/stats", {})[1]["nodes"] == 2
+    status, result = service.handle("/validate", {})
+    assert not result["ok"]
+    assert "Dependency destination zz does not exist among services." in result["errors"]
+
+
+def test_watcher_survives_a_malformed_yaml_save(tmp_path: Path) -> None:
+    manifest = tmp_path / "simple.yaml"
+    shutil.copy(EXAMPLES / "simple.yaml", manifest)
+    service = AnalysisService(manifest)
+    stop = threading.Event()
+    watcher = threading.Thread(target=watch, args=(service, stop, 0.01), daemon=True)
+    watcher.start()
+    try:
+        manifest.write_text("services: [{id: a}\ndependencies: [\n", encoding="utf-8")
+        _wait_for(lambda: not service.handle("/validate", {})[1]["ok"])
+        assert watcher.is_alive()
+        assert service.handle("/stats", {})[1]["nodes"] == 3
+
+        manifest.write_text("services: [{id: a}, {id: b}]\ndependencies: []\n", encoding="utf-8")
+        _wait_for(lambda: service.handle("/stats", {})[1]["nodes"] == 2)
+        assert service.handle("/validate", {})[1] == {"ok": True, "errors": []}
+    finally:
+        stop.set()
+        watcher.join()
+
+
+def _wait_for(condition: Callable[[], bool], timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from constellation_engine.bench.generators import GENERATORS
+from constellation_engine.core.compact import compact_model
+from constellation_engine.core.validate import validate_or_raise
+from constellation_engine.sim.compiled import compile_model
+from constellation_engine.sim.criticality import compute_criticality
+from constellation_engine.sim.models import FailureType
+from constellation_engine.sim.sketch import _merge, relative_error
+
+
+def test_merge_is_a_register_wise_maximum() -> None:
+    rng = random.Random(3)
+    m = 256
+    guards = int.from_bytes(b"\x80" * m, "little")
+    for _ in range(20):
+        a = bytes(rng.randrange(64) for _ in range(m))
+        b = bytes(rng.randrange(64) for _ in range(m))
+        merged = _merge(int.from_bytes(a, "little"), int.from_bytes(b, "little"), guards)
+        assert merged.to_bytes(m, "little") == bytes(map(max, a, b))
+
+
+@pytest.mark.parametrize("shape", sorted(GENERATORS))
+@pytest.mark.parametrize("failure", list(FailureType))
+def test_estimates_are_within_the_documented_error(shape: str, failure: FailureType) -> None:
+    model = validate_or_raise(*GENERATORS[shape](3000, seed=11))
+    compiled = compile_model(compact_model(model, metadata=False))
+    exact = compute_criticality(compiled, failure=failure)
+
+    # A small sketch (256 registers, 6.5% standard error) so most sizes are estimated.
+    precision = 8
+    estimated = compute_criticality(
+        compiled, failure=failure, approximate=True, precision=precision
+    )
+    errors = [abs(estimated[s] - n) / n for s, n in exact.items()]
+
+    bound = relative_error(precision)
+    assert sum(errors) / len(errors) <= bound
+    assert max(errors) <= 4 * bound
+    # Impacted sets of up to 2**precision / 16 nodes are counted exactly.
+    assert all(estimated[s] == n for s, n in exact.items() if n <= 16)
+
+
+def test_precision_and_workers_are_checked() -> None:
+    compiled = compile_model(compact_model(validate_or_raise([], []), metadata=False))
+    with pytest.raises(ValueError, match="precision"):
+        compute_criticality(compiled, approximate=True, precision=3)
+    with pytest.raises(ValueError, match="single process"):
+        compute_criticality(compiled, approximate=True, workers=2)
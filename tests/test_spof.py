@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import random
+from pathlib import Path
+
+import networkx as nx
+import pytest
+
+from constellation_engine.cli import main as cli
+from constellation_engine.core.graph import build_graph
+from constellation_engine.core.types import (
+    CallType,
+    Dependency,
+    DependencyType,
+    Service,
+    ServiceId,
+)
+from constellation_engine.sim.compiled import compile_graph
+from constellation_engine.sim.spof import postdominators, single_points_of_failure
+
+ENTERPRISE = str(Path(__file__).resolve().parent.parent / "docs" / "examples" / "enterprise.yaml")
+
+
+def _expected_postdominators(g: nx.DiGraph) -> dict[ServiceId, ServiceId | None]:
+    """Dominators of the reversed hard sync graph, rooted at a sink below every end."""
+    impact = nx.DiGraph()
+    impact.add_nodes_from(g.nodes)
+    for src, dst, attrs in g.edges(data=True):
+        if attrs["dep_type"] is DependencyType.HARD and attrs["call_type"] is CallType.SYNC:
+            impact.add_edge(dst, src)
+    sink = object()
+    impact.add_edges_from((sink, v) for v in g.nodes if impact.in_degree(v) == 0)
+    reached = nx.descendants(impact, sink)
+    impact.add_edges_from((sink, v) for v in g.nodes if v not in reached)
+    idom = nx.immediate_dominators(impact, sink)
+    return {v: None if idom[v] is sink else idom[v] for v in g.nodes}
+
+
+def test_postdominators_match_networkx_on_random_graphs() -> None:
+    for seed in range(60):
+        rng = random.Random(seed)
+        n = rng.randint(2, 30)
+        deps = {}
+        for _ in range(rng.randint(0, 3 * n)):
+            a, b = rng.sample(range(n), 2)
+            deps[a, b] = Dependency(
+                ServiceId(f"s{a}"),
+                ServiceId(f"s{b}"),
+                rng.choice([DependencyType.HARD] * 3 + [DependencyType.SOFT]),
+                rng.choice([CallType.SYNC] * 3 + [CallType.ASYNC]),
+            )
+        g = build_graph([Service(ServiceId(f"s{i}")) for i in range(n)], list(deps.values()))
+        compiled = compile_graph(g)
+
+        idom = postdominators(compiled)
+        actual = {sid: None if d == -1 else compiled.ids[d] for sid, d in zip(compiled.ids, idom)}
+        assert actual == _expected_postdominators(g), seed
+
+
+def test_soft_and_async_paths_are_not_followed() -> None:
+    services = [Service(ServiceId(s)) for s in ("web", "api", "db", "cache")]
+    deps = [
+        Dependency(ServiceId("web"), ServiceId("api")),
+        Dependency(ServiceId("api"), ServiceId("db")),
+        Dependency(ServiceId("api"), ServiceId("cache"), dep_type=DependencyType.SOFT),
+    ]
+    spofs = single_points_of_failure(build_graph(services, deps))
+    assert spofs == {ServiceId("web"): (ServiceId("api"), ServiceId("db"))}
+
+    deps.append(Dependency(ServiceId("web"), ServiceId("cache")))
+    spofs = single_points_of_failure(build_graph(services, deps))
+    assert spofs == {ServiceId("web"): ()}
+
+
+def test_cli_spof(capsys: pytest.CaptureFixture[str]) -> None:
+    assert cli.main(["spof", ENTERPRISE, "--no-cache", "--entry", "web-frontend"]) == 0
+    assert capsys.readouterr().out.splitlines()[1:] == ["- web-frontend: api-gateway -> postgres"]
+
+    assert cli.main(["spof", ENTERPRISE, "--no-cache", "--format", "jsonl"]) == 0
+    assert '{"entry": "shipping", "service": "postgres", "depth": 1}' in capsys.readouterr().out
+
+    assert cli.main(["spof", ENTERPRISE, "--no-cache", "--entry", "nope"]) == 2
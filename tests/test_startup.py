@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from constellation_engine.bench.generators import GENERATORS, write_manifest
+from constellation_engine.bench.startup import HEAVY_MODULES, measure_startup
+
+EXAMPLES = Path(__file__).resolve().parent.parent / "docs" / "examples"
+
+
+@pytest.mark.parametrize("command", ["validate", "stats", "blast-radius", "criticality"])
+def test_json_commands_do_not_import_heavy_dependencies(command: str, tmp_path: Path) -> None:
+    manifest = tmp_path / "m.json"
+    write_manifest(GENERATORS["layered"](30, seed=0), manifest)
+    extra = ["--service", "svc-0", "--failure", "down"] if command == "blast-radius" else []
+
+    row = measure_startup([command, "--no-cache", str(manifest), *extra], repeat=1)
+
+    assert row["heavy_modules"] == []
+
+
+def test_yaml_manifests_still_load_pyyaml_on_demand() -> None:
+    code = (
+        "import sys\n"
+        "from constellation_engine.cli.main import main\n"
+        f"main(['stats', '--no-cache', {str(EXAMPLES / 'simple.yaml')!r}])\n"
+        f"print(__import__('json').dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))\n"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+    assert json.loads(out.stdout.splitlines()[-1]) == ["yaml"]
+
+
+DEFERRED = (
+    "concurrent.futures",
+    "multiprocessing",
+    "tempfile",
+    "constellation_engine.io.federated",
+    "constellation_engine.io.edgelist",
+    "constellation_engine.cli.commands",
+)
+
+
+@pytest.mark.parametrize("command", ["validate", "stats"])
+def test_single_file_runs_defer_pools_caches_and_analyses(command: str, tmp_path: Path) -> None:
+    manifest = tmp_path / "m.json"
+    write_manifest(GENERATORS["layered"](30, seed=0), manifest)
+    code = (
+        "import sys\n"
+        "from constellation_engine.cli.main import main\n"
+        f"main([{command!r}, '--no-cache', {str(manifest)!r}])\n"
+        f"print(__import__('json').dumps([m for m in {DEFERRED!r} if m in sys.modules]))\n"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+    assert json.loads(out.stdout.splitlines()[-1]) == []
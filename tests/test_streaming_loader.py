@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import json
+import re
+from pathlib import Path
+
+import pytest
+
+from constellation_engine.io import stream
+from constellation_engine.io.loaders import ManifestError, load_manifest, manifest_to_domain
+from constellation_engine.io.stream import load_domain
+
+EXAMPLES = Path(__file__).resolve().parent.parent / "docs" / "examples"
+
+
+def test_streaming_loader_matches_load_manifest(tmp_path: Path) -> None:
+    yaml_path = EXAMPLES / "enterprise.yaml"
+    expected = manifest_to_domain(load_manifest(yaml_path))
+
+    json_path = tmp_path / "enterprise.json"
+    doc = {
+        "version": 1,
+        "services": [
+            {"id": s.id, "name": s.name, "metadata": {"tier": 1}} for s in expected[0]
+        ],
+        "dependencies": [
+            {"src": d.src, "dst": d.dst, "dep_type": d.dep_type.value, "call_type": "sync"}
+            for d in expected[1]
+        ],
+    }
+    json_path.write_text(json.dumps(doc, indent=2), encoding="utf-8")
+
+    assert load_domain(yaml_path) == expected
+    assert load_domain(json_path) == manifest_to_domain(load_manifest(json_path))
+
+
+def test_streaming_json_handles_records_split_across_chunks(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    p = tmp_path / "m.json"
+    p.write_text(
+        '{"dependencies": [{"src": "api", "dst": "db", "metadata": {"weight": 12345}}],'
+        ' "services": [{"id": "api"}, {"id": "db"}]}',
+        encoding="utf-8",
+    )
+    init = stream._JsonCursor.__init__
+    monkeypatch.setattr(
+        stream._JsonCursor, "__init__", lambda self, fh: init(self, fh, chunk_size=3)
+    )
+
+    services, deps = load_domain(p)
+
+    assert [s.id for s in services] == ["api", "db"]
+    assert deps[0].metadata == {"weight": 12345}
+
+
+@pytest.mark.parametrize(
+    ("text", "message"),
+    [
+        ("[]", "Manifest root must be an object/dict."),
+        ('{"services": {}, "dependencies": []}', "'services' must be a list."),
+        ('{"services": []}', "'dependencies' must be a list."),
+        ('{"services": [{"id": ""}], "dependencies": []}', "services[0].id must be"),
+        (
+            '{"services": [], "dependencies": [{"src": "a", "dst": 3}]}',
+            "dependencies[0].dst must be",
+        ),
+    ],
+)
+def test_streaming_loader_reports_same_errors(tmp_path: Path, text: str, message: str) -> None:
+    for suffix in (".json", ".yaml"):
+        p = tmp_path / f"bad{suffix}"
+        p.write_text(text, encoding="utf-8")
+        with pytest.raises(ManifestError, match=re.escape(message)):
+            load_manifest(p)
+        with pytest.raises(ManifestError, match=re.escape(message)):
+            load_domain(p)
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        '{"services": [], "dependencies": []} garbage',
+        '{"services": [], "dependencies": []}\n{}',
+        "{} []",
+    ],
+)
+def test_streaming_json_rejects_data_after_the_root(tmp_path: Path, text: str) -> None:
+    p = tmp_path / "bad.json"
+    p.write_text(text, encoding="utf-8")
+    with pytest.raises(json.JSONDecodeError, match="Extra data"):
+        load_manifest(p)
+    with pytest.raises(json.JSONDecodeError, match="Extra data"):
+        list(stream.iter_manifest(p))
+    with pytest.raises(json.JSONDecodeError, match="Extra data"):
+        stream.load_compact(p)
+
+    p.write_text('{"services": [], "dependencies": []}  \n\t', encoding="utf-8")
+    assert list(stream.iter_manifest(p)) == []
+
+
+@pytest.mark.parametrize(
+    ("suffix", "text"),
+    [
+        (".json", '{"services": [{"id": "a"}, {"id": "b"}], "dependencies": [], '
+         '"services": [{"id": "b"}]}'),
+        (".yaml", "services: [{id: a}, {id: b}]\ndependencies: []\nservices: [{id: b}]\n"),
+        (".json", '{"services": [], "dependencies": [], "dependencies": 3}'),
+    ],
+)
+def test_streaming_loader_rejects_repeated_sections(
+    tmp_path: Path, suffix: str, text: str
+) -> None:
+    p = tmp_path / f"bad{suffix}"
+    p.write_text(text, encoding="utf-8")
+    with pytest.raises(ManifestError, match="appears more than once"):
+        list(stream.iter_manifest(p))
+    with pytest.raises(ManifestError, match="appears more than once"):
+        stream.load_compact(p)
+
+    # Other keys may repeat, as in the whole-document loaders.
+    p.write_text(
+        '{"notes": 1, "services": [{"id": "a"}], "notes": 2, "dependencies": []}'
+        if suffix == ".json"
+        else "notes: 1\nservices: [{id: a}]\nnotes: 2\ndependencies: []\n",
+        encoding="utf-8",
+    )
+    assert [s.id for s in stream.iter_manifest(p)] == ["a"]
+
+
+@pytest.mark.parametrize(
+    "trailer",
+    ["---\nservices: 3\n", "---\n", "--- [\n"],
+)
+def test_streaming_yaml_rejects_documents_after_the_root(tmp_path: Path, trailer: str) -> None:
+    p = tmp_path / "bad.yaml"
+    p.write_text(f"services: [{{id: a}}]\ndependencies: []\n{trailer}", encoding="utf-8")
+    with pytest.raises(ManifestError, match="single YAML document"):
+        list(stream.iter_manifest(p))
+    with pytest.raises(ManifestError, match="single YAML document"):
+        stream.load_compact(p)
+
+    p.write_text("services: [{id: a}]\ndependencies: []\n...\n\n# done\n", encoding="utf-8")
+    assert [s.id for s in stream.iter_manifest(p)] == ["a"]
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import json
+import random
+from pathlib import Path
+
+import networkx as nx
+import pytest
+
+from constellation_engine.cli import main as cli
+from constellation_engine.core.graph import build_graph
+from constellation_engine.core.types import (
+    CallType,
+    Dependency,
+    DependencyType,
+    Service,
+    ServiceId,
+)
+from constellation_engine.core.validate import validate_or_raise
+from constellation_engine.sim.models import FailureType
+from constellation_engine.sim.propagate import _should_propagate, propagate_failures
+from constellation_engine.sim.timed import timed_propagation
+
+MANIFEST = {
+    "services": [{"id": s} for s in ("web", "api", "auth", "db")],
+    "dependencies": [
+        {"src": "web", "dst": "api", "metadata": {"latency_ms": 20, "timeout_ms": 1000}},
+        {"src": "api", "dst": "db", "metadata": {"latency_ms": 5, "timeout_ms": 300}},
+        {"src": "api", "dst": "auth", "metadata": {"latency_ms": 10, "timeout_ms": 200}},
+        {"src": "auth", "dst": "db", "metadata": {"latency_ms": 2, "timeout_ms": 50}},
+    ],
+}
+
+
+def _random_model(seed: int) -> tuple[list[Service], list[Dependency]]:
+    rng = random.Random(seed)
+    n = rng.randint(2, 25)
+    deps = {}
+    for _ in range(rng.randint(0, 3 * n)):
+        a, b = rng.sample(range(n), 2)
+        metadata = {"latency_ms": rng.choice([0, 1, 2.5, 10, 40])} if rng.random() < 0.8 else None
+        deps[a, b] = Dependency(
+            ServiceId(f"s{a}"),
+            ServiceId(f"s{b}"),
+            rng.choice(list(DependencyType)),
+            rng.choice(list(CallType)),
+            metadata=metadata,
+        )
+    return [Service(ServiceId(f"s{i}")) for i in range(n)], list(deps.values())
+
+
+def _expected(
+    g: nx.DiGraph, starts: list[ServiceId], failure: FailureType
+) -> dict[ServiceId, float]:
+    impact = nx.DiGraph()
+    impact.add_nodes_from(g.nodes)
+    for src, dst, attrs in g.edges(data=True):
+        if _should_propagate(failure, attrs["dep_type"], attrs["call_type"]):
+            delay = (attrs["metadata"] or {}).get("latency_ms", 0.0)
+            impact.add_edge(dst, src, weight=delay)
+    return nx.multi_source_dijkstra_path_length(impact, set(starts))
+
+
+def test_timed_propagation_matches_networkx_dijkstra() -> None:
+    for seed in range(60):
+        services, deps = _random_model(seed)
+        g = build_graph(services, deps)
+        starts = random.Random(seed).sample(sorted(g.nodes), 2)
+        for failure in FailureType:
+            expected = _expected(g, starts, failure)
+            times = timed_propagation(g, starts=starts, failure=failure, key="latency_ms")
+            assert times == pytest.approx(expected), (seed, failure)
+            assert list(times.values()) == sorted(times.values())
+            # Timing changes when services are hit, never which ones.
+            assert times.keys() == propagate_failures(g, starts=starts, failure=failure).keys()
+
+            cut = timed_propagation(
+                validate_or_raise(services, deps),
+                starts=starts,
+                failure=failure,
+                key="latency_ms",
+                deadline=12.0,
+            )
+            assert cut == {s: t for s, t in times.items() if t <= 12.0}
+
+
+def test_delays_must_be_non_negative_numbers() -> None:
+    services = [Service(ServiceId("a")), Service(ServiceId("b"))]
+    deps = [Dependency(ServiceId("a"), ServiceId("b"), metadata={"timeout_ms": "slow"})]
+    with pytest.raises(ValueError, match="timeout_ms of dependency a -> b"):
+        timed_propagation(
+            build_graph(services, deps), starts=[ServiceId("b")], failure=FailureType.DOWN
+        )
+
+
+def test_cli_blast_radius_timed(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    path = tmp_path / "m.json"
+    path.write_text(json.dumps(MANIFEST), encoding="utf-8")
+    base = ["blast-radius", str(path), "--no-cache", "--service", "db", "--timed"]
+
+    assert cli.main([*base, "--failure", "latency_up"]) == 0
+    assert capsys.readouterr().out.splitlines() == [
+        "timed blast radius from db (latency_up, latency_ms) [impacts dependers]:",
+        "- db: latency_up at 0 ms",
+        "- auth: latency_up at 2 ms",
+        "- api: latency_up at 5 ms",
+        "- web: latency_up at 25 ms",
+    ]
+
+    assert cli.main([*base, "--failure", "down", "--deadline", "300", "--format", "csv"]) == 0
+    assert capsys.readouterr().out.splitlines() == [
+        "service,failure,time_ms",
+        "db,down,0.0",
+        "auth,down,50.0",
+        "api,down,250.0",
+    ]
+
+    with pytest.raises(SystemExit):
+        cli.main([*base, "--failure", "down", "--explain"])
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from constellation_engine.cli import main as cli
+from constellation_engine.core import graph as graph_module
+from constellation_engine.core.graph import build_graph
+from constellation_engine.core.types import Dependency, Service, ServiceId
+from constellation_engine.core.validate import (
+    ValidatedModel,
+    ValidationError,
+    validate_model,
+    validate_or_raise,
+)
+from constellation_engine.io.stream import load_domain
+from constellation_engine.sim.criticality import compute_criticality
+
+EXAMPLES = Path(__file__).resolve().parent.parent / "docs" / "examples"
+
+
+def _broken_model() -> tuple[list[Service], list[Dependency]]:
+    services = [Service(ServiceId(s)) for s in ("a", "b", "a", "c")]
+    deps = [
+        Dependency(ServiceId("a"), ServiceId("a")),
+        Dependency(ServiceId("a"), ServiceId("x")),
+        Dependency(ServiceId("b"), ServiceId("b")),
+        Dependency(ServiceId("y"), ServiceId("c")),
+    ]
+    return services, deps
+
+
+def test_errors_are_grouped_by_kind_in_manifest_order() -> None:
+    result = validate_model(*_broken_model())
+
+    assert not result.ok and not result.truncated
+    assert result.errors == (
+        "Duplicate service IDs found: ['a']",
+        "Dependency destination x does not exist among services.",
+        "Dependency source y does not exist among services.",
+        "Service a has a self-dependency, which is not allowed.",
+        "Service b has a self-dependency, which is not allowed.",
+    )
+
+
+@pytest.mark.parametrize("cap", [1, 2, 3, 4, 5])
+def test_error_cap_reports_a_prefix_of_all_errors(cap: int) -> None:
+    full = validate_model(*_broken_model()).errors
+    capped = validate_model(*_broken_model(), max_errors=cap)
+
+    assert capped.errors == full[:cap]
+    assert capped.truncated == (cap < len(full))
+    assert validate_model(*_broken_model(), fail_fast=True).errors == full[:1]
+
+
+def test_exactly_cap_errors_are_not_truncated(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    services = [Service(ServiceId(s)) for s in ("a", "b", "a")]
+    deps = [Dependency(ServiceId("a"), ServiceId("b")), Dependency(ServiceId("b"), ServiceId("a"))]
+    result = validate_model(services, deps, fail_fast=True)
+    assert result.errors == ("Duplicate service IDs found: ['a']",)
+    assert result.truncated is False
+
+    deps.append(Dependency(ServiceId("b"), ServiceId("x")))
+    result = validate_model(services, deps, max_errors=2)
+    assert len(result.errors) == 2 and result.truncated is False
+    assert validate_model(services, deps, max_errors=1).truncated is True
+
+    path = tmp_path / "m.yaml"
+    path.write_text("services: [{id: a}, {id: a}, {id: b}]\ndependencies: [{src: a, dst: b}]\n")
+    assert cli.main(["validate", str(path), "--no-cache", "--fail-fast"]) == 2
+    assert "further errors not shown" not in capsys.readouterr().out
+
+
+def test_validate_or_raise_honours_the_cap() -> None:
+    with pytest.raises(ValidationError) as exc:
+        validate_or_raise(*_broken_model(), fail_fast=True)
+
+    assert str(exc.value).splitlines() == [
+        "Validation failed with the following errors:",
+        "Duplicate service IDs found: ['a']",
+        "(further errors not shown)",
+    ]
+
+
+def test_validated_model_is_not_checked_again(monkeypatch: pytest.MonkeyPatch) -> None:
+    services, deps = load_domain(EXAMPLES / "enterprise.yaml")
+    model = validate_or_raise(services, deps)
+    assert isinstance(model, ValidatedModel)
+    expected = compute_criticality(build_graph(services, deps))
+
+    def fail(*args: object, **kwargs: object) -> None:
+        raise AssertionError("validated model must not be re-validated")
+
+    monkeypatch.setattr(graph_module, "validate_or_raise", fail)
+
+    g = build_graph(model)
+    assert g.number_of_nodes() == len(services)
+    assert compute_criticality(g) == expected
+    assert compute_criticality(model) == expected